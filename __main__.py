@@ -2,36 +2,73 @@
 Fichier principal
 """
 
+import argparse
 import subprocess
 import os
 import sys
-import importlib
+from importlib import metadata
 import time
 
 os.environ["STREAMLIT_WATCHER_TYPE"] = "none"
-REQUIRED_PACKAGES = [
-    "pandas",
-    "numpy",
-    "sklearn",
-    "streamlit",
-    "plotly",
-    "keyboard",
-    "psutil",
-]
 
+# Nom du module importé -> nom de la distribution installée par pip
+REQUIRED_PACKAGES = {
+    "pandas": "pandas",
+    "numpy": "numpy",
+    "sklearn": "scikit-learn",
+    "streamlit": "streamlit",
+    "plotly": "plotly",
+    "keyboard": "keyboard",
+    "psutil": "psutil",
+}
+TORCH_MIN_VERSION = "2.6.0"
 
-def check_and_install_packages():
 
-    print("🔍 Vérification de la présence des packages requis...\n")
-    missing_packages = []
+def version_tuple(version: str) -> tuple[int, ...]:
+    """
+    Convertit une version ("2.6.0+cpu", "1.4.1.post1") en tuple d'entiers
+    comparable.
+    """
+    parts = []
+    for part in version.split("+")[0].split("."):
+        digits = "".join(c for c in part if c.isdigit())
+        if not digits:
+            break
+        parts.append(int(digits))
+    return tuple(parts)
 
-    for package in REQUIRED_PACKAGES:
-        try:
-            importlib.import_module(package)
-            print(f"✅ {package} est déjà installé.")
-        except ImportError:
-            print(f"❌ {package} est manquant.")
+
+def installed_version(distribution: str) -> str | None:
+    """
+    Renvoie la version installée d'une distribution, lue dans ses métadonnées
+    (le package n'est pas importé), ou None si elle est absente.
+    """
+    try:
+        return metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def find_missing_packages(verbose: bool = True) -> list[str]:
+    """
+    Liste les packages requis absents, sans les importer.
+    """
+    missing_packages = []
+    for package, distribution in REQUIRED_PACKAGES.items():
+        if installed_version(distribution) is not None:
+            if verbose:
+                print(f"✅ {package} est déjà installé.")
+        else:
+            if verbose:
+                print(f"❌ {package} est manquant.")
             missing_packages.append(package)
+    return missing_packages
+
+
+def check_and_install_packages():
+
+    print("🔍 Vérification de la présence des packages requis...\n")
+    missing_packages = find_missing_packages()
 
     if not missing_packages:
         print("\n🎉 Tous les packages sont installés. Lancement de l'application...")
@@ -88,10 +125,12 @@ def ask_bonus_mode():
     if choix == "1":
         print("\n🔍 Vérification de la présence de torch...\n")
         try:
-            import torch
+            torch_version = installed_version("torch")
+            if torch_version is None:
+                raise ImportError("torch")
 
-            print(f"✅ torch est déjà installé (version {torch.__version__})")
-            if torch.__version__ < "2.6.0":
+            print(f"✅ torch est déjà installé (version {torch_version})")
+            if version_tuple(torch_version) < version_tuple(TORCH_MIN_VERSION):
                 print("⚠️  Version de torch inférieure à 2.6.0")
                 ans = (
                     input("Souhaitez-vous mettre à jour torch ? (o/n) : ")
@@ -129,15 +168,137 @@ def ask_bonus_mode():
         return False
 
 
-def run_streamlit_app(bonus_mode):
+def headless_bonus_mode(requested: bool) -> bool:
+    """
+    Version non interactive de `ask_bonus_mode` : la partie bonus n'est activée
+    que si elle est demandée et qu'une version compatible de torch est installée.
+    """
+    if not requested:
+        return False
+
+    torch_version = installed_version("torch")
+    if torch_version is None:
+        print("❌ torch n'est pas installé, partie bonus non déployée.")
+        return False
+    if version_tuple(torch_version) < version_tuple(TORCH_MIN_VERSION):
+        print(
+            f"⚠️  torch {torch_version} < {TORCH_MIN_VERSION}, "
+            "partie bonus non déployée."
+        )
+        return False
+    return True
+
+
+def run_streamlit_app(bonus_mode, headless=False, port=None, warmup=True, workers=2):
     env = os.environ.copy()
+    env["F1_WORKERS"] = str(workers)
     env["BONUS_MODE"] = "Oui" if bonus_mode else "Non"
+    env["F1_WARMUP"] = "Oui" if warmup else "Non"
     env["PYTHONPATH"] = "."
     app_path = os.path.join("src", "App", "app.py")
-    subprocess.run(["streamlit", "run", app_path], env=env)
+    command = [sys.executable, "-m", "streamlit", "run", app_path]
+    if headless:
+        command += ["--server.headless", "true"]
+    if port is not None:
+        command += ["--server.port", str(port)]
+
+    if headless and os.name == "posix":
+        # Streamlit remplace le lanceur : il reçoit directement les signaux
+        # du conteneur et aucun processus Python intermédiaire ne reste actif.
+        os.execve(sys.executable, command, env)
+    subprocess.run(command, env=env)
+
+
+def env_flag(name: str) -> bool:
+    """
+    Lit une variable d'environnement booléenne ("1", "true", "oui", "yes").
+    """
+    return os.getenv(name, "").strip().lower() in {"1", "true", "oui", "yes"}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Lance l'application Streamlit d'analyse de données F1."
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        default=env_flag("F1_HEADLESS"),
+        help=(
+            "Mode non interactif (conteneurs) : aucune question posée, "
+            "configuration par options ou variables d'environnement "
+            "(F1_HEADLESS)."
+        ),
+    )
+    parser.add_argument(
+        "--bonus",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("BONUS_MODE", "Non") == "Oui" or env_flag("F1_BONUS"),
+        help="Active la partie réseau de neurones (BONUS_MODE=Oui ou F1_BONUS).",
+    )
+    parser.add_argument(
+        "--install",
+        action="store_true",
+        default=env_flag("F1_INSTALL"),
+        help=(
+            "En mode non interactif, installe requirements.txt si des packages "
+            "manquent au lieu d'échouer (F1_INSTALL)."
+        ),
+    )
+    parser.add_argument(
+        "--warmup",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("F1_WARMUP", "Oui") == "Oui",
+        help=(
+            "Préchauffe les caches (tables, jointures, questions par défaut) en "
+            "arrière-plan dès le démarrage de l'application (F1_WARMUP=Oui/Non)."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.getenv("F1_WORKERS", "2"),
+        help=(
+            "Nombre de processus de calcul pour les requêtes et les modèles "
+            "(0 : calcul dans le processus Streamlit) (F1_WORKERS)."
+        ),
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=os.getenv("F1_PORT"),
+        help="Port du serveur Streamlit (F1_PORT).",
+    )
+    return parser.parse_args(argv)
+
+
+def main_headless(args: argparse.Namespace) -> None:
+    missing_packages = find_missing_packages(verbose=False)
+    if missing_packages:
+        print(f"❌ Packages manquants : {', '.join(missing_packages)}")
+        if not args.install:
+            sys.exit(1)
+        subprocess.check_call(
+            [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"]
+        )
+
+    bonus = headless_bonus_mode(args.bonus)
+    run_streamlit_app(
+        bonus,
+        headless=True,
+        port=args.port,
+        warmup=args.warmup,
+        workers=args.workers,
+    )
 
 
 if __name__ == "__main__":
-    check_and_install_packages()
-    bonus = ask_bonus_mode()
-    run_streamlit_app(bonus)
+    args = parse_args()
+    if args.headless:
+        main_headless(args)
+    else:
+        check_and_install_packages()
+        bonus = ask_bonus_mode()
+        run_streamlit_app(
+            bonus, port=args.port, warmup=args.warmup, workers=args.workers
+        )
@@ -0,0 +1,273 @@
+"""
+Banc d'essai de latence des réexécutions de l'application, sans navigateur.
+
+L'application est pilotée via l'API de test de Streamlit (AppTest) : choix de
+chaque question, déplacement des curseurs, bascule pandas/homemade et
+plotly/matplotlib, actions des onglets Régression et Classification. La durée
+de chaque réexécution est mesurée et résumée (p50/p95) par interaction.
+
+Plusieurs sessions peuvent être simulées en parallèle (--concurrence). AppTest
+s'appuie sur un runtime Streamlit global au processus et ne permet pas deux
+exécutions simultanées dans le même processus : chaque session tourne donc dans
+son propre processus (caches froids, mais concurrence réelle sur le CPU et,
+le cas échéant, sur les processus de calcul).
+
+Utilisation (depuis la racine du projet) :
+
+    python -m bench.bench_app --concurrence 4 --repetitions 2
+"""
+
+import argparse
+import json
+import os
+import multiprocessing
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join("src", "App", "app.py")
+
+THEMES = {
+    "Pilotes": ["q1", "q2", "q3", "q7", "q10"],
+    "Écuries": ["q4", "q8", "q9"],
+    "Pit-Stops": ["q5", "q6"],
+}
+METHOD_QUESTIONS = ["q1", "q6", "q9"]
+GRAPH_QUESTIONS = ["q1", "q2", "q3", "q4", "q5", "q6", "q7", "q8", "q10"]
+SEASON_SLIDERS = {
+    "q2": "slider-q2",
+    "q5": "slider-q5",
+    "q8": "slider-q8",
+    "q10": "slider-q10",
+}
+SEASONS = [2022, 2021, 2020]
+
+Interaction = tuple[str, Callable[[AppTest], None]]
+
+
+def _theme(question_id: str) -> str:
+    return next(t for t, questions in THEMES.items() if question_id in questions)
+
+
+def _select_question(question_id: str) -> Callable[[AppTest], None]:
+    return lambda at: at.selectbox(key=f"{_theme(question_id)}-question").select(
+        question_id
+    )
+
+
+def _click(label: str) -> Callable[[AppTest], None]:
+    return lambda at: next(b for b in at.button if b.label == label).click()
+
+
+def scenario(onglets: bool = True) -> list[Interaction]:
+    """
+    Construit la suite d'interactions d'une session type.
+
+    Parameters
+    ----------
+    onglets : bool
+        Inclure les actions des onglets Régression et Classification.
+
+    Returns
+    -------
+    list[Interaction]
+        Couples (nom de l'interaction, action sur l'AppTest avant réexécution).
+    """
+    interactions: list[Interaction] = []
+    for question_id in sum(THEMES.values(), []):
+        interactions.append((f"question {question_id}", _select_question(question_id)))
+
+        if question_id in METHOD_QUESTIONS:
+            for method in ("homemade", "pandas"):
+                interactions.append(
+                    (
+                        f"{question_id} méthode {method}",
+                        lambda at, q=question_id, m=method: at.selectbox(
+                            key=f"{q}-method"
+                        ).select(m),
+                    )
+                )
+
+        if question_id in SEASON_SLIDERS:
+            for saison in SEASONS:
+                interactions.append(
+                    (
+                        f"{question_id} curseur saison",
+                        lambda at, q=question_id, s=saison: at.slider(
+                            key=SEASON_SLIDERS[q]
+                        ).set_value(s),
+                    )
+                )
+        if question_id == "q4":
+            interactions.append(
+                (
+                    "q4 curseur saisons",
+                    lambda at: at.slider(key="slider-q4").set_value((1990, 2010)),
+                )
+            )
+
+        if question_id in GRAPH_QUESTIONS:
+            for methode in ("matplotlib", "plotly"):
+                interactions.append(
+                    (
+                        f"{question_id} graphe {methode}",
+                        lambda at, q=question_id, m=methode: at.radio(
+                            key=f"graph-type-{q}"
+                        ).set_value(m),
+                    )
+                )
+
+    if onglets:
+        interactions.append(
+            ("onglet régression", _click("📈 Lancer et comparer les deux modèles"))
+        )
+        interactions.append(("onglet classification", _click("Lancer le clustering")))
+    return interactions
+
+
+def run_session(
+    onglets: bool, repetitions: int, timeout: float, warmup: bool
+) -> dict[str, list[float]]:
+    """
+    Exécute une session (un AppTest) et mesure chaque réexécution.
+
+    Parameters
+    ----------
+    onglets : bool
+        Inclure les actions des onglets Régression et Classification.
+    repetitions : int
+        Nombre de passages du scénario.
+    timeout : float
+        Délai maximal d'une réexécution, en secondes.
+    warmup : bool
+        Laisser l'application préchauffer ses caches (F1_WARMUP).
+
+    Returns
+    -------
+    dict[str, list[float]]
+        Latences (en secondes) par interaction, dont "premier affichage".
+    """
+    os.environ["F1_WARMUP"] = "Oui" if warmup else "Non"
+    interactions = scenario(onglets)
+    latences: dict[str, list[float]] = {}
+
+    def mesurer(nom: str, action: Callable[[AppTest], None] | None) -> None:
+        if action is not None:
+            action(at)
+        debut = time.perf_counter()
+        at.run(timeout=timeout)
+        latences.setdefault(nom, []).append(time.perf_counter() - debut)
+        if at.exception:
+            raise RuntimeError(f"{nom} : {at.exception[0].message}")
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    mesurer("premier affichage", None)
+    for _ in range(repetitions):
+        for nom, action in interactions:
+            mesurer(nom, action)
+    return latences
+
+
+def percentile(valeurs: list[float], p: float) -> float:
+    """Percentile `p` (entre 0 et 100) par interpolation linéaire."""
+    if len(valeurs) == 1:
+        return valeurs[0]
+    return statistics.quantiles(valeurs, n=100, method="inclusive")[int(p) - 1]
+
+
+def summarize(latences: dict[str, list[float]]) -> list[dict]:
+    """
+    Résume les latences par interaction : nombre, p50, p95 et max (en ms).
+    """
+    return [
+        {
+            "interaction": nom,
+            "n": len(valeurs),
+            "p50_ms": round(percentile(valeurs, 50) * 1000, 1),
+            "p95_ms": round(percentile(valeurs, 95) * 1000, 1),
+            "max_ms": round(max(valeurs) * 1000, 1),
+        }
+        for nom, valeurs in latences.items()
+    ]
+
+
+def print_table(lignes: list[dict]) -> None:
+    largeur = max(len(ligne["interaction"]) for ligne in lignes)
+    print(f"{'interaction':<{largeur}}  {'n':>4}  {'p50 ms':>9}  {'p95 ms':>9}")
+    for ligne in lignes:
+        print(
+            f"{ligne['interaction']:<{largeur}}  {ligne['n']:>4}  "
+            f"{ligne['p50_ms']:>9.1f}  {ligne['p95_ms']:>9.1f}"
+        )
+
+
+def main(argv=None) -> list[dict]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--concurrence", type=int, default=1, help="Sessions simultanées."
+    )
+    parser.add_argument(
+        "--repetitions",
+        type=int,
+        default=1,
+        help="Nombre de passages du scénario par session.",
+    )
+    parser.add_argument(
+        "--sans-onglets",
+        action="store_true",
+        help="Ne pas lancer la régression ni le clustering.",
+    )
+    parser.add_argument(
+        "--warmup",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Laisser l'application préchauffer ses caches (F1_WARMUP).",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=120, help="Délai maximal par réexécution."
+    )
+    parser.add_argument("--json", help="Fichier où écrire le résumé au format JSON.")
+    args = parser.parse_args(argv)
+
+    session = (not args.sans_onglets, args.repetitions, args.timeout, args.warmup)
+    latences: dict[str, list[float]] = {}
+    debut = time.perf_counter()
+    if args.concurrence == 1:
+        resultats = [run_session(*session)]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=args.concurrence,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = [
+                pool.submit(run_session, *session) for _ in range(args.concurrence)
+            ]
+            resultats = [future.result() for future in futures]
+    duree = time.perf_counter() - debut
+    for resultat in resultats:
+        for nom, valeurs in resultat.items():
+            latences.setdefault(nom, []).extend(valeurs)
+
+    lignes = summarize(latences)
+    print_table(lignes)
+    total = sum(len(v) for v in latences.values())
+    print(
+        f"\n{total} réexécutions, {args.concurrence} session(s), "
+        f"{duree:.1f} s ({total / duree:.1f} réexécutions/s)"
+    )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"concurrence": args.concurrence, "duree_s": duree, "lignes": lignes},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    return lignes
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Fonctions de visualisation des questions (voir router.get_graph).
+
+matplotlib et plotly.express sont importés à la demande par chaque fonction,
+dans la branche correspondant à la méthode choisie, pour ne pas ralentir le
+démarrage.
+"""
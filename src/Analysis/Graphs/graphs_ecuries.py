@@ -3,8 +3,6 @@ Graphiques liés aux statistiques des écuries de F1.
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
 
 
 def plot_classement_saison_ecuries(data: pd.DataFrame, methode: str = "plotly"):
@@ -28,6 +26,8 @@ def plot_classement_saison_ecuries(data: pd.DataFrame, methode: str = "plotly"):
     data_sorted = data.sort_values("points", ascending=True)
 
     if methode == "plotly":
+        import plotly.express as px
+
         fig = px.bar(
             data_sorted,
             x="points",
@@ -41,6 +41,8 @@ def plot_classement_saison_ecuries(data: pd.DataFrame, methode: str = "plotly"):
         return fig
 
     elif methode == "matplotlib":
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(10, 6))
         ax.barh(data_sorted["constructorRef"], data_sorted["points"], color="#9467bd")
         ax.set_title("Classement des écuries")
@@ -75,6 +77,8 @@ def plot_victoires_ecuries_saison(data: pd.DataFrame, methode: str = "plotly"):
         raise TypeError("Les données doivent être un DataFrame pandas.")
 
     if methode == "plotly":
+        import plotly.express as px
+
         fig = px.line(
             data,
             x="saison",
@@ -88,6 +92,8 @@ def plot_victoires_ecuries_saison(data: pd.DataFrame, methode: str = "plotly"):
         return fig
 
     elif methode == "matplotlib":
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(10, 6))
         for ecurie in data["ecurie"].unique():
             subset = data[data["ecurie"] == ecurie]
@@ -3,8 +3,6 @@ Graphiques liés aux statistiques des pilotes de F1.
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
 
 
 def plot_nombre_victoires_pilotes(data: pd.DataFrame, methode: str = "plotly"):
@@ -25,6 +23,8 @@ def plot_nombre_victoires_pilotes(data: pd.DataFrame, methode: str = "plotly"):
     data_sorted = data.sort_values("wins", ascending=False)
 
     if methode == "plotly":
+        import plotly.express as px
+
         fig = px.bar(
             data_sorted,
             x="nom_pilote",
@@ -36,6 +36,8 @@ def plot_nombre_victoires_pilotes(data: pd.DataFrame, methode: str = "plotly"):
         return fig
 
     elif methode == "matplotlib":
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(10, 5))
         ax.bar(data_sorted["nom_pilote"], data_sorted["wins"], color="#1f77b4")
         ax.set_title("Nombre de victoires par pilote")
@@ -69,6 +71,8 @@ def plot_classement_saison(data: pd.DataFrame, methode: str = "plotly"):
     data_sorted = data.sort_values("points", ascending=True)
 
     if methode == "plotly":
+        import plotly.express as px
+
         data_sorted = data_sorted.rename(
             columns={"1": "Or", "2": "Argent", "3": "Bronze", "nom_pilote": "Nom"}
         )
@@ -97,6 +101,8 @@ def plot_classement_saison(data: pd.DataFrame, methode: str = "plotly"):
         return fig
 
     elif methode == "matplotlib":
+        import matplotlib.pyplot as plt
+
         noms = data_sorted["nom_pilote"]
         or_, argent, bronze = data_sorted["1"], data_sorted["2"], data_sorted["3"]
         fig, ax = plt.subplots(figsize=(10, 6))
@@ -131,6 +137,8 @@ def plot_temps_de_carriere_pilotes(data: pd.DataFrame, methode: str = "plotly"):
     data_sorted = data.sort_values("duree", ascending=False)
 
     if methode == "plotly":
+        import plotly.express as px
+
         fig = px.bar(
             data_sorted,
             x="nom_pilote",
@@ -142,6 +150,8 @@ def plot_temps_de_carriere_pilotes(data: pd.DataFrame, methode: str = "plotly"):
         return fig
 
     elif methode == "matplotlib":
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(10, 5))
         ax.bar(data_sorted["nom_pilote"], data_sorted["duree"], color="#2ca02c")
         ax.set_title("Temps de carrière par pilote")
@@ -181,6 +191,8 @@ def plot_carriere_pilote(df: pd.DataFrame, methode: str = "plotly"):
     autres = total - podiums
 
     if methode == "plotly":
+        import plotly.express as px
+
         df_barres = pd.DataFrame(stats.items(), columns=["Stat", "Valeur"])
         fig1 = px.bar(
             df_barres,
@@ -213,6 +225,8 @@ def plot_carriere_pilote(df: pd.DataFrame, methode: str = "plotly"):
         return fig1, fig2
 
     elif methode == "matplotlib":
+        import matplotlib.pyplot as plt
+
         fig, axes = plt.subplots(1, 2, figsize=(12, 5))
 
         # Barres horizontales
@@ -241,3 +255,79 @@ def plot_carriere_pilote(df: pd.DataFrame, methode: str = "plotly"):
         return fig
 
     raise ValueError("La méthode doit être 'plotly' ou 'matplotlib'")
+
+
+def plot_duels_coequipiers(data: pd.DataFrame, methode: str = "plotly"):
+    """
+    Affiche, pour chaque paire de coéquipiers, la part des duels remportés par
+    le premier pilote en qualification et en course (50 % : égalité).
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Doit contenir les colonnes ["ecurie", "pilote_1", "pilote_2",
+        "qualifs_1", "qualifs_2", "arrivees_1", "arrivees_2"].
+    methode : str
+        "plotly" (par défaut) ou "matplotlib".
+
+    Returns
+    -------
+    fig : Figure Plotly ou Matplotlib
+    """
+    paires = data["pilote_1"] + " vs " + data["pilote_2"] + " (" + data["ecurie"] + ")"
+    df_parts = pd.DataFrame(
+        {
+            "Paire": paires,
+            "Qualifications": 100
+            * data["qualifs_1"]
+            / (data["qualifs_1"] + data["qualifs_2"]).where(lambda n: n > 0),
+            "Courses": 100
+            * data["arrivees_1"]
+            / (data["arrivees_1"] + data["arrivees_2"]).where(lambda n: n > 0),
+        }
+    ).fillna(50)
+    titre = "Duels entre coéquipiers (% remportés par le premier pilote)"
+
+    if methode == "plotly":
+        import plotly.express as px
+
+        df_long = df_parts.melt(id_vars="Paire", var_name="Duel", value_name="Part")
+        fig = px.bar(
+            df_long,
+            x="Part",
+            y="Paire",
+            color="Duel",
+            barmode="group",
+            orientation="h",
+            title=titre,
+            labels={"Part": "Duels remportés (%)", "Paire": ""},
+            range_x=[0, 100],
+        )
+        fig.add_vline(x=50, line_dash="dash", line_color="grey")
+        fig.update_layout(height=max(400, 40 * len(df_parts)))
+        return fig
+
+    elif methode == "matplotlib":
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=(10, max(4, 0.5 * len(df_parts))))
+        y = range(len(df_parts))
+        ax.barh(
+            [i - 0.2 for i in y],
+            df_parts["Qualifications"],
+            height=0.4,
+            label="Qualifications",
+        )
+        ax.barh([i + 0.2 for i in y], df_parts["Courses"], height=0.4, label="Courses")
+        ax.axvline(50, color="grey", linestyle="--")
+        ax.set_yticks(list(y))
+        ax.set_yticklabels(df_parts["Paire"])
+        ax.set_xlim(0, 100)
+        ax.set_xlabel("Duels remportés (%)")
+        ax.set_title(titre)
+        ax.invert_yaxis()
+        ax.legend()
+        plt.tight_layout()
+        return fig
+
+    raise ValueError("La méthode doit être 'plotly' ou 'matplotlib'")
@@ -3,8 +3,6 @@ Fichier pour créer le graphe de la question sur les pit-stops
 """
 
 import pandas as pd
-import plotly.express as px
-import matplotlib.pyplot as plt
 
 
 def plot_temps_pit_stop(data, methode: str):
@@ -28,6 +26,8 @@ def plot_temps_pit_stop(data, methode: str):
     data_sorted = data.sort_values("pit_stop_moyen", ascending=True)
 
     if methode == "plotly":
+        import plotly.express as px
+
         fig = px.bar(
             data_sorted,
             x="constructor_unifie",
@@ -46,6 +46,8 @@ def plot_temps_pit_stop(data, methode: str):
         return fig
 
     elif methode == "matplotlib":
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(10, 5))
         ax.bar(
             data_sorted["constructor_unifie"],
@@ -88,6 +90,8 @@ def plot_min_pit_stop(data, methode: str):
     data_sorted = data.sort_values("Pit Stop Min", ascending=True)
 
     if methode == "plotly":
+        import plotly.express as px
+
         fig = px.bar(
             data_sorted,
             x="year",
@@ -103,6 +107,8 @@ def plot_min_pit_stop(data, methode: str):
         return fig
 
     elif methode == "matplotlib":
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(10, 5))
         ax.bar(data_sorted["year"], data_sorted["Pit Stop Min"], color="#ff7f0e")
         ax.set_title("Temps minimal de pit-stop par saison")
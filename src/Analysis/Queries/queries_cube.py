@@ -0,0 +1,149 @@
+"""
+Implémentations des questions à partir du cube de résultats pré-agrégé (voir
+cube) : chaque réponse est un cumul de tranches du cube, sans jointure sur les
+tables brutes. Les résultats sont identiques à ceux des versions pandas.
+"""
+
+import pandas as pd
+
+from src.Analysis.cache import load_table
+from src.Analysis.cube import rollup
+
+
+def _noms_pilotes() -> pd.Series:
+    drivers = load_table("drivers")
+    return (drivers["forename"] + " " + drivers["surname"]).set_axis(
+        drivers["driverId"]
+    )
+
+
+def _ids_ecuries(noms: list[str]) -> pd.Series:
+    constructors = load_table("constructors")
+    return constructors.loc[constructors["name"].isin(noms), "constructorId"]
+
+
+def nombre_victoires_pilotes(nb_victoires: int = 30) -> pd.DataFrame:
+    """
+    Nombre total de victoires par pilote (voir queries_pilotes).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes ["nom_pilote", "wins"], trié par nombre de victoires décroissant.
+    """
+    df = rollup(["victoires"], par=["driverId"])
+    df = df[df["victoires"] > 0]  # le cube contient aussi les pilotes sans victoire
+    df["nom_pilote"] = df["driverId"].map(_noms_pilotes())
+    wins = df.groupby("nom_pilote")["victoires"].sum().rename("wins").reset_index()
+    wins = wins[wins["wins"] >= nb_victoires]
+    return wins.sort_values(
+        ["wins", "nom_pilote"], ascending=[False, True]
+    ).reset_index(drop=True)
+
+
+def victoires_ecuries_saison(ecuries: list[str], saisons: tuple[int]) -> pd.DataFrame:
+    """
+    Nombre de victoires par écurie et par saison (voir queries_ecuries).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : ["ecurie", "saison", "victoires"] triées.
+    """
+    if not isinstance(ecuries, list) or not all(isinstance(e, str) for e in ecuries):
+        raise TypeError("ecuries doit être une liste de chaînes de caractères.")
+
+    if not isinstance(saisons, tuple) or len(saisons) != 2:
+        raise ValueError("saisons doit être un tuple (début, fin).")
+
+    df = rollup(
+        ["victoires_ecurie"],
+        par=["constructorId", "year"],
+        constructorId=_ids_ecuries(ecuries),
+        year=saisons,
+    )
+    constructors = load_table("constructors").set_index("constructorId")["name"]
+    df["ecurie"] = df["constructorId"].map(constructors)
+    return (
+        df[df["victoires_ecurie"] > 0]
+        .groupby(["ecurie", "year"])["victoires_ecurie"]
+        .sum()
+        .reset_index()
+        .rename(columns={"year": "saison", "victoires_ecurie": "victoires"})
+        .sort_values(["ecurie", "saison"])
+        .reset_index(drop=True)
+    )
+
+
+def statistiques_pilote(nom_pilote: str) -> pd.DataFrame:
+    """
+    Résumé des performances d'un pilote (voir queries_pilotes).
+
+    Returns
+    -------
+    pd.DataFrame
+        Une ligne avec : nb_courses, nb_podiums_1, nb_podiums_2, nb_podiums_3,
+        debut, fin, duree_carriere
+    """
+    noms = _noms_pilotes()
+    df = rollup(
+        ["participations", "victoires", "deuxiemes", "troisiemes"],
+        par=["year"],
+        driverId=noms.index[noms == nom_pilote],
+    )
+    if df.empty:
+        raise ValueError(f"Aucune donnée trouvée pour le pilote : {nom_pilote}")
+
+    stats = {
+        "nom_pilote": nom_pilote,
+        "nb_courses": df["participations"].sum(),
+        "nb_podiums_1": df["victoires"].sum(),
+        "nb_podiums_2": df["deuxiemes"].sum(),
+        "nb_podiums_3": df["troisiemes"].sum(),
+        "debut": df["year"].min(),
+        "fin": df["year"].max(),
+    }
+    stats["duree_carriere"] = stats["fin"] - stats["debut"] + 1
+    return pd.DataFrame([stats])
+
+
+def ecuries_points(saison: int) -> pd.DataFrame:
+    """
+    Total de points par écurie pour une saison (voir queries_ecuries).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : ["constructorRef", "points"] triées par points décroissants.
+    """
+    df = rollup(["points_bareme"], par=["constructorId"], year=saison)
+    refs = load_table("constructors").set_index("constructorId")["constructorRef"]
+    df["constructorRef"] = df["constructorId"].map(refs)
+    return (
+        df.groupby("constructorRef")["points_bareme"]
+        .sum()
+        .rename("points")
+        .sort_values(ascending=False)
+        .reset_index()
+    )
+
+
+def victoires_ecurie_relatif(ecurie: str) -> tuple[int, int, float | str]:
+    """
+    Victoires d'une écurie, saisons disputées et moyenne par saison (voir
+    queries_ecuries).
+
+    Returns
+    -------
+    tuple
+        (nombre de victoires, nombre de saisons, moyenne par saison)
+    """
+    df = rollup(
+        ["lignes_classement", "victoires_ecurie"],
+        par=["year"],
+        constructorId=_ids_ecuries([ecurie]),
+    )
+    nbr_wins = int(df["victoires_ecurie"].sum())
+    nbr_seasons = len(df)
+    moyenne = round(nbr_wins / nbr_seasons, 2) if nbr_seasons else "Données manquantes"
+    return nbr_wins, nbr_seasons, moyenne
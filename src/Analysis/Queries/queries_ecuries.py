@@ -2,27 +2,66 @@
 Requêtes relatives aux statistiques des écuries de F1.
 """
 
+import numpy as np
 import pandas as pd
-from src.Analysis.utils import get_pd_df, get_python_df, points_bareme
-
-
-def ecuries_points(saison: int) -> pd.DataFrame:
+from src.Analysis.aggregates import aggregates
+from src.Analysis.cache import load_table
+from src.Analysis.scoring import points_resultats
+from src.Analysis.utils import (
+    get_pd_df,
+    get_python_df,
+    lignees,
+    noms_lignees,
+    saisons_ecuries,
+)
+
+
+def ecuries_points(
+    saison: int,
+    systeme: str = "moderne",
+    inclure_sprints: bool = False,
+    par_lignee: bool = False,
+) -> pd.DataFrame:
     """
     Calcule le total de points obtenus par chaque écurie pour une saison donnée.
+    Avec le barème actuel et sans les sprints, les points sont lus dans les
+    agrégats (voir aggregates).
 
     Parameters
     ----------
     saison : int
         Année de la saison.
+    systeme : str
+        Barème appliqué : "moderne" (barème actuel) ou "historique" (barème de
+        la saison, voir scoring).
+    inclure_sprints : bool
+        Ajoute les points des courses sprint (vue resultats_sessions).
+    par_lignee : bool
+        Regroupe les écuries par lignée (voir utils.lignees) : la colonne
+        constructorRef contient alors le nom de la lignée. Non disponible pour
+        les versions SQL et cube.
 
     Returns
     -------
     pd.DataFrame
         Colonnes : ["constructorRef", "points"] triées par points décroissants.
     """
-    df = get_pd_df(["results", "races", "constructors"], ["raceId", "constructorId"])
-    df = df[df["year"] == saison].copy()
-    df["points"] = df["positionOrder"].apply(lambda pos: points_bareme.get(pos, 0))
+    if systeme == "moderne" and not inclure_sprints:
+        points = aggregates()["points_ecuries"]
+        points = points[points.index.get_level_values("year") == saison]
+        df = points.reset_index()
+        refs = load_table("constructors").set_index("constructorId")
+        df["constructorRef"] = df["constructorId"].map(refs["constructorRef"])
+        df = df.dropna(subset=["constructorRef"])
+    else:
+        resultats = "resultats_sessions" if inclure_sprints else "results"
+        df = get_pd_df(
+            [resultats, "races", "constructors"], ["raceId", "constructorId"]
+        )
+        df = df[df["year"] == saison].copy()
+        df["points"] = points_resultats(df, systeme)
+    if par_lignee:
+        df["constructorRef"] = noms_lignees(df["constructorId"], df["year"])
 
     classement = (
         df.groupby("constructorRef")["points"]
@@ -34,7 +73,9 @@ def ecuries_points(saison: int) -> pd.DataFrame:
     return classement
 
 
-def victoires_ecuries_saison(ecuries: list[str], saisons: tuple[int]) -> pd.DataFrame:
+def victoires_ecuries_saison(
+    ecuries: list[str], saisons: tuple[int], par_lignee: bool = False
+) -> pd.DataFrame:
     """
     Calcule le nombre de victoires par écurie pour chaque saison d'une plage donnée.
 
@@ -44,6 +85,9 @@ def victoires_ecuries_saison(ecuries: list[str], saisons: tuple[int]) -> pd.Data
         Liste des noms d'écuries à analyser.
     saisons : list[int]
         Période d'étude [année_début, année_fin].
+    par_lignee : bool
+        `ecuries` désigne des lignées d'écuries (voir utils.lignees). Non
+        disponible pour les versions SQL et cube.
 
     Returns
     -------
@@ -56,30 +100,29 @@ def victoires_ecuries_saison(ecuries: list[str], saisons: tuple[int]) -> pd.Data
     if not isinstance(saisons, tuple) or len(saisons) != 2:
         raise ValueError("saisons doit être un tuple (début, fin).")
 
-    df = get_pd_df(
-        ["constructor_standings", "constructors", "races"], ["constructorId", "raceId"]
-    )
-
-    df = df[
-        (df["year"] >= saisons[0])
-        & (df["year"] <= saisons[1])
-        & (df["name_x"].isin(ecuries))
-        & (df["position"] == 1)
-    ]
-
-    grouped = (
-        df.groupby(["name_x", "year"])
-        .size()
-        .reset_index(name="victoires")
-        .rename(columns={"name_x": "ecurie", "year": "saison"})
-        .sort_values(["ecurie", "saison"])
-        .reset_index(drop=True)
+    # Lecture de l'index par saison : seules les lignes des écuries demandées et
+    # les colonnes de la plage sont parcourues
+    index = saisons_ecuries(par_lignee)
+    annees = index["annees"]
+    debut = max(saisons[0], annees[0]) - annees[0]
+    fin = max(debut, min(saisons[1], annees[-1]) - annees[0] + 1)
+    ecuries = index["ecuries"].intersection(ecuries)
+    victoires = index["victoires"][index["ecuries"].get_indexer(ecuries)]
+    victoires = victoires[:, debut:fin]
+
+    lignes, colonnes = np.nonzero(victoires)
+    return pd.DataFrame(
+        {
+            "ecurie": ecuries[lignes].astype(object),
+            "saison": annees[debut + colonnes].astype("int64"),
+            "victoires": victoires[lignes, colonnes].astype("int64"),
+        }
     )
 
-    return grouped
 
-
-def victoires_ecurie_relatif(method: str, ecurie: str) -> tuple[int, int, float | str]:
+def victoires_ecurie_relatif(
+    method: str, ecurie: str, par_lignee: bool = False
+) -> tuple[int, int, float | str]:
     """
     Calcule le nombre de victoires d'une écurie, le nombre de saisons participées
     et la moyenne de victoires par saison.
@@ -90,6 +133,9 @@ def victoires_ecurie_relatif(method: str, ecurie: str) -> tuple[int, int, float
         "pandas" ou "homemade"
     ecurie : str
         Nom exact de l'écurie à analyser.
+    par_lignee : bool
+        `ecurie` désigne une lignée d'écuries (voir utils.lignees). Non
+        disponible pour les versions SQL et cube.
 
     Returns
     -------
@@ -100,14 +146,13 @@ def victoires_ecurie_relatif(method: str, ecurie: str) -> tuple[int, int, float
         raise ValueError("La méthode doit être 'pandas' ou 'homemade'.")
 
     if method == "pandas":
-        df = get_pd_df(
-            ["constructor_standings", "constructors", "races"],
-            ["constructorId", "raceId"],
-        )
-        df_filtered = df[df["name_x"] == ecurie]
-
-        nbr_wins = df_filtered[df_filtered["position"] == 1].shape[0]
-        nbr_seasons = df_filtered["year"].nunique()
+        # Totaux lus dans la dernière colonne des sommes cumulées de l'index
+        index = saisons_ecuries(par_lignee)
+        position = index["ecuries"].get_indexer([ecurie])[0]
+        nbr_wins, nbr_seasons = 0, 0
+        if position >= 0:
+            nbr_wins = int(index["cumul_victoires"][position, -1])
+            nbr_seasons = int(index["cumul_saisons"][position, -1])
         moyenne = (
             round(nbr_wins / nbr_seasons, 2) if nbr_seasons else "Données manquantes"
         )
@@ -120,6 +165,14 @@ def victoires_ecurie_relatif(method: str, ecurie: str) -> tuple[int, int, float
             ["constructorId", "raceId"],
         )
         rows = [dict(zip(df.keys(), values)) for values in zip(*df.values())]
+        if par_lignee:
+            dimension = lignees()
+            premiere = dimension["annees"][0]
+            for row in rows:
+                lignee = dimension["table"][
+                    int(row["constructorId"]), int(row["year"]) - premiere
+                ]
+                row["name"] = dimension["noms"][lignee]
         wins = [row for row in rows if row["name"] == ecurie and row["position"] == "1"]
         seasons = {row["year"] for row in rows if row["name"] == ecurie}
 
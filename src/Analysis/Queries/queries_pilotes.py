@@ -2,13 +2,27 @@
 Requêtes relatives aux statistiques des pilotes de F1.
 """
 
-from src.Analysis.utils import get_pd_df, get_python_df, points_bareme
+from src.Analysis.aggregates import aggregates
+from src.Analysis.cache import load_table
+from src.Analysis.scoring import points_course
+from src.Analysis.utils import get_pd_df, get_python_df
+import numpy as np
 import pandas as pd
 
 
-def nombre_victoires_pilotes(method: str, nb_victoires: int = 30) -> pd.DataFrame:
+def _noms_pilotes() -> pd.Series:
+    """Nom complet des pilotes, indexé par driverId."""
+    drivers = load_table("drivers").set_index("driverId")
+    return drivers["forename"] + " " + drivers["surname"]
+
+
+def nombre_victoires_pilotes(
+    method: str, nb_victoires: int = 30, inclure_sprints: bool = False
+) -> pd.DataFrame:
     """
     Calcule le nombre total de victoires (positionText == '1') par pilote.
+    Sans les sprints, la méthode "pandas" lit les victoires dans les agrégats
+    (voir aggregates).
 
     Parameters
     ----------
@@ -16,6 +30,8 @@ def nombre_victoires_pilotes(method: str, nb_victoires: int = 30) -> pd.DataFram
         "pandas" ou "homemade"
     nb_victoires : int
         Nombre minimum de victoires pour apparaître dans le tableau.
+    inclure_sprints : bool
+        Compte aussi les victoires en course sprint (vue resultats_sessions).
 
     Returns
     -------
@@ -25,8 +41,21 @@ def nombre_victoires_pilotes(method: str, nb_victoires: int = 30) -> pd.DataFram
     if method not in ["pandas", "homemade"]:
         raise ValueError("La méthode doit être 'pandas' ou 'homemade'")
 
+    if method == "pandas" and not inclure_sprints:
+        victoires = aggregates()["victoires_pilotes"]
+        total_victoires = (
+            victoires.groupby(victoires.index.map(_noms_pilotes()))
+            .sum()
+            .rename_axis("nom_pilote")
+            .reset_index(name="wins")
+        )
+        total_victoires = total_victoires[total_victoires["wins"] >= nb_victoires]
+        return total_victoires.sort_values("wins", ascending=False).reset_index(
+            drop=True
+        )
+
     if method == "pandas":
-        df = get_pd_df(["drivers", "results"], ["driverId"])
+        df = get_pd_df(["drivers", "resultats_sessions"], ["driverId"])
         df["nom_pilote"] = df["forename"] + " " + df["surname"]
         df_victoires = df[df["positionText"] == "1"]
         total_victoires = (
@@ -38,14 +67,16 @@ def nombre_victoires_pilotes(method: str, nb_victoires: int = 30) -> pd.DataFram
         )
 
     else:
-        df = get_python_df(["drivers", "results"], ["driverId"])
-        noms = [f"{prenom} {nom}" for prenom, nom in zip(df["forename"], df["surname"])]
-        positions = df["positionText"]
+        tables = ["results", "sprint_results"] if inclure_sprints else ["results"]
 
         total_victoires = {}
-        for nom, pos in zip(noms, positions):
-            if pos == "1":
-                total_victoires[nom] = total_victoires.get(nom, 0) + 1
+        for table in tables:
+            df = get_python_df(["drivers", table], ["driverId"])
+            noms = zip(df["forename"], df["surname"])
+            for (prenom, nom), pos in zip(noms, df["positionText"]):
+                if pos == "1":
+                    nom = f"{prenom} {nom}"
+                    total_victoires[nom] = total_victoires.get(nom, 0) + 1
 
         filtered = {n: v for n, v in total_victoires.items() if v >= nb_victoires}
         sorted_list = sorted(filtered.items(), key=lambda x: (-x[1], x[0]))
@@ -55,7 +86,12 @@ def nombre_victoires_pilotes(method: str, nb_victoires: int = 30) -> pd.DataFram
 def classement_saison(saison: int = 2023) -> pd.DataFrame:
     """
     Retourne le classement des pilotes pour une saison donnée, en calculant les points
-    via le barème FIA à partir de la colonne 'position' (entier).
+    via le barème FIA actuel à partir de la colonne 'position' (entier) du
+    classement après chaque manche (driver_standings).
+
+    Les positions étant des rangs au championnat et non des places à
+    l'arrivée, les barèmes historiques (demi-points, points doubles, meilleur
+    tour) ne s'y appliquent pas : voir scoring pour les points des courses.
 
     Returns
     -------
@@ -72,11 +108,11 @@ def classement_saison(saison: int = 2023) -> pd.DataFrame:
     df["nom_pilote"] = df["forename"] + " " + df["surname"]
 
     # Garder les lignes avec position valide (entier positif)
-    df = df[df["position"].apply(lambda x: isinstance(x, (int, float)) and x > 0)]
+    df = df[pd.to_numeric(df["position"], errors="coerce") > 0].copy()
     df["position"] = df["position"].astype(int)
 
     # Appliquer le barème de points
-    df["points"] = df["position"].apply(lambda p: points_bareme.get(p, 0))
+    df["points"] = points_course(df["position"])
     df_points = df.groupby("nom_pilote")["points"].sum().to_frame()
 
     # Comptage des positions 1, 2, 3, etc.
@@ -107,7 +143,7 @@ def classement_saison(saison: int = 2023) -> pd.DataFrame:
 def temps_de_carriere_pilotes(duree_min: int = 5) -> pd.DataFrame:
     """
     Calcule la durée de carrière des pilotes à partir de leur première
-    et dernière saison.
+    et dernière saison, lues dans les agrégats (voir aggregates).
 
     Parameters
     ----------
@@ -119,11 +155,12 @@ def temps_de_carriere_pilotes(duree_min: int = 5) -> pd.DataFrame:
     pd.DataFrame
         Colonnes : nom_pilote, debut, fin, duree
     """
-    df = get_pd_df(["driver_standings", "drivers", "races"], ["driverId", "raceId"])
-    df["nom_pilote"] = df["forename"] + " " + df["surname"]
-
+    carrieres = aggregates()["carrieres"]
     carriere = (
-        df.groupby("nom_pilote")["year"].agg(debut="min", fin="max").reset_index()
+        carrieres.groupby(carrieres.index.map(_noms_pilotes()))
+        .agg(debut=("debut", "min"), fin=("fin", "max"))
+        .rename_axis("nom_pilote")
+        .reset_index()
     )
     carriere["duree"] = carriere["fin"] - carriere["debut"] + 1
 
@@ -172,3 +209,114 @@ def statistiques_pilote(nom_pilote: str) -> pd.DataFrame:
     stats["duree_carriere"] = stats["fin"] - stats["debut"] + 1
 
     return pd.DataFrame([stats])
+
+
+def duels_coequipiers(saison: int = 2023) -> pd.DataFrame:
+    """
+    Compare les coéquipiers (pilotes d'une même écurie sur une même course) sur
+    une saison : duels en qualification et en course, part des points et
+    abandons, par paire de pilotes.
+
+    Les résultats sont triés une fois par (course, écurie, pilote) : les
+    coéquipiers forment des segments consécutifs, et chaque pilote est comparé
+    aux suivants de son segment par décalage (pas de jointure de la table avec
+    elle-même).
+
+    Parameters
+    ----------
+    saison : int
+        Année de la saison.
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : ecurie, pilote_1, pilote_2, courses, qualifs_1, qualifs_2,
+        arrivees_1, arrivees_2, points_1, points_2, part_points_1, abandons_1,
+        abandons_2 ; triées par écurie puis pilotes (pilote_1 : plus petit
+        driverId de la paire).
+    """
+    df = get_pd_df(
+        ["results", "races", "status"],
+        ["raceId", "statusId"],
+        columns={"races": ["raceId", "year"]},
+    )
+    df = df[df["year"] == saison]
+
+    # Qualification : position en qualification, sinon place sur la grille
+    qualifying = load_table("qualifying")[["raceId", "driverId", "position"]]
+    df = df.merge(
+        qualifying.rename(columns={"position": "qualif"}),
+        on=["raceId", "driverId"],
+        how="left",
+    )
+    grille = pd.to_numeric(df["grid"], errors="coerce").replace(0, 99)
+    df["qualif"] = df["qualif"].fillna(grille)
+    status = df["status"].astype(str)
+    df["abandon"] = ~((status == "Finished") | status.str.startswith("+"))
+
+    df = df.sort_values(["raceId", "constructorId", "driverId"]).reset_index(drop=True)
+    course, ecurie = df["raceId"].to_numpy(), df["constructorId"].to_numpy()
+    debut = np.r_[True, (np.diff(course) != 0) | (np.diff(ecurie) != 0)]
+    segment = np.cumsum(debut)
+    pilote = df["driverId"].to_numpy()
+
+    paires = []
+    for decalage in range(1, int(np.bincount(segment).max())):
+        a = np.arange(len(df) - decalage)
+        b = a + decalage
+        # Même segment, pilotes différents (voitures partagées dans les
+        # années 1950)
+        meme = (segment[a] == segment[b]) & (pilote[a] != pilote[b])
+        paires.append((a[meme], b[meme]))
+    a = np.concatenate([p[0] for p in paires] + [np.zeros(0, dtype=int)])
+    b = np.concatenate([p[1] for p in paires] + [np.zeros(0, dtype=int)])
+
+    def colonne(nom: str, lignes: np.ndarray) -> np.ndarray:
+        return df[nom].to_numpy()[lignes]
+
+    duels = pd.DataFrame(
+        {
+            "constructorId": colonne("constructorId", a),
+            "driver_1": colonne("driverId", a),
+            "driver_2": colonne("driverId", b),
+            "courses": 1,
+            "qualifs_1": colonne("qualif", a) < colonne("qualif", b),
+            "qualifs_2": colonne("qualif", b) < colonne("qualif", a),
+            "arrivees_1": colonne("positionOrder", a) < colonne("positionOrder", b),
+            "arrivees_2": colonne("positionOrder", b) < colonne("positionOrder", a),
+            "points_1": colonne("points", a).astype(float),
+            "points_2": colonne("points", b).astype(float),
+            "abandons_1": colonne("abandon", a),
+            "abandons_2": colonne("abandon", b),
+        }
+    )
+    duels = duels.groupby(["constructorId", "driver_1", "driver_2"]).sum().reset_index()
+    total = duels["points_1"] + duels["points_2"]
+    duels["part_points_1"] = (duels["points_1"] / total).where(total > 0)
+
+    noms = _noms_pilotes()
+    ecuries = load_table("constructors").set_index("constructorId")["name"]
+    duels.insert(0, "ecurie", duels["constructorId"].map(ecuries))
+    duels.insert(1, "pilote_1", duels["driver_1"].map(noms))
+    duels.insert(2, "pilote_2", duels["driver_2"].map(noms))
+
+    colonnes = [
+        "ecurie",
+        "pilote_1",
+        "pilote_2",
+        "courses",
+        "qualifs_1",
+        "qualifs_2",
+        "arrivees_1",
+        "arrivees_2",
+        "points_1",
+        "points_2",
+        "part_points_1",
+        "abandons_1",
+        "abandons_2",
+    ]
+    return (
+        duels.sort_values(["ecurie", "driver_1", "driver_2"])[colonnes]
+        .astype({c: "int64" for c in colonnes[3:8] + colonnes[-2:]})
+        .reset_index(drop=True)
+    )
@@ -2,38 +2,23 @@
 Requêtes pit stops
 """
 
-from src.Analysis.utils import get_pd_df, get_python_df
+from src.Analysis.aggregates import aggregates
+from src.Analysis.cache import load_table
+from src.Analysis.sketches import (
+    indices_intervalles,
+    fusionner,
+    quantiles,
+    sketches_pit_stops,
+)
+from src.Analysis.utils import get_pd_df, get_python_df, noms_lignees
+import numpy as np
 import pandas as pd
 
-# Dictionnaire de correspondance pour uniformiser les noms des écuries
-constructor_merge_dict: dict[str, str] = {
-    "force_india": "Aston Martin",
-    "racing_point": "Aston Martin",
-    "aston_martin": "Aston Martin",
-    "minardi": "AlphaTauri",
-    "toro_rosso": "AlphaTauri",
-    "alphatauri": "AlphaTauri",
-    "rb": "AlphaTauri",
-    "benetton": "Alpine",
-    "renault": "Alpine",
-    "lotus_f1": "Alpine",
-    "alpine": "Alpine",
-    "bmw_sauber": "Alfa Romeo",
-    "sauber": "Alfa Romeo",
-    "alfa": "Alfa Romeo",
-    "alfa_romeo": "Alfa Romeo",
-    "red_bull": "Red Bull",
-    "mercedes": "Mercedes",
-    "mclaren": "McLaren",
-    "williams": "Williams",
-    "ferrari": "Ferrari",
-    "haas": "Hass",
-}
-
 
 def pit_stop(saison: int = 2020) -> pd.DataFrame:
     """
-    Calcule le temps moyen de pit stop par écurie pour une saison donnée.
+    Calcule le temps moyen de pit stop par lignée d'écuries (voir
+    utils.lignees) pour une saison donnée.
 
     Parameters
     ----------
@@ -46,16 +31,17 @@ def pit_stop(saison: int = 2020) -> pd.DataFrame:
         DataFrame contenant les écuries et leur temps moyen de pit stop en secondes.
     """
 
+    # Chaque arrêt est rattaché au résultat du même pilote dans la même course
     df = get_pd_df(
         ["pit_stops", "races", "results", "constructors"],
-        ["raceId", "driverId", "constructorId"],
+        ["raceId", ["raceId", "driverId"], "constructorId"],
     )
 
     df = df[df["year"] == saison]
     df = df[df["milliseconds_x"] <= 300000]  # Filtrage valeurs aberrantes
 
     df["secondes"] = round(df["milliseconds_x"] / 1000, 3)
-    df["constructor_unifie"] = df["constructorRef"].replace(constructor_merge_dict)
+    df["constructor_unifie"] = noms_lignees(df["constructorId"], df["year"])
     df = df[~df["constructorRef"].isin(["hrt", "manor"])]
 
     df_final = (
@@ -72,7 +58,8 @@ def pit_stop(saison: int = 2020) -> pd.DataFrame:
 
 def min_pit_stop(method: str) -> pd.DataFrame:
     """
-    Renvoie le temps de pit stop minimal par saison.
+    Renvoie le temps de pit stop minimal par saison (méthode "pandas" : lu dans
+    les agrégats, voir aggregates).
 
     Parameters
     ----------
@@ -88,19 +75,12 @@ def min_pit_stop(method: str) -> pd.DataFrame:
         raise ValueError("La méthode doit être 'pandas' ou 'homemade'")
 
     if method == "pandas":
-        df = get_pd_df(["pit_stops", "races"], ["raceId"])
-        df = df[df["milliseconds"] <= 300000]
-        df["secondes"] = round(df["milliseconds"] / 1000, 3)
-
-        df_final = (
-            df.groupby("year")["secondes"]
-            .min()
+        return (
+            aggregates()["pit_stop_min"]
+            .rename("Pit Stop Min")
+            .rename_axis("year")
             .reset_index()
-            .rename(columns={"secondes": "Pit Stop Min"})
-            .sort_values("year")
-            .reset_index(drop=True)
         )
-        return df_final
 
     # Version homemade (sans pandas)
     df = get_python_df(["pit_stops", "races"], ["raceId"])
@@ -121,3 +101,74 @@ def min_pit_stop(method: str) -> pd.DataFrame:
     result.sort(key=lambda r: r["year"])
 
     return pd.DataFrame(result)
+
+
+def distribution_pit_stops(
+    par: tuple[str, ...] = ("ecurie", "saison"),
+    saisons: tuple[int, int] = (2011, 2024),
+) -> pd.DataFrame:
+    """
+    Distribution des durées de pit-stop (p10, p50, p90) par lignée d'écuries
+    (voir utils.lignees), par saison, ou les deux.
+
+    Les distributions sont lues dans les sketches de quantiles (voir sketches) :
+    les sketches des (constructorId, saison) d'un même groupe sont fusionnés,
+    sans relire les arrêts. Aucun seuil fixe n'écarte les valeurs aberrantes :
+    les quantiles y sont peu sensibles, et les arrêts au-delà de
+    p75 + 3 × (p75 - p25) du groupe (drapeaux rouges, réparations) sont comptés
+    à part.
+
+    Parameters
+    ----------
+    par : tuple[str, ...]
+        Regroupement : "ecurie", "saison" ou les deux.
+    saisons : tuple[int, int]
+        Période étudiée (début, fin).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : `par`, arrets, p10, p50, p90 (en secondes), seuil_aberrant
+        (en secondes), part_aberrants ; triées selon `par`.
+    """
+    if not par or not set(par) <= {"ecurie", "saison"}:
+        raise ValueError("par doit contenir 'ecurie' et/ou 'saison'.")
+    par = list(par)
+    if not isinstance(saisons, tuple) or len(saisons) != 2:
+        raise ValueError("saisons doit être un tuple (début, fin).")
+
+    sketches = sketches_pit_stops()
+    constructor_refs = load_table("constructors").set_index("constructorId")[
+        "constructorRef"
+    ]
+    cles = pd.DataFrame(
+        {
+            "constructorRef": sketches["cles"]
+            .get_level_values("constructorId")
+            .map(constructor_refs),
+            "saison": sketches["cles"].get_level_values("saison"),
+        }
+    )
+    cles["ecurie"] = noms_lignees(
+        sketches["cles"].get_level_values("constructorId"), cles["saison"]
+    )
+    garder = (
+        cles["saison"].between(*saisons)
+        & ~cles["constructorRef"].isin(["hrt", "manor"])
+    ).to_numpy()
+    cles = cles[garder]
+
+    codes, groupes = pd.factorize(pd.MultiIndex.from_frame(cles[par]), sort=True)
+    comptes = fusionner(sketches["comptes"][garder], codes)
+    p10, p25, p50, p75, p90 = quantiles(comptes, [0.1, 0.25, 0.5, 0.75, 0.9]).T
+    seuils = p75 + 3 * (p75 - p25)
+    au_dela = np.arange(comptes.shape[1]) > indices_intervalles(seuils)[:, None]
+    arrets = comptes.sum(axis=1)
+
+    df = groupes.to_frame(index=False, name=par)
+    df["arrets"] = arrets
+    for nom, valeurs in [("p10", p10), ("p50", p50), ("p90", p90)]:
+        df[nom] = np.round(valeurs / 1000, 3)
+    df["seuil_aberrant"] = np.round(seuils / 1000, 3)
+    df["part_aberrants"] = (comptes * au_dela).sum(axis=1) / arrets
+    return df
@@ -0,0 +1,135 @@
+"""
+Requêtes reliant les qualifications (qualifying) aux résultats des courses :
+places gagnées ou perdues entre la qualification et l'arrivée, écarts de temps
+en Q1/Q2/Q3, et distributions par circuit ou par écurie.
+"""
+
+import pandas as pd
+
+from src.Analysis.cache import load_table
+from src.Analysis.utils import get_pd_df
+
+SESSIONS = ["q1", "q2", "q3"]
+
+
+def temps_en_secondes(temps: pd.Series) -> pd.Series:
+    """
+    Convertit des temps au format "m:ss.sss" (ou "ss.sss") en secondes, sur
+    toute la colonne à la fois.
+
+    Parameters
+    ----------
+    temps : pd.Series
+        Temps sous forme de chaînes ("\\N" ou valeur invalide : NaN).
+
+    Returns
+    -------
+    pd.Series
+        Temps en secondes (float).
+    """
+    parties = temps.astype(str).str.rpartition(":")
+    minutes = pd.to_numeric(parties[0].replace("", "0"), errors="coerce")
+    secondes = pd.to_numeric(parties[2], errors="coerce")
+    return 60 * minutes + secondes
+
+
+def ecarts_qualification_course(
+    saisons: tuple[int, int] = (1994, 2023)
+) -> pd.DataFrame:
+    """
+    Associe la qualification et le résultat de chaque pilote sur chaque course
+    (jointure sur (raceId, driverId)).
+
+    Parameters
+    ----------
+    saisons : tuple[int, int]
+        Période étudiée (début, fin).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : saison, circuit, ecurie, nom_pilote, position_qualif,
+        position_arrivee, gain (places gagnées entre la qualification et
+        l'arrivée, négatif si perdues), ecart_q1, ecart_q2, ecart_q3 (écart en
+        secondes au meilleur temps de la session sur la course).
+    """
+    if not isinstance(saisons, tuple) or len(saisons) != 2:
+        raise ValueError("saisons doit être un tuple (début, fin).")
+
+    df = get_pd_df(
+        ["qualifying", "results", "races"],
+        [["raceId", "driverId"], "raceId"],
+        columns={
+            "qualifying": ["raceId", "driverId", "position"] + SESSIONS,
+            "results": ["raceId", "driverId", "constructorId", "positionOrder"],
+            "races": ["raceId", "year", "circuitId"],
+        },
+    )
+    df = df[df["year"].between(*saisons)]
+
+    drivers = load_table("drivers").set_index("driverId")
+    circuits = load_table("circuits").set_index("circuitId")["name"]
+    constructors = load_table("constructors").set_index("constructorId")["name"]
+    ecarts = pd.DataFrame(
+        {
+            "saison": df["year"],
+            "circuit": df["circuitId"].map(circuits),
+            "ecurie": df["constructorId"].map(constructors),
+            "nom_pilote": df["driverId"].map(
+                drivers["forename"] + " " + drivers["surname"]
+            ),
+            "position_qualif": df["position"],
+            "position_arrivee": df["positionOrder"],
+            "gain": df["position"] - df["positionOrder"],
+        }
+    )
+    for session in SESSIONS:
+        temps = temps_en_secondes(df[session])
+        ecarts[f"ecart_{session}"] = temps - temps.groupby(df["raceId"]).transform(
+            "min"
+        )
+    return ecarts.sort_values(["saison", "circuit", "position_qualif"]).reset_index(
+        drop=True
+    )
+
+
+def distribution_gains(
+    par: str = "circuit", saisons: tuple[int, int] = (1994, 2023)
+) -> pd.DataFrame:
+    """
+    Distribution des places gagnées entre la qualification et l'arrivée, par
+    circuit ou par écurie.
+
+    Parameters
+    ----------
+    par : str
+        "circuit" ou "ecurie".
+    saisons : tuple[int, int]
+        Période étudiée (début, fin).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : `par`, departs, gain_moyen, gain_median, ecart_type,
+        gain_p10, gain_p90, part_gains (part des pilotes qui gagnent des
+        places), ecart_q1_median ; triées par gain moyen décroissant.
+    """
+    if par not in ("circuit", "ecurie"):
+        raise ValueError("par doit être 'circuit' ou 'ecurie'.")
+
+    df = ecarts_qualification_course(saisons)
+    groupes = df.groupby(par)
+    gains = groupes["gain"]
+    distribution = pd.DataFrame(
+        {
+            "departs": gains.size(),
+            "gain_moyen": gains.mean(),
+            "gain_median": gains.median(),
+            "ecart_type": gains.std(),
+            "gain_p10": gains.quantile(0.1),
+            "gain_p90": gains.quantile(0.9),
+            "part_gains": (df["gain"] > 0).groupby(df[par]).mean(),
+            "ecart_q1_median": groupes["ecart_q1"].median(),
+        }
+    )
+    return distribution.sort_values("gain_moyen", ascending=False).reset_index()
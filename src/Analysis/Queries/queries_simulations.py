@@ -0,0 +1,161 @@
+"""
+Simulations de championnats : classements recalculés sous d'autres barèmes de
+points, à partir du tenseur (saison × pilote × position) de scoring, et
+comparés aux classements officiels (driver_standings, constructor_standings).
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.Analysis.cache import load_table
+from src.Analysis.scoring import POSITION_MAX, comptes_positions
+
+# Première saison du championnat des constructeurs
+DEBUT_CHAMPIONNAT_ECURIES = 1958
+
+# Table des classements officiels et identifiant, par championnat
+CLASSEMENTS = {
+    "pilotes": ("driver_standings", "driverId"),
+    "ecuries": ("constructor_standings", "constructorId"),
+}
+
+
+def _vecteur_points(bareme: dict[int, float] | list[float]) -> np.ndarray:
+    """Vecteur des points par position (indice 0 : hors barème)."""
+    if isinstance(bareme, (list, tuple)):
+        bareme = dict(enumerate(bareme, start=1))
+    if not isinstance(bareme, dict) or not bareme:
+        raise TypeError("Le barème doit être un dictionnaire ou une liste de points.")
+    if not all(isinstance(p, int) and 1 <= p <= POSITION_MAX for p in bareme):
+        raise ValueError(
+            f"Les positions doivent être comprises entre 1 et {POSITION_MAX}."
+        )
+    vecteur = np.zeros(POSITION_MAX + 1)
+    vecteur[list(bareme)] = list(bareme.values())
+    return vecteur
+
+
+def _rangs(saisons: np.ndarray, points: np.ndarray, comptes: np.ndarray) -> np.ndarray:
+    """
+    Rang de chaque ligne dans sa saison : points décroissants, puis départage au
+    nombre de victoires, de deuxièmes places, etc.
+    """
+    cles = [-comptes[:, p] for p in range(POSITION_MAX, 0, -1)]
+    ordre = np.lexsort(cles + [-np.round(points, 6), saisons])
+    saisons_triees = saisons[ordre]
+    debuts = np.r_[0, np.flatnonzero(np.diff(saisons_triees)) + 1]
+    tailles = np.diff(np.r_[debuts, len(ordre)])
+    rangs = np.empty(len(ordre), dtype=np.int64)
+    rangs[ordre] = np.arange(len(ordre)) - np.repeat(debuts, tailles) + 1
+    return rangs
+
+
+def _rangs_officiels(championnat: str) -> pd.Series:
+    """
+    Rang final officiel (classement après la dernière manche de chaque saison),
+    indexé par (saison, identifiant).
+    """
+    table, colonne = CLASSEMENTS[championnat]
+    races = load_table("races")[["raceId", "year", "round"]]
+    classement = load_table(table).merge(races, on="raceId")
+    derniere = classement.groupby("year")["round"].transform("max")
+    final = classement[classement["round"] == derniere]
+    return final.set_index(["year", colonne])["position"]
+
+
+def simulation_championnats(
+    bareme: dict[int, float] | list[float],
+    saisons: tuple[int, int] = (1950, 2023),
+    meilleur_tour: float = 0,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Recalcule tous les championnats pilotes et constructeurs d'une période avec
+    un autre barème, et les compare aux classements finaux officiels (après la
+    dernière manche de chaque saison, tels que publiés : résultats décomptés,
+    volants partagés, disqualifications et pénalités compris).
+
+    Les points de toutes les saisons sont obtenus par un seul produit matriciel
+    du tenseur des positions par le vecteur du barème, et les classements par
+    un seul tri. Les règles propres à chaque époque (résultats décomptés,
+    meilleure voiture seule pour les constructeurs) ne sont pas appliquées au
+    barème simulé. Un pilote ou une écurie absent du classement officiel final
+    n'a pas de rang réel et n'apparaît pas dans les écarts.
+
+    Parameters
+    ----------
+    bareme : dict[int, float] | list[float]
+        Points par position ({1: 25, 2: 18, ...} ou [25, 18, ...]).
+    saisons : tuple[int, int]
+        Période étudiée (début, fin).
+    meilleur_tour : float
+        Point accordé au meilleur tour en course, si le pilote marque des points.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, pd.DataFrame]
+        (champions qui changent : championnat, saison, champion_reel,
+        champion_simule ; écarts de rang : championnat, saison, nom, rang_reel,
+        rang_simule, ecart, positif si le classement simulé est meilleur).
+    """
+    if not isinstance(saisons, tuple) or len(saisons) != 2:
+        raise ValueError("saisons doit être un tuple (début, fin).")
+
+    vecteur = _vecteur_points(bareme)
+    drivers = load_table("drivers")
+    noms = {
+        "pilotes": (drivers["forename"] + " " + drivers["surname"]).set_axis(
+            drivers["driverId"]
+        ),
+        "ecuries": load_table("constructors").set_index("constructorId")["name"],
+    }
+
+    champions, ecarts = [], []
+    for championnat, tenseur in comptes_positions().items():
+        debut = saisons[0]
+        if championnat == "ecuries":
+            debut = max(debut, DEBUT_CHAMPIONNAT_ECURIES)
+        garder = (tenseur["saisons"] >= debut) & (tenseur["saisons"] <= saisons[1])
+        annee = tenseur["saisons"][garder]
+        comptes = tenseur["comptes"][garder]
+        tours = tenseur["meilleurs_tours"][garder]
+
+        ids = tenseur["ids"][garder]
+        reels = _rangs_officiels(championnat).reindex(
+            pd.MultiIndex.from_arrays([annee, ids])
+        )
+        simules = comptes @ vecteur + meilleur_tour * (tours @ (vecteur > 0))
+
+        df = pd.DataFrame(
+            {
+                "championnat": championnat,
+                "saison": annee,
+                "nom": pd.Series(ids).map(noms[championnat]),
+                "rang_reel": reels.to_numpy(),
+                "rang_simule": _rangs(annee, simules, comptes),
+            }
+        )
+        df = df.dropna(subset=["rang_reel"]).astype({"rang_reel": "int64"})
+        df["ecart"] = df["rang_reel"] - df["rang_simule"]
+
+        reel = df[df["rang_reel"] == 1].set_index("saison")["nom"]
+        simule = df[df["rang_simule"] == 1].set_index("saison")["nom"]
+        change = reel != simule.reindex(reel.index)
+        champions.append(
+            pd.DataFrame(
+                {
+                    "championnat": championnat,
+                    "saison": reel.index[change],
+                    "champion_reel": reel[change].to_numpy(),
+                    "champion_simule": simule.reindex(reel.index)[change].to_numpy(),
+                }
+            )
+        )
+        ecarts.append(df[df["ecart"] != 0])
+
+    champions = pd.concat(champions, ignore_index=True)
+    ecarts = (
+        pd.concat(ecarts)
+        .sort_values(["championnat", "saison", "rang_simule"])
+        .reset_index(drop=True)
+    )
+    return champions, ecarts
@@ -0,0 +1,339 @@
+"""
+Implémentations SQL (base SQLite indexée, voir sqlite_store) des questions du
+routeur. Chaque fonction renvoie le même résultat que sa version pandas, avec
+les mêmes paramètres (sans `method`).
+"""
+
+import pandas as pd
+
+from src.Analysis.sqlite_store import read_sql
+from src.Analysis.utils import noms_lignees, points_bareme
+
+NOM_PILOTE = "d.forename || ' ' || d.surname"
+
+
+def _bareme_sql(colonne: str) -> str:
+    """Expression SQL du barème FIA appliqué à une colonne de position."""
+    cas = " ".join(f"WHEN {pos} THEN {pts}" for pos, pts in points_bareme.items())
+    return f"CASE {colonne} {cas} ELSE 0 END"
+
+
+def nombre_victoires_pilotes(nb_victoires: int = 30) -> pd.DataFrame:
+    """
+    Nombre total de victoires par pilote (voir queries_pilotes).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes ["nom_pilote", "wins"], trié par nombre de victoires décroissant.
+    """
+    return read_sql(
+        f"""
+        SELECT {NOM_PILOTE} AS nom_pilote, COUNT(*) AS wins
+        FROM results r JOIN drivers d ON d.driverId = r.driverId
+        WHERE r.positionText = '1'
+        GROUP BY nom_pilote
+        HAVING wins >= ?
+        ORDER BY wins DESC, nom_pilote
+        """,
+        (nb_victoires,),
+    )
+
+
+def classement_saison(saison: int = 2023) -> pd.DataFrame:
+    """
+    Classement des pilotes d'une saison (voir queries_pilotes) : les positions
+    sont comptées en SQL (index sur year), le tableau final est mis en forme
+    avec pandas.
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes nom_pilote, points, "1", "2", ..., pts_par_course.
+    """
+    df = read_sql(
+        f"""
+        SELECT {NOM_PILOTE} AS nom_pilote, ds.position AS position,
+               COUNT(*) AS nb, SUM({_bareme_sql("ds.position")}) AS points
+        FROM races ra
+        JOIN driver_standings ds ON ds.raceId = ra.raceId
+        JOIN drivers d ON d.driverId = ds.driverId
+        WHERE ra.year = ? AND ds.position > 0
+        GROUP BY nom_pilote, ds.position
+        """,
+        (saison,),
+    )
+    df_rank = df.pivot(index="nom_pilote", columns="position", values="nb")
+    df_rank = df_rank.fillna(0).astype("int64")
+    sorted_columns = sorted(df_rank.columns)
+    df_rank = df_rank[sorted_columns]
+
+    df_points = df.groupby("nom_pilote")["points"].sum().to_frame()
+    df_final = df_points.merge(df_rank, on="nom_pilote").fillna(0)
+    df_final = df_final.sort_values(
+        ["points"] + sorted_columns, ascending=[False] * (1 + len(sorted_columns))
+    )
+    df_final["pts_par_course"] = df_final["points"] / df_rank.sum(axis=1)
+    df_final.columns.name = None
+    df_final.rename(columns={pos: str(pos) for pos in sorted_columns}, inplace=True)
+    return df_final.reset_index()
+
+
+def temps_de_carriere_pilotes(duree_min: int = 5) -> pd.DataFrame:
+    """
+    Durée de carrière des pilotes (voir queries_pilotes).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : nom_pilote, debut, fin, duree
+    """
+    return read_sql(
+        f"""
+        SELECT {NOM_PILOTE} AS nom_pilote, MIN(ra.year) AS debut,
+               MAX(ra.year) AS fin, MAX(ra.year) - MIN(ra.year) + 1 AS duree
+        FROM driver_standings ds
+        JOIN drivers d ON d.driverId = ds.driverId
+        JOIN races ra ON ra.raceId = ds.raceId
+        GROUP BY nom_pilote
+        HAVING duree >= ?
+        ORDER BY duree DESC, nom_pilote
+        """,
+        (duree_min,),
+    )
+
+
+def victoires_ecuries_saison(ecuries: list[str], saisons: tuple[int]) -> pd.DataFrame:
+    """
+    Nombre de victoires par écurie et par saison (voir queries_ecuries).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : ["ecurie", "saison", "victoires"] triées.
+    """
+    if not isinstance(ecuries, list) or not all(isinstance(e, str) for e in ecuries):
+        raise TypeError("ecuries doit être une liste de chaînes de caractères.")
+
+    if not isinstance(saisons, tuple) or len(saisons) != 2:
+        raise ValueError("saisons doit être un tuple (début, fin).")
+
+    marqueurs = ", ".join("?" * len(ecuries))
+    return read_sql(
+        f"""
+        SELECT c.name AS ecurie, ra.year AS saison, COUNT(*) AS victoires
+        FROM races ra
+        JOIN constructor_standings cs ON cs.raceId = ra.raceId
+        JOIN constructors c ON c.constructorId = cs.constructorId
+        WHERE ra.year BETWEEN ? AND ? AND cs.position = 1
+          AND c.name IN ({marqueurs})
+        GROUP BY ecurie, saison
+        ORDER BY ecurie, saison
+        """,
+        (saisons[0], saisons[1], *ecuries),
+    )
+
+
+def pit_stop(saison: int = 2020) -> pd.DataFrame:
+    """
+    Temps moyen de pit stop par lignée d'écuries pour une saison (voir
+    queries_pit_stops). Les sommes et effectifs sont calculés par écurie en
+    SQL, puis regroupés par lignée (voir utils.lignees).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : constructor_unifie, pit_stop_moyen.
+    """
+    df = read_sql(
+        """
+        SELECT r.constructorId, SUM(ROUND(p.milliseconds / 1000.0, 3)) AS total,
+               COUNT(*) AS arrets
+        FROM races ra
+        JOIN pit_stops p ON p.raceId = ra.raceId
+        JOIN results r ON r.raceId = p.raceId AND r.driverId = p.driverId
+        JOIN constructors c ON c.constructorId = r.constructorId
+        WHERE ra.year = ? AND p.milliseconds <= 300000
+          AND c.constructorRef NOT IN ('hrt', 'manor')
+        GROUP BY r.constructorId
+        """,
+        (saison,),
+    )
+    sommes = (
+        df[["total", "arrets"]]
+        .groupby(noms_lignees(df["constructorId"], [saison] * len(df)))
+        .sum()
+    )
+    return (
+        (sommes["total"] / sommes["arrets"])
+        .rename("pit_stop_moyen")
+        .rename_axis("constructor_unifie")
+        .sort_values()
+        .reset_index()
+    )
+
+
+def min_pit_stop() -> pd.DataFrame:
+    """
+    Temps de pit stop minimal par saison (voir queries_pit_stops).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : year, "Pit Stop Min".
+    """
+    return read_sql(
+        """
+        SELECT ra.year AS year,
+               MIN(ROUND(p.milliseconds / 1000.0, 3)) AS "Pit Stop Min"
+        FROM pit_stops p JOIN races ra ON ra.raceId = p.raceId
+        WHERE p.milliseconds <= 300000
+        GROUP BY ra.year
+        ORDER BY ra.year
+        """
+    )
+
+
+def statistiques_pilote(nom_pilote: str) -> pd.DataFrame:
+    """
+    Résumé des performances d'un pilote (voir queries_pilotes) : le pilote est
+    identifié une fois, puis ses résultats sont lus via l'index sur driverId.
+
+    Returns
+    -------
+    pd.DataFrame
+        Une ligne avec : nb_courses, nb_podiums_1, nb_podiums_2, nb_podiums_3,
+        debut, fin, duree_carriere
+    """
+    df = read_sql(
+        f"""
+        SELECT COUNT(*) AS nb_courses,
+               COALESCE(SUM(r.position = '1'), 0) AS nb_podiums_1,
+               COALESCE(SUM(r.position = '2'), 0) AS nb_podiums_2,
+               COALESCE(SUM(r.position = '3'), 0) AS nb_podiums_3,
+               MIN(ra.year) AS debut, MAX(ra.year) AS fin
+        FROM results r
+        JOIN races ra ON ra.raceId = r.raceId
+        WHERE r.driverId IN (
+            SELECT driverId FROM drivers d WHERE {NOM_PILOTE} = ?
+        )
+        """,
+        (nom_pilote,),
+    )
+    if df.loc[0, "nb_courses"] == 0:
+        raise ValueError(f"Aucune donnée trouvée pour le pilote : {nom_pilote}")
+
+    df.insert(0, "nom_pilote", nom_pilote)
+    df["duree_carriere"] = df["fin"] - df["debut"] + 1
+    return df
+
+
+def ecuries_points(saison: int) -> pd.DataFrame:
+    """
+    Total de points par écurie pour une saison (voir queries_ecuries).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : ["constructorRef", "points"] triées par points décroissants.
+    """
+    return read_sql(
+        f"""
+        SELECT c.constructorRef AS constructorRef,
+               SUM({_bareme_sql("r.positionOrder")}) AS points
+        FROM races ra
+        JOIN results r ON r.raceId = ra.raceId
+        JOIN constructors c ON c.constructorId = r.constructorId
+        WHERE ra.year = ?
+        GROUP BY c.constructorRef
+        ORDER BY points DESC, c.constructorRef
+        """,
+        (saison,),
+    )
+
+
+def victoires_ecurie_relatif(ecurie: str) -> tuple[int, int, float | str]:
+    """
+    Victoires d'une écurie, saisons disputées et moyenne par saison (voir
+    queries_ecuries).
+
+    Returns
+    -------
+    tuple
+        (nombre de victoires, nombre de saisons, moyenne par saison)
+    """
+    df = read_sql(
+        """
+        SELECT COALESCE(SUM(cs.position = 1), 0) AS victoires,
+               COUNT(DISTINCT ra.year) AS saisons
+        FROM constructors c
+        JOIN constructor_standings cs ON cs.constructorId = c.constructorId
+        JOIN races ra ON ra.raceId = cs.raceId
+        WHERE c.name = ?
+        """,
+        (ecurie,),
+    )
+    nbr_wins, nbr_seasons = int(df.loc[0, "victoires"]), int(df.loc[0, "saisons"])
+    moyenne = round(nbr_wins / nbr_seasons, 2) if nbr_seasons else "Données manquantes"
+    return nbr_wins, nbr_seasons, moyenne
+
+
+def duels_coequipiers(saison: int = 2023) -> pd.DataFrame:
+    """
+    Duels entre coéquipiers sur une saison (voir queries_pilotes) : les paires
+    sont formées par jointure sur (raceId, constructorId), via l'index sur
+    raceId.
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : ecurie, pilote_1, pilote_2, courses, qualifs_1, qualifs_2,
+        arrivees_1, arrivees_2, points_1, points_2, part_points_1, abandons_1,
+        abandons_2.
+    """
+    return read_sql(
+        """
+        WITH lignes AS (
+            SELECT r.raceId, r.constructorId, r.driverId, r.positionOrder,
+                   r.points,
+                   COALESCE(q.position, CASE WHEN r.grid > 0 THEN r.grid
+                                             ELSE 99 END) AS qualif,
+                   NOT (s.status = 'Finished' OR s.status LIKE '+%') AS abandon
+            FROM races ra
+            JOIN results r ON r.raceId = ra.raceId
+            JOIN status s ON s.statusId = r.statusId
+            LEFT JOIN qualifying q
+                   ON q.raceId = r.raceId AND q.driverId = r.driverId
+            WHERE ra.year = ?
+        ),
+        duels AS (
+            SELECT a.constructorId, a.driverId AS driver_1, b.driverId AS driver_2,
+                   COUNT(*) AS courses,
+                   SUM(a.qualif < b.qualif) AS qualifs_1,
+                   SUM(b.qualif < a.qualif) AS qualifs_2,
+                   SUM(a.positionOrder < b.positionOrder) AS arrivees_1,
+                   SUM(b.positionOrder < a.positionOrder) AS arrivees_2,
+                   SUM(a.points) AS points_1, SUM(b.points) AS points_2,
+                   SUM(a.abandon) AS abandons_1, SUM(b.abandon) AS abandons_2
+            FROM lignes a
+            JOIN lignes b ON b.raceId = a.raceId
+                         AND b.constructorId = a.constructorId
+                         AND b.driverId > a.driverId
+            GROUP BY a.constructorId, a.driverId, b.driverId
+        )
+        SELECT c.name AS ecurie,
+               d1.forename || ' ' || d1.surname AS pilote_1,
+               d2.forename || ' ' || d2.surname AS pilote_2,
+               courses, qualifs_1, qualifs_2, arrivees_1, arrivees_2,
+               points_1, points_2,
+               CASE WHEN points_1 + points_2 > 0
+                    THEN points_1 / (points_1 + points_2) END AS part_points_1,
+               abandons_1, abandons_2
+        FROM duels
+        JOIN constructors c ON c.constructorId = duels.constructorId
+        JOIN drivers d1 ON d1.driverId = duels.driver_1
+        JOIN drivers d2 ON d2.driverId = duels.driver_2
+        ORDER BY ecurie, driver_1, driver_2
+        """,
+        (saison,),
+    )
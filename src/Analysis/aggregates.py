@@ -0,0 +1,269 @@
+"""
+Agrégats matérialisés et intégration incrémentale d'un nouveau week-end de
+course.
+
+Les agrégats (victoires par pilote, points par écurie et par saison, période
+de carrière des pilotes, pit-stop minimal par saison) sont calculés une fois par
+version des données, conservés en mémoire et sur disque, puis mis à jour
+à partir des seules nouvelles lignes : les sommes et comptages sont complétés,
+et les extrema ne sont comparés que pour les pilotes et saisons concernés. Le
+coût d'une mise à jour dépend du nombre de lignes ajoutées, pas de
+l'historique : les CSV sont complétés en fin de fichier et leurs entrées du
+manifeste mises à jour sans relecture (voir manifest.record_append).
+
+Les questions q1, q3, q6 et q8 (avec leurs paramètres par défaut) sont servies
+par ces agrégats : après une intégration, leur recalcul par le rechargement à
+chaud ne relit pas les tables.
+"""
+
+import csv
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.Analysis import disk_cache, manifest
+from src.Analysis.cache import get_or_compute, load_table, put
+from src.Analysis.manifest import DATA_DIR, version_id
+from src.Analysis.scoring import points_course
+
+# Tables dont dépendent les agrégats
+AGGREGATE_TABLES = ["races", "results", "pit_stops", "driver_standings"]
+
+# Pit-stops plus longs ignorés (réparations, drapeaux rouges), comme pour q6
+PIT_STOP_MAX_MS = 300000
+
+_lock = threading.Lock()
+
+
+def _empty() -> dict:
+    """Agrégats d'un historique vide."""
+    return {
+        "annees": pd.Series(dtype="int64", name="year"),
+        "victoires_pilotes": pd.Series(dtype="int64", name="wins"),
+        "points_ecuries": pd.Series(
+            dtype="float64",
+            name="points",
+            index=pd.MultiIndex.from_arrays([[], []], names=["constructorId", "year"]),
+        ),
+        "carrieres": pd.DataFrame(
+            {"debut": pd.Series(dtype="int64"), "fin": pd.Series(dtype="int64")}
+        ),
+        "pit_stop_min": pd.Series(dtype="float64", name="Pit Stop Min"),
+    }
+
+
+def _add(total: pd.Series, delta: pd.Series) -> pd.Series:
+    """Somme par clé (les clés absentes de `total` sont ajoutées)."""
+    if delta.empty:
+        return total
+    return total.add(delta, fill_value=0).astype(total.dtype)
+
+
+def apply_rows(
+    state: dict,
+    races: pd.DataFrame | None = None,
+    results: pd.DataFrame | None = None,
+    pit_stops: pd.DataFrame | None = None,
+    driver_standings: pd.DataFrame | None = None,
+) -> dict:
+    """
+    Met à jour des agrégats avec de nouvelles lignes.
+
+    Les agrégats reçus ne sont pas modifiés (ils peuvent être partagés par
+    d'autres sessions) : seuls les objets concernés sont remplacés.
+
+    Parameters
+    ----------
+    state : dict
+        Agrégats à compléter.
+    races, results, pit_stops, driver_standings : pd.DataFrame | None
+        Nouvelles lignes, avec les colonnes des CSV correspondants.
+
+    Returns
+    -------
+    dict
+        Les agrégats à jour.
+    """
+    state = dict(state)
+    if races is not None and not races.empty:
+        state["annees"] = pd.concat(
+            [state["annees"], races.set_index("raceId")["year"].astype("int64")]
+        )
+    annees = state["annees"]
+
+    if results is not None and not results.empty:
+        victoires = results[results["positionText"].astype(str) == "1"]
+        state["victoires_pilotes"] = _add(
+            state["victoires_pilotes"], victoires.groupby("driverId").size()
+        )
+        # Barème actuel, comme q8 (voir scoring, système "moderne")
+        points = results.assign(
+            year=results["raceId"].map(annees),
+            points=points_course(results["positionOrder"]),
+        ).groupby(["constructorId", "year"])["points"]
+        state["points_ecuries"] = _add(
+            state["points_ecuries"], points.sum().astype("float64")
+        )
+
+    if driver_standings is not None and not driver_standings.empty:
+        nouvelles = (
+            driver_standings.assign(year=driver_standings["raceId"].map(annees))
+            .groupby("driverId")["year"]
+            .agg(debut="min", fin="max")
+        )
+        anciennes = state["carrieres"].reindex(nouvelles.index)
+        maj = pd.DataFrame(
+            {
+                "debut": np.fmin(anciennes["debut"], nouvelles["debut"]),
+                "fin": np.fmax(anciennes["fin"], nouvelles["fin"]),
+            }
+        ).astype("int64")
+        carrieres = state["carrieres"].copy()
+        carrieres = pd.concat([carrieres.drop(maj.index, errors="ignore"), maj])
+        state["carrieres"] = carrieres.sort_index()
+
+    if pit_stops is not None and not pit_stops.empty:
+        valides = pit_stops[pit_stops["milliseconds"] <= PIT_STOP_MAX_MS]
+        minima = (
+            (valides["milliseconds"] / 1000)
+            .round(3)
+            .groupby(valides["raceId"].map(annees))
+            .min()
+        )
+        pit_stop_min = state["pit_stop_min"].copy()
+        for year, secondes in minima.items():  # saisons concernées uniquement
+            if year not in pit_stop_min.index or secondes < pit_stop_min[year]:
+                pit_stop_min[year] = secondes
+        state["pit_stop_min"] = pit_stop_min.sort_index()
+    return state
+
+
+def build_aggregates() -> dict:
+    """
+    Calcule les agrégats à partir de tout l'historique (même code que
+    l'intégration incrémentale, appliqué à toutes les lignes).
+    """
+    return apply_rows(_empty(), **{name: load_table(name) for name in AGGREGATE_TABLES})
+
+
+def aggregates() -> dict:
+    """
+    Agrégats de la version courante des données : en mémoire, sinon relus sur
+    disque, sinon calculés.
+
+    Returns
+    -------
+    dict
+        {"annees": raceId -> saison, "victoires_pilotes": driverId -> victoires,
+        "points_ecuries": (constructorId, saison) -> points au barème actuel,
+        "carrieres": driverId -> (debut, fin), "pit_stop_min": saison -> secondes}.
+        Partagés : ne pas les modifier en place.
+    """
+    key = ("agregats", "courses", version_id(AGGREGATE_TABLES))
+    return get_or_compute(
+        key,
+        lambda: disk_cache.get_or_compute(
+            ("agregats", "courses", disk_cache.code_version(__name__)),
+            build_aggregates,
+            AGGREGATE_TABLES,
+        ),
+    )
+
+
+def _append_csv(name: str, rows: pd.DataFrame) -> None:
+    """
+    Ajoute des lignes à data/<name>.csv, dans l'ordre de ses colonnes, et met à
+    jour son entrée du manifeste à partir des seuls octets ajoutés.
+    """
+    path = os.path.join(DATA_DIR, name + ".csv")
+    with open(path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        data = b"\n" if f.read(1) != b"\n" else b""
+    data += (
+        rows.reindex(columns=header)
+        .to_csv(header=False, index=False, na_rep="\\N", lineterminator="\n")
+        .encode("utf-8")
+    )
+    with open(path, "ab") as f:
+        f.write(data)
+    manifest.record_append(name, (stat.st_mtime_ns, stat.st_size), data, len(rows))
+
+
+def ingest_race_weekend(
+    races: pd.DataFrame,
+    results: pd.DataFrame | None = None,
+    pit_stops: pd.DataFrame | None = None,
+    driver_standings: pd.DataFrame | None = None,
+    constructor_standings: pd.DataFrame | None = None,
+) -> dict:
+    """
+    Intègre un nouveau week-end de course : les lignes sont ajoutées aux CSV du
+    dossier data, et les agrégats sont mis à jour (sans recalcul complet) puis
+    enregistrés en mémoire et sur disque pour la nouvelle version des données.
+
+    Parameters
+    ----------
+    races : pd.DataFrame
+        Nouvelles courses (au moins raceId et year).
+    results, pit_stops, driver_standings, constructor_standings : pd.DataFrame
+        Nouvelles lignes des tables correspondantes.
+
+    Returns
+    -------
+    dict
+        {"courses": raceIds intégrés, "lignes": {table: nombre},
+        "duree_agregats": s, "duree": s}.
+    """
+    debut = time.perf_counter()
+    nouvelles = {
+        "races": races,
+        "results": results,
+        "pit_stops": pit_stops,
+        "driver_standings": driver_standings,
+        "constructor_standings": constructor_standings,
+    }
+    nouvelles = {
+        name: pd.DataFrame(rows) for name, rows in nouvelles.items() if rows is not None
+    }
+
+    races = nouvelles["races"]
+
+    with _lock:
+        state = aggregates()
+        deja = races["raceId"][races["raceId"].isin(state["annees"].index)]
+        if not deja.empty:
+            raise ValueError(f"Courses déjà intégrées : {sorted(deja.tolist())}")
+        connues = set(state["annees"].index) | set(races["raceId"])
+        for name, rows in nouvelles.items():
+            inconnues = set(rows["raceId"]) - connues
+            if inconnues:
+                raise ValueError(f"{name} : courses inconnues {sorted(inconnues)}")
+
+        debut_agregats = time.perf_counter()
+        state = apply_rows(
+            state, **{n: r for n, r in nouvelles.items() if n in AGGREGATE_TABLES}
+        )
+        duree_agregats = time.perf_counter() - debut_agregats
+
+        for name, rows in nouvelles.items():
+            _append_csv(name, rows)
+        put(("agregats", "courses", version_id(AGGREGATE_TABLES)), state)
+        if disk_cache.enabled():
+            disk_cache.store(
+                ("agregats", "courses", disk_cache.code_version(__name__)),
+                state,
+                AGGREGATE_TABLES,
+            )
+
+    return {
+        "courses": sorted(races["raceId"].tolist()),
+        "lignes": {name: len(rows) for name, rows in nouvelles.items()},
+        "duree_agregats": duree_agregats,
+        "duree": time.perf_counter() - debut,
+    }
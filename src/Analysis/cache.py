@@ -0,0 +1,321 @@
+"""
+Cache mémoire partagé par tout le processus (donc par toutes les sessions
+Streamlit) : tables CSV chargées, index et résultats de requêtes.
+
+- Peuplement « single-flight » : si plusieurs sessions demandent en même temps
+  une clé absente, un seul calcul est lancé et les autres l'attendent.
+- Verrou lecteurs/rédacteur : les lectures (majoritaires) sont concurrentes,
+  seules les insertions et suppressions sont exclusives.
+- Budget mémoire (variable F1_CACHE_BUDGET_MB, 512 Mo par défaut) : au-delà,
+  les entrées les moins récemment utilisées sont évincées.
+"""
+
+import itertools
+import os
+import sys
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from src.Analysis.manifest import version_id
+
+
+class _RWLock:
+    """
+    Verrou lecteurs/rédacteur : plusieurs lecteurs simultanés, un seul
+    rédacteur. Les rédacteurs en attente sont prioritaires sur les nouveaux
+    lecteurs, pour ne pas être affamés.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class _Entry:
+    """Valeur en cache, avec sa taille estimée et son dernier accès."""
+
+    __slots__ = ("value", "size", "last_used", "pinned")
+
+    def __init__(self, value: Any, size: int, last_used: int, pinned: bool) -> None:
+        self.value = value
+        self.size = size
+        self.last_used = last_used
+        self.pinned = pinned
+
+
+_entries: dict[Hashable, _Entry] = {}
+_rwlock = _RWLock()
+_inflight: dict[Hashable, Future] = {}
+_inflight_lock = threading.Lock()
+_clock = itertools.count()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(stat: str) -> None:
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def budget_bytes() -> int:
+    """Budget mémoire du cache en octets (variable F1_CACHE_BUDGET_MB)."""
+    try:
+        return int(float(os.getenv("F1_CACHE_BUDGET_MB", "512")) * 1024**2)
+    except ValueError:
+        return 512 * 1024**2
+
+
+def sizeof(value: Any) -> int:
+    """
+    Estime l'empreinte mémoire d'une valeur (DataFrames, tableaux NumPy,
+    conteneurs imbriqués).
+
+    Parameters
+    ----------
+    value : Any
+        Valeur à mesurer.
+
+    Returns
+    -------
+    int
+        Taille estimée en octets.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sizeof(k) + sizeof(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Convertit une valeur (listes, dictionnaires, ensembles imbriqués) en une
+    valeur hashable utilisable comme clé de cache.
+
+    Parameters
+    ----------
+    value : Any
+        Valeur à convertir.
+
+    Returns
+    -------
+    Hashable
+        Tuple (trié pour les dictionnaires et ensembles) ou la valeur elle-même.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(freeze(v) for v in value))
+    return value
+
+
+def _lookup(key: Hashable) -> tuple[bool, Any]:
+    """Lecture concurrente : renvoie (trouvé, valeur) et note l'accès."""
+    with _rwlock.read():
+        entry = _entries.get(key)
+        if entry is None:
+            return False, None
+        entry.last_used = next(_clock)
+        return True, entry.value
+
+
+def _evict() -> None:
+    """
+    Évince les entrées les moins récemment utilisées au-delà du budget.
+    À appeler sous le verrou en écriture.
+    """
+    total = sum(entry.size for entry in _entries.values())
+    budget = budget_bytes()
+    if total <= budget:
+        return
+    candidates = sorted(
+        (entry.last_used, key) for key, entry in _entries.items() if not entry.pinned
+    )
+    for _, key in candidates:
+        if total <= budget:
+            break
+        total -= _entries.pop(key).size
+        _count("evictions")
+
+
+def put(key: Hashable, value: Any, pin: bool = False) -> None:
+    """
+    Enregistre (ou remplace) la valeur associée à `key`.
+
+    Parameters
+    ----------
+    key : Hashable
+        Clé de cache.
+    value : Any
+        Valeur à enregistrer.
+    pin : bool
+        Si True, l'entrée n'est jamais évincée par le budget mémoire.
+    """
+    entry = _Entry(value, sizeof(value), next(_clock), pin)
+    with _rwlock.write():
+        _entries[key] = entry
+        _evict()
+
+
+def get_or_compute(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """
+    Renvoie la valeur associée à `key`, en la calculant avec `compute` si elle
+    n'est pas encore en cache. Les appels concurrents sur une même clé absente
+    partagent un seul calcul ; en cas d'erreur, elle est transmise à tous et
+    rien n'est mis en cache.
+
+    Parameters
+    ----------
+    key : Hashable
+        Clé de cache.
+    compute : Callable[[], Any]
+        Fonction sans argument produisant la valeur.
+
+    Returns
+    -------
+    Any
+        La valeur en cache.
+    """
+    found, value = _lookup(key)
+    if found:
+        _count("hits")
+        return value
+
+    with _inflight_lock:
+        found, value = _lookup(key)
+        future = None if found else _inflight.get(key)
+        leader = not found and future is None
+        if leader:
+            future = _inflight[key] = Future()
+    _count("misses" if leader else "hits")
+
+    if found:
+        return value
+    if not leader:
+        return future.result()
+
+    try:
+        value = compute()
+        put(key, value)
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def contains(key: Hashable) -> bool:
+    """Indique si `key` est présente dans le cache."""
+    with _rwlock.read():
+        return key in _entries
+
+
+def invalidate(predicate: Callable[[Hashable], bool]) -> int:
+    """
+    Supprime les entrées dont la clé vérifie `predicate`.
+
+    Parameters
+    ----------
+    predicate : Callable[[Hashable], bool]
+        Fonction appliquée à chaque clé.
+
+    Returns
+    -------
+    int
+        Nombre d'entrées supprimées.
+    """
+    with _rwlock.write():
+        keys = [key for key in _entries if predicate(key)]
+        for key in keys:
+            del _entries[key]
+    return len(keys)
+
+
+def clear() -> None:
+    """Vide entièrement le cache."""
+    with _rwlock.write():
+        _entries.clear()
+
+
+def stats() -> dict:
+    """
+    Statistiques du cache : nombre d'entrées, taille, budget, succès, échecs
+    et évictions.
+    """
+    with _rwlock.read():
+        entries = len(_entries)
+        size = sum(entry.size for entry in _entries.values())
+    with _stats_lock:
+        return {"entries": entries, "size": size, "budget": budget_bytes(), **_stats}
+
+
+def load_table(name: str) -> pd.DataFrame:
+    """
+    Charge le fichier data/<name>.csv une seule fois par processus et par
+    version du fichier (voir manifest).
+
+    Le DataFrame renvoyé est partagé : il ne doit pas être modifié en place.
+
+    Parameters
+    ----------
+    name : str
+        Nom du fichier CSV (sans extension).
+
+    Returns
+    -------
+    pd.DataFrame
+        Contenu du fichier.
+    """
+    df_path = os.path.join("data", name + ".csv")
+    return get_or_compute(
+        ("table", name, version_id([name])), lambda: pd.read_csv(df_path)
+    )
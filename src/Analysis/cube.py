@@ -0,0 +1,181 @@
+"""
+Cube de résultats pré-agrégé : mesures sommables stockées au format COO (une
+ligne par combinaison de dimensions non vide, colonnes NumPy compactes), avec
+une fonction de cumul (`rollup`) sur n'importe quel sous-ensemble de
+dimensions.
+
+Deux tables de faits composent le cube :
+- "resultats" (pilote, écurie, saison, circuit), à partir de results :
+  participations, victoires, 2e et 3e places, podiums, points officiels et
+  points au barème actuel (comme q8) ;
+- "classements" (écurie, saison, circuit), à partir de constructor_standings :
+  lignes de classement et courses conclues en tête du classement, ce que les
+  questions q4 et q9 comptent comme victoires d'écurie.
+
+Le cube est construit une fois par version des données (voir manifest).
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.Analysis import disk_cache
+from src.Analysis.cache import get_or_compute, load_table
+from src.Analysis.manifest import version_id
+from src.Analysis.scoring import points_course
+
+# Tables dont dépend le cube
+CUBE_TABLES = [
+    "results",
+    "races",
+    "drivers",
+    "constructors",
+    "constructor_standings",
+]
+
+FACTS = {
+    "resultats": {
+        "dimensions": ["driverId", "constructorId", "year", "circuitId"],
+        "mesures": [
+            "participations",
+            "victoires",
+            "deuxiemes",
+            "troisiemes",
+            "podiums",
+            "points",
+            "points_bareme",
+        ],
+    },
+    "classements": {
+        "dimensions": ["constructorId", "year", "circuitId"],
+        "mesures": ["lignes_classement", "victoires_ecurie"],
+    },
+}
+
+
+def _compact(df: pd.DataFrame, dimensions: list[str]) -> pd.DataFrame:
+    """Agrège par dimensions et réduit les types (int16/int32, float32)."""
+    fact = df.groupby(dimensions, sort=True).sum().reset_index()
+    for col in fact.columns:
+        if col == "year":
+            fact[col] = fact[col].astype(np.int16)
+        elif pd.api.types.is_float_dtype(fact[col]):
+            fact[col] = fact[col].astype(np.float32)
+        else:
+            fact[col] = fact[col].astype(np.int32)
+    return fact
+
+
+def build_cube() -> dict[str, pd.DataFrame]:
+    """
+    Construit les tables de faits du cube à partir des CSV.
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        {"resultats": ..., "classements": ...} au format COO.
+    """
+    races = load_table("races")[["raceId", "year", "circuitId"]]
+
+    results = load_table("results").merge(races, on="raceId")
+    position = results["position"].astype(str)
+    victoires = (results["positionText"].astype(str) == "1").astype(np.int32)
+    resultats = pd.DataFrame(
+        {
+            "driverId": results["driverId"],
+            "constructorId": results["constructorId"],
+            "year": results["year"],
+            "circuitId": results["circuitId"],
+            "participations": 1,
+            "victoires": victoires,
+            "deuxiemes": (position == "2").astype(np.int32),
+            "troisiemes": (position == "3").astype(np.int32),
+            "podiums": position.isin(["1", "2", "3"]).astype(np.int32),
+            "points": results["points"].astype(float),
+            "points_bareme": points_course(results["positionOrder"]).astype(np.int32),
+        }
+    )
+
+    standings = load_table("constructor_standings").merge(races, on="raceId")
+    classements = pd.DataFrame(
+        {
+            "constructorId": standings["constructorId"],
+            "year": standings["year"],
+            "circuitId": standings["circuitId"],
+            "lignes_classement": 1,
+            "victoires_ecurie": (standings["position"] == 1).astype(np.int32),
+        }
+    )
+
+    return {
+        "resultats": _compact(resultats, FACTS["resultats"]["dimensions"]),
+        "classements": _compact(classements, FACTS["classements"]["dimensions"]),
+    }
+
+
+def cube() -> dict[str, pd.DataFrame]:
+    """
+    Cube de la version courante des données : en mémoire, sinon relu sur
+    disque, sinon construit. Partagé : ne pas le modifier en place.
+    """
+    key = ("cube", "resultats", version_id(CUBE_TABLES))
+    return get_or_compute(
+        key,
+        lambda: disk_cache.get_or_compute(
+            ("cube", "resultats", disk_cache.code_version(__name__)),
+            build_cube,
+            CUBE_TABLES,
+        ),
+    )
+
+
+def rollup(mesures: list[str], par: list[str] | None = None, **filtres) -> pd.DataFrame:
+    """
+    Somme des mesures du cube, regroupées par un sous-ensemble de dimensions.
+
+    Parameters
+    ----------
+    mesures : list[str]
+        Mesures à sommer (toutes dans la même table de faits).
+    par : list[str] | None
+        Dimensions conservées (aucune : total général).
+    **filtres
+        Restrictions par dimension : une valeur, une liste de valeurs ou un
+        intervalle (début, fin) inclusif passé sous forme de tuple.
+
+    Returns
+    -------
+    pd.DataFrame
+        Une ligne par combinaison des dimensions `par` (triées), colonnes
+        `par` puis `mesures`.
+
+    Examples
+    --------
+    >>> rollup(["victoires"], par=["driverId"])
+    >>> rollup(["points_bareme"], par=["constructorId"], year=2023)
+    """
+    par = par or []
+    nom = next(
+        (n for n, fait in FACTS.items() if set(mesures) <= set(fait["mesures"])), None
+    )
+    if nom is None:
+        raise ValueError(f"Mesures inconnues ou de tables différentes : {mesures}")
+    inconnues = set(par) | set(filtres)
+    inconnues -= set(FACTS[nom]["dimensions"])
+    if inconnues:
+        raise ValueError(f"Dimensions absentes de la table {nom} : {inconnues}")
+
+    fait = cube()[nom]
+    masque = np.ones(len(fait), dtype=bool)
+    for dim, valeur in filtres.items():
+        colonne = fait[dim].to_numpy()
+        if isinstance(valeur, tuple):
+            masque &= (colonne >= valeur[0]) & (colonne <= valeur[1])
+        elif isinstance(valeur, (list, set, np.ndarray, pd.Index, pd.Series)):
+            masque &= np.isin(colonne, list(valeur))
+        else:
+            masque &= colonne == valeur
+    selection = fait.loc[masque, par + mesures]
+
+    if not par:
+        return selection[mesures].sum().to_frame().T
+    return selection.groupby(par, sort=True)[mesures].sum().reset_index()
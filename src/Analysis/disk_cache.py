@@ -0,0 +1,272 @@
+"""
+Cache disque des résultats de calcul (requêtes, modèles entraînés, agrégats),
+conservé d'un redémarrage à l'autre et partagé par toutes les instances qui
+utilisent le même dossier.
+
+Chaque entrée est identifiée par la fonction ("module:fonction"), l'empreinte
+de son code (voir `code_version`), ses paramètres et la version des tables dont
+elle dépend (voir manifest) : une mise à jour de ces tables ou du code rend les
+anciennes entrées inaccessibles, qui finissent évincées.
+Les valeurs sont sérialisées au format binaire pickle (les DataFrames via
+pandas), écrites de façon atomique, et le dossier est borné en taille : au-delà
+du budget, les entrées les moins récemment utilisées sont supprimées.
+
+Variables d'environnement :
+- F1_DISK_CACHE : "Non" pour désactiver le cache disque ;
+- F1_DISK_CACHE_DIR : dossier du cache (".f1_cache" par défaut) ;
+- F1_DISK_CACHE_MB : taille maximale du dossier (256 Mo par défaut).
+"""
+
+import ast
+import functools
+import hashlib
+import importlib.util
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Hashable
+
+from src.Analysis import manifest, workers
+from src.Analysis.cache import freeze
+
+
+def enabled() -> bool:
+    """Indique si le cache disque est actif (variable F1_DISK_CACHE)."""
+    return os.getenv("F1_DISK_CACHE", "Oui") != "Non"
+
+
+def cache_dir() -> str:
+    """Dossier du cache disque (variable F1_DISK_CACHE_DIR)."""
+    return os.getenv("F1_DISK_CACHE_DIR", ".f1_cache")
+
+
+def budget_bytes() -> int:
+    """Taille maximale du cache disque en octets (variable F1_DISK_CACHE_MB)."""
+    try:
+        return int(float(os.getenv("F1_DISK_CACHE_MB", "256")) * 1024**2)
+    except ValueError:
+        return 256 * 1024**2
+
+
+def _source(module_name: str) -> bytes:
+    """Code source d'un module, lu sans l'importer."""
+    with open(importlib.util.find_spec(module_name).origin, "rb") as f:
+        return f.read()
+
+
+def _project_imports(module_name: str) -> set[str]:
+    """Modules du projet (paquet src) importés par un module, y compris dans
+    ses fonctions (imports différés)."""
+    tree = ast.parse(_source(module_name))
+    imported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            for alias in node.names:
+                submodule = f"{node.module}.{alias.name}"
+                try:
+                    is_module = importlib.util.find_spec(submodule) is not None
+                except ModuleNotFoundError:
+                    is_module = False
+                imported.add(submodule if is_module else node.module)
+    return {name for name in imported if name.split(".")[0] == "src"}
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(path: str) -> str:
+    """
+    Empreinte du code d'une fonction : source de son module et des modules du
+    projet dont il dépend (directement ou non). À inclure dans les clés du
+    cache disque, pour qu'une modification du code ne serve pas d'anciens
+    résultats.
+
+    Parameters
+    ----------
+    path : str
+        Référence "module:fonction" ou nom de module.
+
+    Returns
+    -------
+    str
+        Empreinte (16 caractères hexadécimaux).
+    """
+    pending = [path.partition(":")[0]]
+    modules = set()
+    while pending:
+        name = pending.pop()
+        if name not in modules:
+            modules.add(name)
+            pending.extend(_project_imports(name))
+
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        digest.update(name.encode() + b"\0" + _source(name))
+    return digest.hexdigest()[:16]
+
+
+def entry_path(key: Hashable, tables: list[str] | None = None) -> str:
+    """
+    Chemin du fichier associé à une clé (complétée par la version des données).
+
+    Parameters
+    ----------
+    key : Hashable
+        Clé de cache, composée de valeurs simples (voir `freeze`).
+    tables : list[str] | None
+        Tables dont dépend l'entrée (tout le jeu de données si None).
+
+    Returns
+    -------
+    str
+        Chemin du fichier de l'entrée.
+    """
+    material = repr((key, manifest.version_id(tables))).encode()
+    return os.path.join(cache_dir(), hashlib.sha256(material).hexdigest() + ".pkl")
+
+
+def load(key: Hashable, tables: list[str] | None = None) -> tuple[bool, Any]:
+    """
+    Lit une entrée du cache disque (`tables` : voir `entry_path`).
+
+    Returns
+    -------
+    tuple[bool, Any]
+        (trouvé, valeur). Une entrée illisible est supprimée et comptée absente.
+    """
+    path = entry_path(key, tables)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return False, None
+    except Exception:
+        _remove(path)
+        return False, None
+    try:
+        os.utime(path)  # date d'accès utilisée par l'éviction
+    except OSError:
+        pass
+    return True, value
+
+
+def store(key: Hashable, value: Any, tables: list[str] | None = None) -> bool:
+    """
+    Écrit une entrée dans le cache disque (écriture atomique), puis évince les
+    entrées les plus anciennes si le budget est dépassé (`tables` : voir
+    `entry_path`).
+
+    Returns
+    -------
+    bool
+        True si la valeur a été écrite, False si elle n'est pas sérialisable.
+    """
+    path = entry_path(key, tables)
+    os.makedirs(cache_dir(), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir(), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        _remove(tmp_path)
+        return False
+    evict()
+    return True
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def evict() -> int:
+    """
+    Supprime les entrées les moins récemment utilisées au-delà du budget (y
+    compris les bases SQLite, voir sqlite_store).
+
+    Returns
+    -------
+    int
+        Nombre d'entrées supprimées.
+    """
+    entries = []
+    for entry in os.scandir(cache_dir()):
+        if entry.name.endswith((".pkl", ".sqlite")):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # évincée entre-temps par une autre instance
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    budget = budget_bytes()
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        _remove(path)
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear() -> None:
+    """Vide le cache disque."""
+    if os.path.isdir(cache_dir()):
+        for entry in os.scandir(cache_dir()):
+            _remove(entry.path)
+
+
+def get_or_compute(
+    key: Hashable, compute: Callable[[], Any], tables: list[str] | None = None
+) -> Any:
+    """
+    Renvoie la valeur associée à `key` dans le cache disque, en la calculant
+    avec `compute` (puis en l'enregistrant) si elle est absente.
+
+    Parameters
+    ----------
+    key : Hashable
+        Clé de cache, composée de valeurs simples (voir `freeze`).
+    compute : Callable[[], Any]
+        Fonction sans argument produisant la valeur.
+    tables : list[str] | None
+        Tables dont dépend la valeur (tout le jeu de données si None).
+
+    Returns
+    -------
+    Any
+        La valeur.
+    """
+    if not enabled():
+        return compute()
+    found, value = load(key, tables)
+    if found:
+        return value
+    value = compute()
+    store(key, value, tables)
+    return value
+
+
+def cached_run(path: str, *args, **kwargs) -> Any:
+    """
+    Exécute un calcul via `workers.run` en passant par le cache disque : la clé
+    est la référence de la fonction, l'empreinte de son code et ses paramètres.
+
+    Parameters
+    ----------
+    path : str
+        Référence "module:fonction" (calcul déterministe).
+    *args, **kwargs
+        Paramètres de la fonction (valeurs simples).
+
+    Returns
+    -------
+    Any
+        Résultat du calcul.
+    """
+    key = (path, code_version(path), freeze(args), freeze(kwargs))
+    return get_or_compute(key, lambda: workers.run(path, *args, **kwargs))
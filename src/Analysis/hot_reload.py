@@ -0,0 +1,201 @@
+"""
+Rechargement à chaud du dossier data : après une mise à jour des CSV (nouveau
+week-end de course), seules les tables modifiées sont relues, et seules les
+entrées de cache qui en dépendent (tables, index, résultats de questions) sont
+supprimées puis recalculées pour les paramètres par défaut. L'application reste
+chaude, sans redémarrage ni recalcul complet.
+
+La surveillance utilise watchdog (inotify sous Linux) s'il est installé, et
+sinon interroge périodiquement le manifeste (dates et tailles des fichiers,
+voir manifest), toutes les F1_RELOAD_INTERVAL secondes (2 par défaut).
+"""
+
+import os
+import threading
+import time
+from typing import Hashable
+
+from src.Analysis import cache, manifest, workers
+from src.Analysis.aggregates import AGGREGATE_TABLES
+from src.Analysis.cube import CUBE_TABLES
+from src.Analysis.ratings import RATING_TABLES
+from src.Analysis.router import affected_questions, question_tables, run_question
+from src.Analysis.utils import INDEX_TABLES
+from src.Analysis.warmup import DEFAULT_PARAMS
+
+_last: dict | None = None
+_refresh_lock = threading.Lock()
+_thread: threading.Thread | None = None
+_thread_lock = threading.Lock()
+_stop = threading.Event()
+_status = {"mode": None, "rechargements": 0, "dernier": None, "erreur": None}
+
+
+def reload_interval() -> float:
+    """Période d'interrogation en secondes (variable F1_RELOAD_INTERVAL)."""
+    try:
+        return max(0.1, float(os.getenv("F1_RELOAD_INTERVAL", "2")))
+    except ValueError:
+        return 2.0
+
+
+def key_tables(key: Hashable) -> list[str] | None:
+    """
+    Tables dont dépend une entrée du cache mémoire, d'après sa clé.
+
+    Returns
+    -------
+    list[str] | None
+        Les tables, ou None pour une entrée qui ne dépend pas des données.
+    """
+    if not isinstance(key, tuple) or len(key) < 2:
+        return None
+    kind, name = key[0], key[1]
+    if kind == "table":
+        return [name]
+    if kind == "index":
+        return INDEX_TABLES.get(name)
+    if kind == "requete":
+        arguments = dict(key[3])
+        return question_tables(name, arguments.get("method"), arguments)
+    if kind == "agregats":
+        return AGGREGATE_TABLES
+    if kind == "cube":
+        return CUBE_TABLES
+    if kind == "notes":
+        return RATING_TABLES
+    if kind == "sqlite":
+        return sorted(manifest.current_manifest()["files"])
+    return None
+
+
+def is_stale(key: Hashable, changed: list[str]) -> bool:
+    """
+    Indique si une entrée dépend d'une table modifiée et a été calculée sur une
+    version antérieure (les clés portent la version en troisième position).
+    """
+    tables = key_tables(key)
+    if not tables or not set(tables) & set(changed):
+        return False
+    return key[2] != manifest.version_id(tables)
+
+
+def refresh() -> dict | None:
+    """
+    Compare le manifeste courant au précédent et, si des tables ont changé,
+    invalide les entrées qui en dépendent, recharge ces tables et recalcule
+    les questions concernées avec leurs paramètres par défaut.
+
+    Returns
+    -------
+    dict | None
+        {"tables", "questions", "invalidees", "duree"} ou None si rien n'a changé.
+    """
+    global _last
+    with _refresh_lock:
+        old, new = _last, manifest.current_manifest()
+        _last = new
+        if old is None or old is new:
+            return None
+        changed = manifest.changed_tables(old, new)
+        if not changed:
+            return None
+
+        debut = time.perf_counter()
+        invalidees = cache.invalidate(lambda key: is_stale(key, changed))
+        if workers.uses_shared_tables():
+            # Les processus de calcul gardent les tables de l'ancienne version :
+            # le pool et les segments partagés sont recréés au prochain calcul
+            workers.shutdown()
+        for name in changed:
+            if name in new["files"]:
+                cache.load_table(name)
+        questions = affected_questions(changed)
+        for question_id in questions:
+            run_question(question_id, **DEFAULT_PARAMS[question_id])
+
+        resume = {
+            "tables": changed,
+            "questions": questions,
+            "invalidees": invalidees,
+            "duree": time.perf_counter() - debut,
+        }
+        _status.update(rechargements=_status["rechargements"] + 1, dernier=resume)
+        return resume
+
+
+def _safe_refresh() -> None:
+    try:
+        refresh()
+        _status["erreur"] = None
+    except Exception as e:  # fichier en cours d'écriture, CSV invalide...
+        _status["erreur"] = str(e)
+
+
+def _poll() -> None:
+    while not _stop.wait(reload_interval()):
+        _safe_refresh()
+
+
+def _watch() -> None:
+    """Surveillance par watchdog, les événements étant regroupés (0,5 s)."""
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    pending = threading.Event()
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if str(event.src_path).endswith(".csv"):
+                pending.set()
+
+    observer = Observer()
+    observer.schedule(Handler(), manifest.DATA_DIR, recursive=False)
+    observer.start()
+    _safe_refresh()  # modifications survenues avant le démarrage de l'observateur
+    try:
+        while not _stop.is_set():
+            if pending.wait(0.5):
+                time.sleep(0.5)  # laisse se terminer les écritures en cours
+                pending.clear()
+                _safe_refresh()
+    finally:
+        observer.stop()
+
+
+def start_watcher() -> None:
+    """
+    Lance la surveillance du dossier data dans un thread d'arrière-plan (une
+    seule fois par processus).
+    """
+    global _thread, _last
+    with _thread_lock:
+        if _thread is not None:
+            return
+        with _refresh_lock:
+            _last = manifest.current_manifest()
+        try:
+            import watchdog  # noqa: F401
+
+            target, mode = _watch, "watchdog"
+        except ImportError:
+            target, mode = _poll, "interrogation"
+        _status["mode"] = mode
+        _stop.clear()
+        _thread = threading.Thread(target=target, name="f1-hot-reload", daemon=True)
+        _thread.start()
+
+
+def stop_watcher() -> None:
+    """Arrête la surveillance."""
+    global _thread
+    with _thread_lock:
+        _stop.set()
+        if _thread is not None:
+            _thread.join(timeout=5)
+            _thread = None
+
+
+def watcher_status() -> dict:
+    """Copie du statut de la surveillance (mode, rechargements, dernier)."""
+    return dict(_status)
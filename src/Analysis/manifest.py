@@ -0,0 +1,295 @@
+"""
+Manifeste du dossier data : pour chaque fichier CSV, empreinte du contenu
+(SHA-256), nombre de lignes et schéma (colonnes et types), ainsi qu'un
+identifiant de version du jeu de données qui en découle.
+
+Cet identifiant figure dans la clé de tous les caches (tables, index, résultats
+de requêtes, modèles) : une mise à jour des données ne peut donc jamais servir
+un résultat calculé sur l'ancienne version. Une entrée qui ne dépend que de
+certaines tables utilise la version de ces seules tables : elle reste valide
+quand les autres changent.
+
+La vérification est peu coûteuse : seules la date de modification et la taille
+des fichiers sont comparées à chaque appel ; un fichier n'est relu (et son
+empreinte recalculée) que si l'une d'elles a changé. Chaque version est
+enregistrée (instantané JSON) dans F1_MANIFEST_DIR (".f1_cache/manifests" par
+défaut), ce qui évite aussi de tout relire au redémarrage.
+
+Quand des lignes sont ajoutées à un fichier par l'application (voir
+aggregates.ingest_race_weekend), son entrée est mise à jour sans relire le
+fichier (voir `record_append`) : l'empreinte est alors chaînée (SHA-256 de
+l'ancienne empreinte et des octets ajoutés) au lieu d'être celle du contenu.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+
+import pandas as pd
+
+DATA_DIR = "data"
+
+_manifest: dict | None = None
+_lock = threading.Lock()
+
+
+def manifest_dir() -> str:
+    """Dossier des instantanés du manifeste (variable F1_MANIFEST_DIR)."""
+    return os.getenv("F1_MANIFEST_DIR", os.path.join(".f1_cache", "manifests"))
+
+
+def file_signatures(data_dir: str = DATA_DIR) -> dict[str, tuple[int, int]]:
+    """
+    Date de modification (ns) et taille de chaque fichier CSV, sans le lire.
+
+    Returns
+    -------
+    dict[str, tuple[int, int]]
+        {table (nom sans extension): (mtime_ns, taille)}.
+    """
+    signatures = {}
+    for entry in os.scandir(data_dir):
+        if entry.name.endswith(".csv"):
+            stat = entry.stat()
+            signatures[entry.name[: -len(".csv")]] = (stat.st_mtime_ns, stat.st_size)
+    return signatures
+
+
+def describe_file(path: str) -> dict:
+    """
+    Décrit un fichier CSV : empreinte, taille, nombre de lignes et schéma.
+
+    Parameters
+    ----------
+    path : str
+        Chemin du fichier.
+
+    Returns
+    -------
+    dict
+        {"sha256", "mtime_ns", "size", "rows", "columns": {colonne: type}}.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    df = pd.read_csv(io.BytesIO(raw))
+    return {
+        "sha256": hashlib.sha256(raw).hexdigest(),
+        "mtime_ns": os.stat(path).st_mtime_ns,
+        "size": len(raw),
+        "rows": len(df),
+        "columns": {col: str(dtype) for col, dtype in df.dtypes.items()},
+    }
+
+
+def version_of(files: dict, tables: list[str] | None = None) -> str:
+    """
+    Identifiant de version d'un ensemble de fichiers du manifeste.
+
+    Parameters
+    ----------
+    files : dict
+        Section "files" d'un manifeste.
+    tables : list[str] | None
+        Tables à prendre en compte (toutes si None).
+
+    Returns
+    -------
+    str
+        Identifiant (16 caractères hexadécimaux) dérivé des empreintes.
+    """
+    names = sorted(files if tables is None else tables)
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(f"{name}:{files.get(name, {}).get('sha256')};".encode())
+    return digest.hexdigest()[:16]
+
+
+def build_manifest(data_dir: str = DATA_DIR, previous: dict | None = None) -> dict:
+    """
+    Construit le manifeste du dossier de données.
+
+    Les fichiers dont la date de modification et la taille n'ont pas changé
+    depuis `previous` ne sont pas relus ; ceux dont seule la date a changé
+    sont relus mais pas réanalysés si leur empreinte est identique.
+
+    Parameters
+    ----------
+    data_dir : str
+        Dossier des fichiers CSV.
+    previous : dict | None
+        Manifeste précédent.
+
+    Returns
+    -------
+    dict
+        {"version": str, "files": {table: description}}.
+    """
+    old_files = previous["files"] if previous else {}
+    files = {}
+    for name, (mtime_ns, size) in sorted(file_signatures(data_dir).items()):
+        old = old_files.get(name)
+        if old is not None and (old["mtime_ns"], old["size"]) == (mtime_ns, size):
+            files[name] = old
+            continue
+
+        path = os.path.join(data_dir, name + ".csv")
+        if old is not None and old["size"] == size:
+            with open(path, "rb") as f:
+                if hashlib.sha256(f.read()).hexdigest() == old["sha256"]:
+                    files[name] = {**old, "mtime_ns": mtime_ns}
+                    continue
+        files[name] = describe_file(path)
+    return {"version": version_of(files), "files": files}
+
+
+def changed_tables(old: dict | None, new: dict) -> list[str]:
+    """
+    Tables ajoutées, supprimées ou modifiées entre deux manifestes.
+
+    Returns
+    -------
+    list[str]
+        Noms des tables concernées, triés.
+    """
+    old_files = old["files"] if old else {}
+    names = set(old_files) | set(new["files"])
+    return sorted(
+        name
+        for name in names
+        if old_files.get(name, {}).get("sha256")
+        != new["files"].get(name, {}).get("sha256")
+    )
+
+
+def _matches(manifest: dict, signatures: dict) -> bool:
+    files = manifest["files"]
+    return files.keys() == signatures.keys() and all(
+        (files[name]["mtime_ns"], files[name]["size"]) == signature
+        for name, signature in signatures.items()
+    )
+
+
+def _load_saved() -> dict | None:
+    try:
+        with open(os.path.join(manifest_dir(), "current.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save(manifest: dict) -> None:
+    """Enregistre l'instantané de la version et le désigne comme courant."""
+    os.makedirs(manifest_dir(), exist_ok=True)
+    for name in (manifest["version"] + ".json", "current.json"):
+        fd, tmp_path = tempfile.mkstemp(dir=manifest_dir(), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, os.path.join(manifest_dir(), name))
+
+
+def current_manifest() -> dict:
+    """
+    Manifeste à jour du dossier data (vérification par date et taille, relecture
+    des seuls fichiers modifiés).
+
+    Returns
+    -------
+    dict
+        {"version": str, "files": {table: description}}.
+    """
+    global _manifest
+    signatures = file_signatures()
+    with _lock:
+        if _manifest is not None and _matches(_manifest, signatures):
+            return _manifest
+        previous = _manifest if _manifest is not None else _load_saved()
+        if previous is not None and _matches(previous, signatures):
+            _manifest = previous
+            return _manifest
+
+        manifest = build_manifest(previous=previous)
+        try:
+            _save(manifest)
+        except OSError:
+            pass  # dossier en lecture seule : le manifeste reste en mémoire
+        _manifest = manifest
+        return _manifest
+
+
+def record_append(
+    name: str, signature: tuple[int, int], data: bytes, rows: int
+) -> bool:
+    """
+    Met à jour l'entrée d'un fichier auquel des lignes viennent d'être ajoutées,
+    sans le relire : empreinte chaînée, nombre de lignes complété, schéma
+    inchangé. Le coût ne dépend que des données ajoutées.
+
+    Parameters
+    ----------
+    name : str
+        Table complétée.
+    signature : tuple[int, int]
+        (mtime_ns, taille) du fichier avant l'ajout (voir `file_signatures`).
+    data : bytes
+        Octets ajoutés en fin de fichier.
+    rows : int
+        Nombre de lignes ajoutées.
+
+    Returns
+    -------
+    bool
+        True si l'entrée a été mise à jour ; False si le manifeste courant ne
+        décrivait pas le fichier avant l'ajout (il sera alors relu).
+    """
+    global _manifest
+    path = os.path.join(DATA_DIR, name + ".csv")
+    with _lock:
+        old = _manifest["files"].get(name) if _manifest is not None else None
+        if old is None or (old["mtime_ns"], old["size"]) != tuple(signature):
+            return False
+        stat = os.stat(path)
+        if stat.st_size != old["size"] + len(data):
+            return False  # autre modification concurrente
+
+        chained = hashlib.sha256(old["sha256"].encode() + b":" + data).hexdigest()
+        files = {
+            **_manifest["files"],
+            name: {
+                **old,
+                "sha256": chained,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "rows": old["rows"] + rows,
+            },
+        }
+        manifest = {"version": version_of(files), "files": files}
+        try:
+            _save(manifest)
+        except OSError:
+            pass
+        _manifest = manifest
+        return True
+
+
+def version_id(tables: list[str] | None = None) -> str:
+    """
+    Identifiant de version courant du jeu de données, à inclure dans les clés
+    de cache.
+
+    Parameters
+    ----------
+    tables : list[str] | None
+        Tables dont dépend l'entrée de cache (tout le jeu de données si None).
+
+    Returns
+    -------
+    str
+        Identifiant de version.
+    """
+    manifest = current_manifest()
+    if tables is None:
+        return manifest["version"]
+    return version_of(manifest["files"], tables)
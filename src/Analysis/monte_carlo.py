@@ -0,0 +1,206 @@
+"""
+Simulation de Monte-Carlo d'une saison : chaque pilote régulier reçoit une
+distribution de positions d'arrivée estimée sur ses résultats de la saison
+(results), puis des milliers de saisons sont tirées par blocs de tableaux
+NumPy (simulations × courses × pilotes), sans boucle Python par course.
+
+Pour une course simulée, chaque pilote tire une position dans sa distribution
+(inversion de la fonction de répartition) ; l'ordre d'arrivée est obtenu en
+triant ces positions (égalités départagées au hasard), puis le barème actuel
+est appliqué. Les blocs ont chacun leur générateur, dérivé de la graine par
+SeedSequence : le résultat ne dépend que de la graine et de la taille des
+blocs, pas du nombre de processus utilisés.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.Analysis import workers
+from src.Analysis.cache import load_table
+from src.Analysis.scoring import POSITION_MAX, table_points
+
+
+def distributions_positions(
+    saison: int, lissage: float = 1.0
+) -> tuple[pd.DataFrame, np.ndarray, int]:
+    """
+    Distributions des positions d'arrivée des pilotes réguliers d'une saison
+    (au moins la moitié des courses disputées).
+
+    Parameters
+    ----------
+    saison : int
+        Année de la saison.
+    lissage : float
+        Nombre de courses fictives réparties uniformément sur toutes les
+        positions (a priori de Dirichlet) : aucune position n'a une probabilité
+        nulle.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, np.ndarray, int]
+        (pilotes : driverId, nom_pilote, ecurie ; fonctions de répartition de
+        forme (nb_pilotes, nb_positions) ; nombre de courses de la saison).
+    """
+    races = load_table("races")
+    races = races.loc[races["year"] == saison, ["raceId"]]
+    if races.empty:
+        raise ValueError(f"Aucune course trouvée pour la saison : {saison}")
+    results = load_table("results").merge(races, on="raceId")
+    nb_courses = len(races)
+
+    departs = results.groupby("driverId").size()
+    reguliers = departs.index[departs >= nb_courses / 2]
+    results = results[results["driverId"].isin(reguliers)]
+
+    positions = np.clip(results["positionOrder"].to_numpy(), 1, POSITION_MAX)
+    nb_positions = int(positions.max())
+    codes, pilotes = pd.factorize(results["driverId"], sort=True)
+    comptes = np.full((len(pilotes), nb_positions), lissage / nb_positions)
+    np.add.at(comptes, (codes, positions - 1), 1)
+    repartition = np.cumsum(comptes, axis=1)
+    repartition /= repartition[:, -1:]
+
+    drivers = load_table("drivers").set_index("driverId")
+    constructors = load_table("constructors").set_index("constructorId")["name"]
+    ecurie = results.groupby("driverId")["constructorId"].agg(
+        lambda ids: ids.mode().iloc[0]
+    )
+    infos = pd.DataFrame(
+        {
+            "driverId": pilotes,
+            "nom_pilote": (drivers["forename"] + " " + drivers["surname"])
+            .reindex(pilotes)
+            .to_numpy(),
+            "ecurie": ecurie.reindex(pilotes).map(constructors).to_numpy(),
+        }
+    )
+    return infos, repartition, nb_courses
+
+
+def simuler_bloc(
+    repartition: np.ndarray,
+    nb_courses: int,
+    nb_simulations: int,
+    graine: np.random.SeedSequence,
+) -> np.ndarray:
+    """
+    Simule un bloc de saisons.
+
+    Parameters
+    ----------
+    repartition : np.ndarray
+        Fonctions de répartition des positions, (nb_pilotes, nb_positions).
+    nb_courses : int
+        Nombre de courses par saison.
+    nb_simulations : int
+        Nombre de saisons du bloc.
+    graine : np.random.SeedSequence
+        Graine du bloc.
+
+    Returns
+    -------
+    np.ndarray
+        Points de chaque pilote pour chaque saison, (nb_simulations, nb_pilotes).
+    """
+    rng = np.random.default_rng(graine)
+    nb_pilotes = len(repartition)
+    forme = (nb_simulations, nb_courses, nb_pilotes)
+    tirages = rng.random(forme)
+    positions = np.empty(forme)
+    for pilote in range(nb_pilotes):
+        positions[..., pilote] = np.searchsorted(
+            repartition[pilote], tirages[..., pilote], side="right"
+        )
+
+    # Ordre d'arrivée : positions tirées, égalités départagées au hasard
+    ordre = np.argsort(positions + rng.random(forme), axis=-1)
+    rangs = np.empty_like(ordre)
+    np.put_along_axis(rangs, ordre, np.arange(1, nb_pilotes + 1), axis=-1)
+
+    _, points, _ = table_points("moderne")
+    return points[0][np.minimum(rangs, POSITION_MAX)].sum(axis=1)
+
+
+def simulation_saison(
+    saison: int = 2023,
+    nb_simulations: int = 10000,
+    graine: int = 0,
+    taille_bloc: int = 1000,
+    parallele: bool = False,
+    lissage: float = 1.0,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Probabilités de titre des pilotes et des écuries d'une saison, estimées par
+    simulation de Monte-Carlo.
+
+    Parameters
+    ----------
+    saison : int
+        Année de la saison (distributions et nombre de courses).
+    nb_simulations : int
+        Nombre de saisons simulées.
+    graine : int
+        Graine aléatoire (mêmes paramètres : mêmes résultats).
+    taille_bloc : int
+        Nombre de saisons simulées par bloc (borne la mémoire utilisée).
+    parallele : bool
+        Répartit les blocs sur le pool de processus de calcul (voir workers,
+        variable F1_WORKERS).
+    lissage : float
+        Voir distributions_positions.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, pd.DataFrame]
+        (pilotes : nom_pilote, ecurie, proba_titre, points_moyens ;
+        écuries : ecurie, proba_titre, points_moyens), triés par probabilité
+        décroissante.
+    """
+    if nb_simulations <= 0 or taille_bloc <= 0:
+        raise ValueError("nb_simulations et taille_bloc doivent être positifs.")
+
+    infos, repartition, nb_courses = distributions_positions(saison, lissage)
+    tailles = [taille_bloc] * (nb_simulations // taille_bloc)
+    if nb_simulations % taille_bloc:
+        tailles.append(nb_simulations % taille_bloc)
+    graines = np.random.SeedSequence(graine).spawn(len(tailles))
+    blocs = [
+        (repartition, nb_courses, taille, graine_bloc)
+        for taille, graine_bloc in zip(tailles, graines)
+    ]
+
+    if parallele:
+        path = workers.func_path(simuler_bloc)
+        futures = [workers.submit(path, *bloc) for bloc in blocs]
+        points = np.concatenate([future.result() for future in futures])
+    else:
+        points = np.concatenate([simuler_bloc(*bloc) for bloc in blocs])
+
+    # Points des écuries : somme des points de leurs pilotes
+    codes, ecuries = pd.factorize(infos["ecurie"])
+    appartenance = np.zeros((len(infos), len(ecuries)))
+    appartenance[np.arange(len(infos)), codes] = 1
+    points_ecuries = points @ appartenance
+
+    pilotes = infos[["nom_pilote", "ecurie"]].assign(
+        proba_titre=np.bincount(points.argmax(axis=1), minlength=len(infos))
+        / nb_simulations,
+        points_moyens=points.mean(axis=0),
+    )
+    equipes = pd.DataFrame(
+        {
+            "ecurie": ecuries,
+            "proba_titre": np.bincount(
+                points_ecuries.argmax(axis=1), minlength=len(ecuries)
+            )
+            / nb_simulations,
+            "points_moyens": points_ecuries.mean(axis=0),
+        }
+    )
+    return tuple(
+        df.sort_values(["proba_titre", "points_moyens"], ascending=False).reset_index(
+            drop=True
+        )
+        for df in (pilotes, equipes)
+    )
@@ -0,0 +1,145 @@
+"""
+Préchargement spéculatif des saisons voisines : une fois une saison affichée
+pour q2, q5, q8 ou q10, les résultats des saisons ±1 et ±2 sont calculés dans un
+pool de threads et stockés dans le cache des requêtes.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.Analysis.cache import contains
+from src.Analysis.router import question_key, run_question
+
+# Questions concernées et nom de leur paramètre de saison
+PREFETCH_QUESTIONS: dict[str, str] = {
+    "q2": "saison",
+    "q5": "saison",
+    "q8": "saison",
+    "q10": "saison",
+}
+
+# Ordre de préchargement : les voisins immédiats d'abord
+DECALAGES = (1, -1, 2, -2)
+
+SAISON_MIN, SAISON_MAX = 1950, 2023
+
+# Au-delà de ce taux d'occupation CPU (en %), le préchargement s'abstient
+SEUIL_CPU = 75.0
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+_cpu_mesure = False  # psutil.cpu_percent a déjà une mesure de référence
+_pending: dict[str, tuple[threading.Event, list[Future]]] = {}
+_lock = threading.Lock()
+
+
+def cpu_busy(seuil: float = SEUIL_CPU) -> bool:
+    """
+    Indique si la machine est trop occupée pour du travail spéculatif.
+
+    Sans mesure précédente, psutil.cpu_percent(interval=None) renvoie toujours
+    0 : la première mesure est donc faite sur un court intervalle (appel
+    bloquant, exécuté dans les threads de préchargement).
+
+    Parameters
+    ----------
+    seuil : float
+        Taux d'occupation CPU (en %) à partir duquel la machine est occupée.
+
+    Returns
+    -------
+    bool
+        True si l'occupation dépasse le seuil.
+    """
+    global _cpu_mesure
+    try:
+        import psutil
+
+        interval = None if _cpu_mesure else 0.1
+        _cpu_mesure = True
+        return psutil.cpu_percent(interval=interval) > seuil
+    except ImportError:
+        if not hasattr(os, "getloadavg"):
+            return False
+        return os.getloadavg()[0] / (os.cpu_count() or 1) * 100 > seuil
+
+
+def _prefetch_one(
+    question_id: str, params: dict, annule: threading.Event, seuil_cpu: float | None
+) -> bool:
+    """
+    Calcule une saison voisine sauf si le préchargement a été annulé entre-temps
+    ou si le CPU est occupé. Renvoie True si le calcul a eu lieu.
+    """
+    if annule.is_set():
+        return False
+    if seuil_cpu is not None and cpu_busy(seuil_cpu):
+        return False
+    run_question(question_id, **params)
+    return True
+
+
+def cancel_prefetch(question_id: str | None = None) -> None:
+    """
+    Annule les préchargements en attente (d'une question, ou de toutes).
+    Un calcul déjà commencé se termine, mais son résultat reste valide.
+
+    Parameters
+    ----------
+    question_id : str | None
+        Question dont on annule le préchargement (toutes si None).
+    """
+    with _lock:
+        ids = list(_pending) if question_id is None else [question_id]
+        for qid in ids:
+            annule, futures = _pending.pop(qid, (None, []))
+            if annule is not None:
+                annule.set()
+            for future in futures:
+                future.cancel()
+
+
+def prefetch_neighbors(
+    question_id: str, params: dict, seuil_cpu: float | None = SEUIL_CPU
+) -> list[Future]:
+    """
+    Lance le calcul en arrière-plan des saisons voisines de `params`.
+
+    Un nouvel appel pour la même question annule le précédent : seules les
+    voisines de la dernière saison affichée sont préchargées.
+
+    Parameters
+    ----------
+    question_id : str
+        Identifiant de la question (q2, q5, q8 ou q10).
+    params : dict
+        Paramètres de la requête affichée.
+    seuil_cpu : float | None
+        Seuil d'occupation CPU (None pour ne pas le vérifier).
+
+    Returns
+    -------
+    list[Future]
+        Les calculs planifiés (résultat True si la saison a été calculée).
+    """
+    param = PREFETCH_QUESTIONS.get(question_id)
+    if param is None or param not in params:
+        return []
+
+    cancel_prefetch(question_id)
+    annule = threading.Event()
+    futures = []
+    for decalage in DECALAGES:
+        saison = params[param] + decalage
+        if not SAISON_MIN <= saison <= SAISON_MAX:
+            continue
+        voisin = {**params, param: saison}
+        if contains(question_key(question_id, **voisin)):
+            continue
+        futures.append(
+            _executor.submit(_prefetch_one, question_id, voisin, annule, seuil_cpu)
+        )
+
+    with _lock:
+        _pending[question_id] = (annule, futures)
+    return futures
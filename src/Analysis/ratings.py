@@ -0,0 +1,259 @@
+"""
+Notes de niveau (Elo) des pilotes et des écuries, calculées course après
+course dans l'ordre chronologique à partir de results et races.
+
+Pour une course à n concurrents, chaque couple de concurrents est un duel :
+le mieux classé le gagne. La note de chaque concurrent varie de
+K / (n - 1) × (duels gagnés - duels attendus), les duels attendus étant donnés
+par la formule d'Elo. Toutes les paires d'une course sont traitées en une seule
+opération sur une matrice n × n. Une écurie est classée par sa meilleure
+voiture.
+
+L'état (notes courantes, courses traitées, point de reprise à la fin de chaque
+saison) est conservé en mémoire et sur disque par version des données. Quand
+de nouvelles courses arrivent, seules celles-ci sont traitées ; une course
+insérée avant la dernière course traitée fait repartir le calcul du point de
+reprise de la saison précédente, sans rejouer tout l'historique.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.Analysis import disk_cache
+from src.Analysis.cache import get_or_compute, load_table
+from src.Analysis.manifest import version_id
+
+# Tables dont dépendent les notes
+RATING_TABLES = ["races", "results"]
+
+NOTE_INITIALE = 1500.0
+K = 32.0
+
+_dernier: dict | None = None
+_lock = threading.Lock()
+
+
+def etat_initial() -> dict:
+    """Notes avant toute course."""
+    return {
+        "pilotes": np.zeros(0),
+        "ecuries": np.zeros(0),
+        "courses": np.zeros(0, dtype=np.int64),
+        "derniere": (0, 0),
+        "reprises": {},
+    }
+
+
+def maj_elo(notes: np.ndarray, positions: np.ndarray, k: float = K) -> np.ndarray:
+    """
+    Notes après une course, pour tous les duels de la course à la fois.
+
+    Parameters
+    ----------
+    notes : np.ndarray
+        Notes des concurrents avant la course.
+    positions : np.ndarray
+        Positions d'arrivée (les égalités comptent pour un demi-duel).
+    k : float
+        Variation maximale d'une note sur une course.
+
+    Returns
+    -------
+    np.ndarray
+        Notes après la course.
+    """
+    n = len(notes)
+    if n < 2:
+        return notes
+    attendus = 1 / (1 + 10 ** ((notes[None, :] - notes[:, None]) / 400))
+    gagnes = (positions[:, None] < positions[None, :]) + 0.5 * (
+        positions[:, None] == positions[None, :]
+    )
+    np.fill_diagonal(attendus, 0)
+    np.fill_diagonal(gagnes, 0)
+    return notes + k / (n - 1) * (gagnes.sum(axis=1) - attendus.sum(axis=1))
+
+
+def _agrandir(notes: np.ndarray, taille: int) -> np.ndarray:
+    """Complète le tableau des notes (indexé par identifiant) si besoin."""
+    if len(notes) >= taille:
+        return notes
+    return np.concatenate([notes, np.full(taille - len(notes), NOTE_INITIALE)])
+
+
+def apply_races(state: dict, results: pd.DataFrame) -> dict:
+    """
+    Met à jour les notes avec les résultats de nouvelles courses, traitées dans
+    l'ordre chronologique (postérieures aux courses déjà traitées).
+
+    L'état reçu n'est pas modifié (il peut être partagé par d'autres sessions).
+
+    Parameters
+    ----------
+    state : dict
+        Notes à compléter.
+    results : pd.DataFrame
+        Résultats des nouvelles courses, avec year et round.
+
+    Returns
+    -------
+    dict
+        L'état à jour.
+    """
+    if results.empty:
+        return state
+    results = results.sort_values(["year", "round", "positionOrder"], kind="stable")
+    pilotes = _agrandir(state["pilotes"].copy(), int(results["driverId"].max()) + 1)
+    ecuries = _agrandir(
+        state["ecuries"].copy(), int(results["constructorId"].max()) + 1
+    )
+    reprises = dict(state["reprises"])
+
+    course = results["raceId"].to_numpy()
+    annee = results["year"].to_numpy()
+    pilote = results["driverId"].to_numpy()
+    ecurie = results["constructorId"].to_numpy()
+    position = results["positionOrder"].to_numpy()
+    debuts = np.r_[0, np.flatnonzero(np.diff(course)) + 1, len(course)]
+
+    for debut, fin in zip(debuts[:-1], debuts[1:]):
+        ids = pilote[debut:fin]
+        pilotes[ids] = maj_elo(pilotes[ids], position[debut:fin])
+
+        # Écuries : meilleure voiture (les lignes sont triées par position)
+        ids, premiers = np.unique(ecurie[debut:fin], return_index=True)
+        ecuries[ids] = maj_elo(ecuries[ids], position[debut:fin][premiers])
+
+        if fin == len(course) or annee[fin] != annee[debut]:
+            reprises[int(annee[debut])] = (pilotes.copy(), ecuries.copy())
+
+    derniere = results.iloc[-1]
+    return {
+        "pilotes": pilotes,
+        "ecuries": ecuries,
+        "courses": np.union1d(state["courses"], np.unique(course)),
+        "derniere": (int(derniere["year"]), int(derniere["round"])),
+        "reprises": reprises,
+    }
+
+
+def _reprendre(state: dict, saison: int) -> dict:
+    """État à la fin de la saison précédant `saison` (point de reprise)."""
+    anterieures = [annee for annee in state["reprises"] if annee < saison]
+    if not anterieures:
+        return etat_initial()
+    annee = max(anterieures)
+    pilotes, ecuries = state["reprises"][annee]
+    courses = load_table("races")
+    courses = courses.loc[courses["year"] <= annee, "raceId"].to_numpy()
+    return {
+        "pilotes": pilotes,
+        "ecuries": ecuries,
+        "courses": np.intersect1d(state["courses"], courses),
+        "derniere": (annee, np.inf),
+        "reprises": {a: v for a, v in state["reprises"].items() if a <= annee},
+    }
+
+
+def extend(state: dict) -> dict:
+    """
+    Complète des notes avec les courses de results qu'elles n'ont pas encore
+    traitées.
+
+    Parameters
+    ----------
+    state : dict
+        Notes à compléter (etat_initial() pour tout l'historique).
+
+    Returns
+    -------
+    dict
+        Les notes à jour.
+    """
+    races = load_table("races")[["raceId", "year", "round"]]
+    results = load_table("results")[
+        ["raceId", "driverId", "constructorId", "positionOrder"]
+    ].merge(races, on="raceId")
+    nouvelles = results[~results["raceId"].isin(state["courses"])]
+    if nouvelles.empty:
+        return state
+
+    premiere = nouvelles.sort_values(["year", "round"]).iloc[0]
+    if (premiere["year"], premiere["round"]) <= state["derniere"]:
+        state = _reprendre(state, int(premiere["year"]))
+        nouvelles = results[~results["raceId"].isin(state["courses"])]
+    return apply_races(state, nouvelles)
+
+
+def ratings() -> dict:
+    """
+    Notes de la version courante des données : en mémoire, sinon relues sur
+    disque, sinon calculées à partir des dernières notes connues du processus
+    (seules les nouvelles courses sont traitées).
+
+    Returns
+    -------
+    dict
+        {"pilotes": note par driverId, "ecuries": note par constructorId,
+        "courses": raceIds traités, "derniere": (saison, manche),
+        "reprises": saison -> (notes des pilotes, notes des écuries)}.
+        Partagé : ne pas le modifier en place.
+    """
+
+    def compute() -> dict:
+        global _dernier
+        with _lock:
+            state = disk_cache.get_or_compute(
+                ("notes", "elo", disk_cache.code_version(__name__)),
+                lambda: extend(_dernier or etat_initial()),
+                RATING_TABLES,
+            )
+            _dernier = state
+        return state
+
+    return get_or_compute(("notes", "elo", version_id(RATING_TABLES)), compute)
+
+
+def classement_elo(
+    categorie: str = "pilotes", saison: int | None = None, nb: int = 20
+) -> pd.DataFrame:
+    """
+    Meilleures notes des pilotes ou des écuries, à la fin d'une saison ou
+    actuelles.
+
+    Parameters
+    ----------
+    categorie : str
+        "pilotes" ou "ecuries".
+    saison : int | None
+        Saison (notes à la fin de celle-ci), ou None pour les notes actuelles.
+    nb : int
+        Nombre de lignes renvoyées.
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes : nom, note, triées par note décroissante.
+    """
+    if categorie not in ("pilotes", "ecuries"):
+        raise ValueError("La catégorie doit être 'pilotes' ou 'ecuries'.")
+    state = ratings()
+    if saison is None:
+        notes = state[categorie]
+    elif saison in state["reprises"]:
+        notes = state["reprises"][saison][0 if categorie == "pilotes" else 1]
+    else:
+        raise ValueError(f"Aucune note pour la saison : {saison}")
+
+    if categorie == "pilotes":
+        drivers = load_table("drivers").set_index("driverId")
+        noms = drivers["forename"] + " " + drivers["surname"]
+    else:
+        noms = load_table("constructors").set_index("constructorId")["name"]
+
+    notes = pd.Series(notes, name="note")
+    notes = notes[notes != NOTE_INITIALE]  # identifiants sans course
+    df = pd.DataFrame({"nom": notes.index.map(noms), "note": notes.to_numpy()})
+    return df.sort_values("note", ascending=False).head(nb).reset_index(drop=True)
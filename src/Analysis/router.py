@@ -3,12 +3,46 @@ Routeur entre les identifiants de questions et les fonctions associées
 (pour les requêtes et pour les graphes).
 """
 
-from typing import Callable
+import inspect
+from typing import Any, Callable
+
+import pandas as pd
+
+from src.Analysis import disk_cache, workers
+from src.Analysis.cube import CUBE_TABLES
+from src.Analysis.cache import freeze, get_or_compute
+from src.Analysis.manifest import version_id
+from src.Analysis.workers import func_path
 from src.Analysis.Queries import queries_pilotes, queries_ecuries, queries_pit_stops
+from src.Analysis.Queries import queries_cube, queries_sql
 from src.Analysis.Graphs import graphs_pilotes, graphs_ecuries, graphs_pit_stops
 
+# Méthodes servies par la base SQLite indexée (voir sqlite_store), disponible
+# pour toutes les questions, et par le cube de résultats (voir cube)
+SQL_METHOD = "sqlite"
+CUBE_METHOD = "cube"
+ALT_METHODS = (SQL_METHOD, CUBE_METHOD)
+
+# Tables lues par chaque question : seules leurs versions figurent dans la clé
+# de cache, une mise à jour des autres tables ne l'invalide donc pas.
+QUESTION_TABLES: dict[str, list[str]] = {
+    "q1": ["drivers", "results"],
+    "q2": ["drivers", "driver_standings", "races"],
+    "q3": ["driver_standings", "drivers", "races"],
+    "q4": ["constructor_standings", "constructors", "races"],
+    "q5": ["pit_stops", "races", "results", "constructors"],
+    "q6": ["pit_stops", "races"],
+    "q7": ["drivers", "results", "races"],
+    "q8": ["results", "races", "constructors"],
+    "q9": ["constructor_standings", "constructors", "races"],
+    "q10": ["results", "races", "status", "qualifying", "drivers", "constructors"],
+}
+
+# Tables lues en plus quand un paramètre booléen est activé
+PARAM_TABLES: dict[str, list[str]] = {"inclure_sprints": ["sprint_results"]}
 
-def get_question(question_id: str) -> Callable | None:
+
+def get_question(question_id: str, method: str | None = None) -> Callable | None:
     """
     Associe un identifiant de question à sa fonction de requête.
 
@@ -16,12 +50,41 @@ def get_question(question_id: str) -> Callable | None:
     ----------
     question_id : str
         Identifiant de la question
+    method : str | None
+        "sqlite" pour l'implémentation SQL (voir queries_sql), "cube" pour
+        celle qui s'appuie sur le cube de résultats (voir queries_cube), sinon
+        None.
 
     Returns
     -------
     Callable | None
         La fonction de requête correspondante ou None si non trouvée.
     """
+    if method == SQL_METHOD:
+        functions = {
+            "q1": queries_sql.nombre_victoires_pilotes,
+            "q2": queries_sql.classement_saison,
+            "q3": queries_sql.temps_de_carriere_pilotes,
+            "q4": queries_sql.victoires_ecuries_saison,
+            "q5": queries_sql.pit_stop,
+            "q6": queries_sql.min_pit_stop,
+            "q7": queries_sql.statistiques_pilote,
+            "q8": queries_sql.ecuries_points,
+            "q9": queries_sql.victoires_ecurie_relatif,
+            "q10": queries_sql.duels_coequipiers,
+        }
+        return functions.get(question_id)
+
+    if method == CUBE_METHOD:
+        functions = {
+            "q1": queries_cube.nombre_victoires_pilotes,
+            "q4": queries_cube.victoires_ecuries_saison,
+            "q7": queries_cube.statistiques_pilote,
+            "q8": queries_cube.ecuries_points,
+            "q9": queries_cube.victoires_ecurie_relatif,
+        }
+        return functions.get(question_id)
+
     functions = {
         "q1": queries_pilotes.nombre_victoires_pilotes,
         "q2": queries_pilotes.classement_saison,
@@ -32,6 +95,7 @@ def get_question(question_id: str) -> Callable | None:
         "q7": queries_pilotes.statistiques_pilote,
         "q8": queries_ecuries.ecuries_points,
         "q9": queries_ecuries.victoires_ecurie_relatif,
+        "q10": queries_pilotes.duels_coequipiers,
     }
     return functions.get(question_id)
 
@@ -59,5 +123,147 @@ def get_graph(question_id: str) -> Callable | None:
         "q6": graphs_pit_stops.plot_min_pit_stop,
         "q7": graphs_pilotes.plot_carriere_pilote,
         "q8": graphs_ecuries.plot_classement_saison_ecuries,
+        "q10": graphs_pilotes.plot_duels_coequipiers,
     }
     return functions.get(question_id)
+
+
+def affected_questions(tables: list[str]) -> list[str]:
+    """
+    Questions dont le résultat dépend d'au moins une des tables données.
+
+    Parameters
+    ----------
+    tables : list[str]
+        Tables modifiées.
+
+    Returns
+    -------
+    list[str]
+        Identifiants des questions concernées.
+    """
+    return [
+        question_id
+        for question_id, deps in QUESTION_TABLES.items()
+        if set(deps) & set(tables)
+    ]
+
+
+def question_methods(question_id: str) -> list[str]:
+    """
+    Méthodes disponibles pour une question : "pandas" (et "homemade" si la
+    fonction de requête a un paramètre `method`), puis "sqlite" et, si la
+    question s'en déduit, "cube".
+    """
+    query_func = get_question(question_id)
+    if query_func is None:
+        raise ValueError(f"Question inconnue : {question_id}")
+    methods = ["pandas"]
+    if "method" in inspect.signature(query_func).parameters:
+        methods.append("homemade")
+    return methods + [m for m in ALT_METHODS if get_question(question_id, m)]
+
+
+def question_tables(
+    question_id: str, method: str | None = None, arguments: dict | None = None
+) -> list[str]:
+    """
+    Tables dont dépend le résultat d'une question pour une méthode et des
+    paramètres donnés (le cube dépend de toutes les tables qui le composent ;
+    sprint_results n'est lue qu'avec inclure_sprints=True, voir PARAM_TABLES).
+    """
+    tables = set(QUESTION_TABLES[question_id])
+    for param, extra in PARAM_TABLES.items():
+        if arguments and arguments.get(param):
+            tables |= set(extra)
+    if method == CUBE_METHOD:
+        tables |= set(CUBE_TABLES)
+    return sorted(tables)
+
+
+def _resolve(question_id: str, kwargs: dict) -> tuple[Callable, dict, str | None]:
+    """
+    Fonction de requête à appeler : avec method="sqlite" ou method="cube"
+    (argument nommé), l'implémentation correspondante, qui ne prend pas de
+    paramètre `method`.
+
+    Returns
+    -------
+    tuple[Callable, dict, str | None]
+        (fonction, paramètres nommés à lui passer, méthode alternative ou None).
+    """
+    method = kwargs.get("method")
+    if method in ALT_METHODS:
+        kwargs = {k: v for k, v in kwargs.items() if k != "method"}
+    else:
+        method = None
+    query_func = get_question(question_id, method)
+    if query_func is None:
+        raise ValueError(f"Question inconnue : {question_id} ({method})")
+    return query_func, kwargs, method
+
+
+def question_key(question_id: str, *args, **kwargs) -> tuple:
+    """
+    Construit la clé de cache d'un appel de question : les arguments sont
+    normalisés via la signature de la fonction (positionnels ou nommés,
+    valeurs par défaut explicites), et la version des tables lues par la
+    question y figure.
+
+    Parameters
+    ----------
+    question_id : str
+        Identifiant de la question
+    *args, **kwargs
+        Paramètres passés à la fonction de requête (method="sqlite" ou
+        method="cube", nommé, pour les implémentations alternatives).
+
+    Returns
+    -------
+    tuple
+        Clé hashable ("requete", question_id, version des données, paramètres).
+    """
+    query_func, kwargs, method = _resolve(question_id, kwargs)
+    bound = inspect.signature(query_func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    if method:
+        arguments["method"] = method
+    version = version_id(question_tables(question_id, method, arguments))
+    return ("requete", question_id, version, freeze(arguments))
+
+
+def run_question(question_id: str, *args, **kwargs) -> Any:
+    """
+    Exécute une question en passant par le cache de résultats : un même appel
+    (mêmes paramètres) n'est calculé qu'une fois par processus, et une seule
+    fois tant que les données et le code ne changent pas grâce au cache disque.
+    Le calcul est confié au pool de processus de calcul s'il est configuré
+    (F1_WORKERS).
+
+    Parameters
+    ----------
+    question_id : str
+        Identifiant de la question
+    *args, **kwargs
+        Paramètres passés à la fonction de requête (method="sqlite" ou
+        method="cube", nommé, pour les implémentations alternatives).
+
+    Returns
+    -------
+    Any
+        Résultat de la requête (copie si c'est un DataFrame, les fonctions de
+        graphe pouvant modifier leurs données).
+    """
+    key = question_key(question_id, *args, **kwargs)
+    query_func, kwargs, method = _resolve(question_id, kwargs)
+    path = func_path(query_func)
+    result = get_or_compute(
+        key,
+        lambda: disk_cache.get_or_compute(
+            (path, disk_cache.code_version(path), key[3]),
+            lambda: workers.run(path, *args, **kwargs),
+            question_tables(question_id, method, dict(key[3])),
+        ),
+    )
+    return result.copy() if isinstance(result, pd.DataFrame) else result
@@ -0,0 +1,285 @@
+"""
+Barèmes de points FIA sous forme de tableaux de correspondance, appliqués à des
+colonnes entières de positions par indexation NumPy (sans appel Python par
+ligne).
+
+Deux systèmes sont disponibles :
+- "moderne" : le barème actuel (points_bareme) appliqué à toutes les saisons,
+  utilisé par défaut par les questions ;
+- "historique" : le barème en vigueur chaque saison, avec le point du meilleur
+  tour (1950-1959, puis depuis 2019 pour un pilote classé dans les dix
+  premiers), les courses à demi-points et la course à points doubles (Abu
+  Dhabi 2014).
+
+Les courses sprint ont leurs propres tableaux (session "sprint") : barème
+actuel des sprints pour le système "moderne", barème de la saison (3-2-1 en
+2021) pour le système "historique", sans point du meilleur tour.
+
+Ne sont pas modélisés : les résultats retirés du total (meilleurs résultats
+seulement, jusqu'en 1990) et les points partagés entre pilotes d'une même
+voiture dans les années 1950.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.Analysis.cache import get_or_compute, load_table
+from src.Analysis.manifest import version_id
+from src.Analysis.utils import INDEX_TABLES, points_bareme
+
+# Positions couvertes par les tableaux (au-delà : 0 point)
+POSITION_MAX = 40
+
+# Barèmes historiques des pilotes : (première saison, dernière saison, points
+# des positions 1, 2, ..., point du meilleur tour, position maximale pour ce
+# point ou None sans condition)
+SYSTEMES_HISTORIQUES = [
+    (1950, 1959, (8, 6, 4, 3, 2), 1, None),
+    (1960, 1960, (8, 6, 4, 3, 2, 1), 0, None),
+    (1961, 1990, (9, 6, 4, 3, 2, 1), 0, None),
+    (1991, 2002, (10, 6, 4, 3, 2, 1), 0, None),
+    (2003, 2009, (10, 8, 6, 5, 4, 3, 2, 1), 0, None),
+    (2010, 2018, (25, 18, 15, 12, 10, 8, 6, 4, 2, 1), 0, None),
+    (2019, 2100, (25, 18, 15, 12, 10, 8, 6, 4, 2, 1), 1, 10),
+]
+
+# Barèmes des courses sprint : (première saison, dernière saison, points)
+SYSTEMES_SPRINT = [
+    (2021, 2021, (3, 2, 1)),
+    (2022, 2100, (8, 7, 6, 5, 4, 3, 2, 1)),
+]
+
+# Courses dont les points ont été multipliés : (saison, manche) -> coefficient
+COEFFICIENTS = {
+    (1975, 4): 0.5,  # Espagne, course arrêtée
+    (1975, 12): 0.5,  # Autriche
+    (1984, 6): 0.5,  # Monaco
+    (1991, 16): 0.5,  # Australie
+    (2009, 2): 0.5,  # Malaisie
+    (2014, 19): 2.0,  # Abu Dhabi, points doubles
+    (2021, 12): 0.5,  # Belgique
+}
+
+
+def table_points(
+    systeme: str = "moderne", session: str = "course"
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tableaux de correspondance d'un système de points.
+
+    Parameters
+    ----------
+    systeme : str
+        "moderne" ou "historique".
+    session : str
+        "course" ou "sprint".
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        (saisons couvertes, points[saison, position] de forme
+        (nb_saisons, POSITION_MAX + 1) avec une colonne 0 nulle, point du
+        meilleur tour par position et par saison, de même forme).
+    """
+    if systeme not in ("moderne", "historique"):
+        raise ValueError("Le système doit être 'moderne' ou 'historique'.")
+    if session not in ("course", "sprint"):
+        raise ValueError("La session doit être 'course' ou 'sprint'.")
+
+    annees = np.arange(SYSTEMES_HISTORIQUES[0][0], SYSTEMES_HISTORIQUES[-1][1] + 1)
+    points = np.zeros((len(annees), POSITION_MAX + 1))
+    meilleur_tour = np.zeros((len(annees), POSITION_MAX + 1))
+    if session == "sprint":
+        systemes = SYSTEMES_SPRINT
+        if systeme == "moderne":
+            systemes = [(annees[0], annees[-1], SYSTEMES_SPRINT[-1][2])]
+        for debut, fin, bareme in systemes:
+            lignes = slice(debut - annees[0], fin - annees[0] + 1)
+            points[lignes, 1 + np.arange(len(bareme))] = bareme
+        return annees, points, meilleur_tour
+
+    if systeme == "moderne":
+        for position, pts in points_bareme.items():
+            points[:, position] = pts
+        return annees, points, meilleur_tour
+
+    for debut, fin, bareme, bonus, position_max in SYSTEMES_HISTORIQUES:
+        lignes = slice(debut - annees[0], fin - annees[0] + 1)
+        points[lignes, 1 + np.arange(len(bareme))] = bareme
+        meilleur_tour[lignes, 1 + np.arange(position_max or POSITION_MAX)] = bonus
+    return annees, points, meilleur_tour
+
+
+def points_course(
+    positions,
+    annees=None,
+    systeme: str = "moderne",
+    meilleur_tour=None,
+    coefficients=None,
+    session: str = "course",
+) -> np.ndarray:
+    """
+    Points obtenus pour des positions d'arrivée, en une seule indexation des
+    tableaux du système choisi.
+
+    Parameters
+    ----------
+    positions : array-like
+        Positions d'arrivée (valeurs manquantes, nulles ou au-delà de
+        POSITION_MAX : 0 point).
+    annees : array-like | None
+        Saison de chaque position (obligatoire pour le système "historique").
+    systeme : str
+        "moderne" ou "historique".
+    meilleur_tour : array-like | None
+        Booléens : le pilote a réalisé le meilleur tour de la course.
+    coefficients : array-like | None
+        Multiplicateur des points de chaque course (demi-points, points doubles).
+    session : str
+        "course" ou "sprint".
+
+    Returns
+    -------
+    np.ndarray
+        Points de chaque position (float).
+    """
+    tableau_annees, points, bonus = table_points(systeme, session)
+    positions = pd.to_numeric(pd.Series(np.asarray(positions)), errors="coerce")
+    positions = positions.fillna(0).to_numpy()
+    colonnes = np.where(
+        (positions > 0) & (positions <= POSITION_MAX), positions, 0
+    ).astype(np.intp)
+
+    if annees is None:
+        if systeme == "historique":
+            raise ValueError("Les saisons sont nécessaires au barème historique.")
+        lignes = np.full(len(colonnes), len(tableau_annees) - 1)
+    else:
+        lignes = np.asarray(annees, dtype=np.intp) - tableau_annees[0]
+        lignes = np.clip(lignes, 0, len(tableau_annees) - 1)
+
+    resultat = points[lignes, colonnes]
+    if meilleur_tour is not None:
+        resultat = resultat + bonus[lignes, colonnes] * np.asarray(meilleur_tour)
+    if coefficients is not None:
+        resultat = resultat * np.asarray(coefficients, dtype=float)
+    return resultat
+
+
+def points_resultats(
+    df: pd.DataFrame, systeme: str = "moderne", position: str = "positionOrder"
+) -> np.ndarray:
+    """
+    Points de chaque ligne de résultats (toutes saisons confondues) selon un
+    système de points.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Résultats joints aux courses : colonnes `position`, year, round et,
+        si disponibles, rank (1 pour le meilleur tour, renseigné depuis 2004)
+        et session ("sprint" : barème des courses sprint, voir
+        utils.resultats_sessions).
+    systeme : str
+        "moderne" ou "historique".
+    position : str
+        Colonne des positions d'arrivée.
+
+    Returns
+    -------
+    np.ndarray
+        Points de chaque ligne, dans l'ordre de `df`.
+    """
+    meilleur_tour, coefficients = None, None
+    if systeme == "historique":
+        if "rank" in df.columns:
+            rang = pd.to_numeric(df["rank"], errors="coerce")
+            meilleur_tour = rang.to_numpy() == 1
+        courses = pd.MultiIndex.from_arrays([df["year"], df["round"]])
+        coefficients = pd.Series(COEFFICIENTS).reindex(courses).fillna(1.0).to_numpy()
+
+    points = points_course(
+        df[position],
+        df["year"],
+        systeme=systeme,
+        meilleur_tour=meilleur_tour,
+        coefficients=coefficients,
+    )
+    if "session" in df.columns:
+        sprint = (df["session"] == "sprint").to_numpy()
+        if sprint.any():
+            points[sprint] = points_course(
+                df.loc[sprint, position],
+                df.loc[sprint, "year"],
+                systeme=systeme,
+                session="sprint",
+            )
+    return points
+
+
+def _comptes(
+    saisons: np.ndarray, entites: np.ndarray, colonnes: np.ndarray, poids: np.ndarray
+) -> dict:
+    """Comptes pondérés des positions par couple (saison, entité)."""
+    couples = pd.MultiIndex.from_arrays([saisons, entites])
+    codes, uniques = pd.factorize(couples, sort=True)
+    comptes = np.zeros((len(uniques), POSITION_MAX + 1))
+    np.add.at(comptes, (codes, colonnes), poids)
+    return {
+        "saisons": uniques.get_level_values(0).to_numpy(),
+        "ids": uniques.get_level_values(1).to_numpy(),
+        "codes": codes,
+        "comptes": comptes,
+    }
+
+
+def comptes_positions() -> dict:
+    """
+    Tenseur (saison × pilote × position d'arrivée) des résultats, et son
+    équivalent par écurie, calculés une fois par version des tables results et
+    races. Seuls les couples (saison, pilote) présents sont stockés : une ligne
+    par couple, une colonne par position (0 pour les positions hors barème).
+
+    Les comptes sont pondérés par le coefficient de la course (0,5 pour une
+    course à demi-points, voir COEFFICIENTS) : les points d'une saison, pour
+    tout barème, sont alors comptes @ vecteur_points.
+
+    Returns
+    -------
+    dict
+        {"pilotes": {...}, "ecuries": {...}}, chacun avec "saisons", "ids"
+        (driverId ou constructorId), "comptes" et "meilleurs_tours" (mêmes
+        comptes, restreints aux meilleurs tours en course).
+        Partagé : ne pas le modifier en place.
+    """
+
+    def compute() -> dict:
+        races = load_table("races")[["raceId", "year", "round"]]
+        results = load_table("results").merge(races, on="raceId")
+        positions = pd.to_numeric(results["positionOrder"], errors="coerce")
+        positions = positions.fillna(0).to_numpy()
+        colonnes = np.where(
+            (positions > 0) & (positions <= POSITION_MAX), positions, 0
+        ).astype(np.intp)
+        courses = pd.MultiIndex.from_arrays([results["year"], results["round"]])
+        poids = pd.Series(COEFFICIENTS).reindex(courses).fillna(1.0).to_numpy()
+        meilleur_tour = pd.to_numeric(results["rank"], errors="coerce").to_numpy() == 1
+        saisons = results["year"].to_numpy()
+
+        tenseurs = {}
+        for nom, colonne in (("pilotes", "driverId"), ("ecuries", "constructorId")):
+            tenseur = _comptes(saisons, results[colonne].to_numpy(), colonnes, poids)
+            tours = np.zeros_like(tenseur["comptes"])
+            np.add.at(
+                tours,
+                (tenseur.pop("codes")[meilleur_tour], colonnes[meilleur_tour]),
+                poids[meilleur_tour],
+            )
+            tenseur["meilleurs_tours"] = tours
+            tenseurs[nom] = tenseur
+        return tenseurs
+
+    return get_or_compute(
+        ("index", "positions_saisons", version_id(INDEX_TABLES["positions_saisons"])),
+        compute,
+    )
@@ -0,0 +1,210 @@
+"""
+Stockage des tables en mémoire partagée : le processus principal publie une
+seule fois les colonnes des tables chargées dans des segments
+`multiprocessing.shared_memory`, décrits par un petit catalogue. Les processus
+de calcul s'y attachent et obtiennent des DataFrames qui pointent directement
+sur ces segments, sans relire ni recopier les CSV.
+
+Seules les colonnes numériques sont partagées sans copie (vues NumPy sur les
+segments). Les colonnes texte sont encodées en dictionnaire pour la
+transmission : les codes (entiers) sont publiés dans des segments, et le
+dictionnaire des valeurs distinctes, petit, figure dans le catalogue. Chaque
+processus de calcul les décode toutefois dans sa propre colonne `object` (un
+pointeur par ligne vers les chaînes du dictionnaire, chacune stockée une fois) :
+les requêtes concatènent, complètent et regroupent ces colonnes comme du texte,
+ce que ne permettent pas les colonnes catégorielles
+(`pd.Categorical.from_codes`). La mémoire propre à un processus est donc de
+8 octets par ligne et par colonne texte, sans relecture des CSV.
+"""
+
+import atexit
+import os
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from src.Analysis.cache import load_table, put
+from src.Analysis.manifest import version_id
+
+# Segments créés (processus principal) ou ouverts (processus de calcul) : ils
+# doivent rester référencés tant que les DataFrames qui les utilisent existent.
+_segments: list[SharedMemory] = []
+_published: list[SharedMemory] = []
+_lock = threading.Lock()
+
+
+def csv_tables() -> list[str]:
+    """Noms (sans extension) des fichiers CSV du dossier data."""
+    return sorted(f[: -len(".csv")] for f in os.listdir("data") if f.endswith(".csv"))
+
+
+def _to_segment(values: np.ndarray) -> tuple[SharedMemory, np.ndarray]:
+    """Copie un tableau NumPy dans un nouveau segment de mémoire partagée."""
+    shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+    shared = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+    shared[:] = values
+    return shm, shared
+
+
+def _open_segment(name: str) -> SharedMemory:
+    """
+    Ouvre un segment existant sans l'enregistrer auprès du resource_tracker :
+    seul le processus qui l'a créé est responsable de sa suppression.
+    """
+    try:
+        return SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def publish_tables(names: list[str] | None = None) -> dict:
+    """
+    Publie des tables en mémoire partagée et renvoie leur catalogue.
+
+    Parameters
+    ----------
+    names : list[str] | None
+        Tables à publier (tous les CSV du dossier data si None).
+
+    Returns
+    -------
+    dict
+        Catalogue {table: {"version": str, "nrows": int, "columns": [...]}},
+        "version" étant celle du fichier publié ; chaque colonne est
+        décrite par son nom, le segment, le type NumPy et, pour les colonnes
+        texte, le dictionnaire des valeurs ("categories").
+    """
+    catalog = {}
+    for name in names if names is not None else csv_tables():
+        df = load_table(name)
+        columns = []
+        for col in df.columns:
+            values = df[col].to_numpy()
+            categories = None
+            if values.dtype == object:
+                codes, uniques = pd.factorize(values, use_na_sentinel=True)
+                values = codes.astype(np.int32)
+                categories = list(uniques)
+
+            shm, _ = _to_segment(values)
+            with _lock:
+                _published.append(shm)
+            columns.append(
+                {
+                    "name": col,
+                    "shm": shm.name,
+                    "dtype": values.dtype.str,
+                    "categories": categories,
+                }
+            )
+        catalog[name] = {
+            "version": version_id([name]),
+            "nrows": len(df),
+            "columns": columns,
+        }
+    return catalog
+
+
+def attach_table(entry: dict) -> pd.DataFrame:
+    """
+    Reconstruit un DataFrame à partir de son entrée de catalogue.
+
+    Les colonnes numériques sont des vues en lecture seule sur les segments
+    partagés ; les colonnes texte sont décodées à partir de leurs codes dans
+    une colonne `object` propre au processus (voir l'en-tête du module).
+
+    Parameters
+    ----------
+    entry : dict
+        Entrée du catalogue renvoyé par `publish_tables`.
+
+    Returns
+    -------
+    pd.DataFrame
+        La table.
+    """
+    data = {}
+    for column in entry["columns"]:
+        shm = _open_segment(column["shm"])
+        with _lock:
+            _segments.append(shm)
+        # frombuffer garde une référence exportée sur le segment : il ne peut
+        # pas être refermé (démappé) tant que la colonne existe
+        values = np.frombuffer(
+            shm.buf, dtype=np.dtype(column["dtype"]), count=entry["nrows"]
+        )
+        values.flags.writeable = False
+
+        if column["categories"] is not None:
+            categories = np.array(column["categories"] + [np.nan], dtype=object)
+            values = categories[values]  # le code -1 désigne une valeur manquante
+        data[column["name"]] = values
+
+    # copy=False : pandas garde un bloc par colonne, sans copie ni consolidation
+    return pd.DataFrame(data, copy=False)
+
+
+def attach_tables(catalog: dict) -> None:
+    """
+    Enregistre dans le cache local les tables du catalogue : les appels
+    suivants à `load_table` utilisent la mémoire partagée au lieu des CSV.
+    Sert d'initialiseur aux processus de calcul.
+
+    Parameters
+    ----------
+    catalog : dict
+        Catalogue renvoyé par `publish_tables`.
+    """
+    for name, entry in catalog.items():
+        # Épinglées : évincer une vue partagée obligerait à relire le CSV
+        put(("table", name, entry["version"]), attach_table(entry), pin=True)
+
+
+def share_tables(names: list[str] | None = None) -> dict:
+    """
+    Publie les tables puis remplace aussi les copies du processus courant par
+    des vues sur la mémoire partagée (une seule copie de chaque colonne
+    numérique).
+
+    Parameters
+    ----------
+    names : list[str] | None
+        Tables à publier (tous les CSV du dossier data si None).
+
+    Returns
+    -------
+    dict
+        Le catalogue, à transmettre aux processus de calcul.
+    """
+    catalog = publish_tables(names)
+    attach_tables(catalog)
+    return catalog
+
+
+@atexit.register
+def release_tables() -> None:
+    """
+    Supprime les segments créés par ce processus et ferme les segments ouverts.
+    Un segment encore utilisé par des DataFrames n'est pas démappé : ses
+    colonnes référencent sa vue mémoire, libérée quand elles disparaissent.
+    """
+    with _lock:
+        for shm in _published:
+            shm.unlink()
+        for shm in _segments + _published:
+            try:
+                shm.close()
+            except BufferError:
+                # Sans ces références, SharedMemory.__del__ tenterait à nouveau
+                # de fermer le segment pendant que les colonnes l'utilisent
+                shm._buf = shm._mmap = None
+        _segments.clear()
+        _published.clear()
@@ -0,0 +1,168 @@
+"""
+Sketches de quantiles fusionnables pour les durées de pit-stop.
+
+Un sketch compte les valeurs par intervalle logarithmique : l'intervalle i
+couvre ]GAMMA^(i-1), GAMMA^i] avec GAMMA = (1 + PRECISION) / (1 - PRECISION),
+et toute valeur de l'intervalle est estimée à PRECISION près (erreur
+relative). Les intervalles sont les mêmes pour tous les sketches : fusionner
+deux sketches (saisons, écuries, lignées d'écuries) revient à additionner
+leurs comptes, sans relire les arrêts.
+
+Les sketches des pit-stops (un par couple (constructorId, saison)) sont
+construits en une seule lecture de pit_stops.csv par blocs de lignes, puis
+conservés en mémoire par version des données.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.Analysis.cache import get_or_compute, load_table
+from src.Analysis.manifest import DATA_DIR, version_id
+from src.Analysis.utils import INDEX_TABLES
+
+# Erreur relative maximale des quantiles estimés
+PRECISION = 0.005
+GAMMA = (1 + PRECISION) / (1 - PRECISION)
+
+# Valeurs couvertes (en millisecondes) : au-delà, dernier intervalle
+VALEUR_MAX = 1e8
+NB_INTERVALLES = int(np.ceil(np.log(VALEUR_MAX) / np.log(GAMMA))) + 1
+
+
+def indices_intervalles(valeurs) -> np.ndarray:
+    """Intervalle de chaque valeur (valeurs <= 1 : intervalle 0)."""
+    valeurs = np.maximum(np.asarray(valeurs, dtype=float), 1)
+    indices = np.ceil(np.log(valeurs) / np.log(GAMMA)).astype(np.intp)
+    return np.minimum(indices, NB_INTERVALLES - 1)
+
+
+def valeurs_intervalles() -> np.ndarray:
+    """Valeur représentative de chaque intervalle (erreur relative PRECISION)."""
+    return 2 * GAMMA ** np.arange(NB_INTERVALLES) / (GAMMA + 1)
+
+
+def fusionner(comptes: np.ndarray, groupes) -> np.ndarray:
+    """
+    Fusionne des sketches par groupe.
+
+    Parameters
+    ----------
+    comptes : np.ndarray
+        Sketches à fusionner, (nb_sketches, NB_INTERVALLES).
+    groupes : array-like
+        Numéro du groupe de chaque sketch (0 à nb_groupes - 1).
+
+    Returns
+    -------
+    np.ndarray
+        Sketch de chaque groupe, (nb_groupes, NB_INTERVALLES).
+    """
+    groupes = np.asarray(groupes, dtype=np.intp)
+    fusion = np.zeros((groupes.max(initial=-1) + 1, comptes.shape[1]), np.int64)
+    np.add.at(fusion, groupes, comptes)
+    return fusion
+
+
+def quantiles(comptes: np.ndarray, probabilites) -> np.ndarray:
+    """
+    Quantiles estimés de chaque sketch : valeur de rang
+    floor(probabilité × (effectif - 1)), comme np.quantile(method="lower").
+
+    Parameters
+    ----------
+    comptes : np.ndarray
+        Sketches, (nb_sketches, NB_INTERVALLES).
+    probabilites : array-like
+        Probabilités des quantiles (entre 0 et 1).
+
+    Returns
+    -------
+    np.ndarray
+        Quantiles, (nb_sketches, nb_probabilites) ; NaN pour un sketch vide.
+    """
+    probabilites = np.asarray(probabilites, dtype=float)
+    cumul = comptes.cumsum(axis=1)
+    effectifs = cumul[:, -1:]
+    rangs = np.floor(probabilites[None, :] * (effectifs - 1))
+    indices = np.empty(rangs.shape, dtype=np.intp)
+    for j in range(len(probabilites)):
+        indices[:, j] = (cumul > rangs[:, [j]]).argmax(axis=1)
+    resultat = valeurs_intervalles()[indices]
+    resultat[effectifs[:, 0] == 0] = np.nan
+    return resultat
+
+
+def construire_sketches(taille_bloc: int = 100000) -> dict:
+    """
+    Construit les sketches des durées de pit-stop par (constructorId, saison)
+    en une seule lecture de pit_stops.csv, par blocs de `taille_bloc` lignes.
+
+    Chaque arrêt est rattaché au résultat du même pilote dans la même course
+    (comme pour q5). Aucun arrêt n'est écarté : les valeurs aberrantes restent
+    dans les sketches et n'influencent que les quantiles extrêmes.
+
+    Returns
+    -------
+    dict
+        {"cles": pd.MultiIndex (constructorId, saison), "comptes": np.ndarray
+        (nb_cles, NB_INTERVALLES)}.
+    """
+    annees = load_table("races").set_index("raceId")["year"]
+    ecuries = load_table("results")[
+        ["raceId", "driverId", "constructorId"]
+    ].drop_duplicates(["raceId", "driverId"])
+
+    lignes: dict[tuple[int, int], int] = {}
+    comptes = np.zeros((0, NB_INTERVALLES), dtype=np.int64)
+    blocs = pd.read_csv(
+        os.path.join(DATA_DIR, "pit_stops.csv"),
+        usecols=["raceId", "driverId", "milliseconds"],
+        chunksize=taille_bloc,
+    )
+    for bloc in blocs:
+        bloc = bloc.merge(ecuries, on=["raceId", "driverId"])
+        saisons = bloc["raceId"].map(annees)
+        bloc = bloc[saisons.notna()]
+        cles = pd.MultiIndex.from_arrays(
+            [bloc["constructorId"], saisons[saisons.notna()].astype("int64")]
+        )
+        codes, uniques = pd.factorize(cles)
+        nouvelles = [cle for cle in uniques if cle not in lignes]
+        for cle in nouvelles:
+            lignes[cle] = len(lignes)
+        if nouvelles:
+            comptes = np.vstack(
+                [comptes, np.zeros((len(nouvelles), NB_INTERVALLES), np.int64)]
+            )
+        rangs = np.array([lignes[cle] for cle in uniques], dtype=np.intp)
+        np.add.at(
+            comptes,
+            (rangs[codes], indices_intervalles(bloc["milliseconds"])),
+            1,
+        )
+
+    cles = pd.MultiIndex.from_arrays(
+        [[ecurie for ecurie, _ in lignes], [saison for _, saison in lignes]],
+        names=["constructorId", "saison"],
+    )
+    ordre = cles.argsort()
+    return {"cles": cles[ordre], "comptes": comptes[ordre]}
+
+
+def sketches_pit_stops() -> dict:
+    """
+    Sketches des durées de pit-stop (calculés une fois par processus et par
+    version des tables), voir construire_sketches.
+
+    Returns
+    -------
+    dict
+        {"cles": pd.MultiIndex (constructorId, saison), "comptes": np.ndarray}.
+        Partagé : ne pas le modifier en place.
+    """
+    return get_or_compute(
+        ("index", "sketches_pit_stops", version_id(INDEX_TABLES["sketches_pit_stops"])),
+        construire_sketches,
+    )
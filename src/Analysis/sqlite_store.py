@@ -0,0 +1,144 @@
+"""
+Base SQLite précompilée à partir des CSV du dossier data, utilisée comme
+moteur de requêtes (méthode "sqlite" des questions, voir Queries/queries_sql).
+
+La base est construite une fois par version des données (voir manifest), dans
+le dossier du cache disque (et évincée comme ses autres entrées), avec des
+index sur raceId, driverId, constructorId et year, ainsi que sur
+(raceId, driverId). SQLite s'exécute dans le processus, sans serveur :
+l'ouverture est quasi instantanée et les requêtes sur un pilote ou une saison
+utilisent les index au lieu de parcourir les tables.
+
+Construction manuelle (depuis la racine du projet) :
+
+    python -m src.Analysis.sqlite_store
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pandas as pd
+
+from src.Analysis import disk_cache
+from src.Analysis.cache import get_or_compute, invalidate, load_table
+from src.Analysis.manifest import current_manifest, version_id
+
+# Colonnes indexées dans chaque table qui les contient
+INDEXED_COLUMNS = ["raceId", "driverId", "constructorId", "year"]
+COMPOSITE_INDEXES = [("raceId", "driverId")]
+
+_local = threading.local()
+
+
+def database_path() -> str:
+    """Chemin de la base de la version courante des données."""
+    return os.path.join(disk_cache.cache_dir(), f"f1_{version_id()}.sqlite")
+
+
+def build_database(path: str | None = None) -> str:
+    """
+    Construit la base SQLite à partir de tous les CSV du dossier data, avec
+    ses index. L'écriture passe par un fichier temporaire renommé à la fin :
+    une base incomplète n'est jamais visible.
+
+    Parameters
+    ----------
+    path : str | None
+        Chemin de la base (celui de la version courante si None).
+
+    Returns
+    -------
+    str
+        Chemin de la base construite.
+    """
+    path = path or database_path()
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    os.close(fd)
+    con = sqlite3.connect(tmp_path)
+    try:
+        for name in sorted(current_manifest()["files"]):
+            df = load_table(name)
+            df.to_sql(name, con, index=False, if_exists="replace")
+            for col in INDEXED_COLUMNS:
+                if col in df.columns:
+                    con.execute(f"CREATE INDEX idx_{name}_{col} ON {name}({col})")
+            for cols in COMPOSITE_INDEXES:
+                if set(cols) <= set(df.columns):
+                    con.execute(
+                        f"CREATE INDEX idx_{name}_{'_'.join(cols)} "
+                        f"ON {name}({', '.join(cols)})"
+                    )
+        con.execute("ANALYZE")
+        con.commit()
+        con.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        con.close()
+        os.remove(tmp_path)
+        raise
+
+    # Les bases des autres versions (éventuellement encore utilisées par une
+    # instance qui n'a pas rechargé les données) sont évincées avec les autres
+    # entrées du cache disque, les moins récemment utilisées d'abord
+    disk_cache.evict()
+    return path
+
+
+def ensure_database() -> str:
+    """
+    Renvoie le chemin de la base de la version courante, construite si besoin
+    (une seule construction même si plusieurs sessions la demandent). Une base
+    supprimée entre-temps (cache disque vidé ou évincé) est reconstruite.
+    """
+    path = database_path()
+    key = ("sqlite", "base", version_id(), path)
+
+    def build() -> str:
+        return path if os.path.exists(path) else build_database(path)
+
+    if not os.path.exists(get_or_compute(key, build)):
+        invalidate(lambda k: k == key)
+        get_or_compute(key, build)
+    return path
+
+
+def connect() -> sqlite3.Connection:
+    """
+    Connexion en lecture seule à la base courante, propre au thread appelant
+    (les connexions SQLite ne se partagent pas entre threads).
+    """
+    path = ensure_database()
+    con = getattr(_local, "con", None)
+    if con is None or _local.path != path:
+        if con is not None:
+            con.close()
+        con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        _local.con, _local.path = con, path
+    return con
+
+
+def read_sql(query: str, params: tuple | list = ()) -> pd.DataFrame:
+    """
+    Exécute une requête SQL sur la base courante.
+
+    Parameters
+    ----------
+    query : str
+        Requête SQL (paramètres "?").
+    params : tuple | list
+        Valeurs des paramètres.
+
+    Returns
+    -------
+    pd.DataFrame
+        Résultat de la requête.
+    """
+    return pd.read_sql_query(query, connect(), params=list(params))
+
+
+if __name__ == "__main__":
+    print(build_database())
@@ -3,10 +3,26 @@ Fichier contenant des fonctions et variables transversales
 """
 
 import os
+import numpy as np
 import pandas as pd
 from functools import reduce
 import csv
 
+from src.Analysis.cache import get_or_compute, load_table
+from src.Analysis.manifest import version_id
+
+# Tables dont dépend chaque index
+INDEX_TABLES = {
+    "noms_pilotes": ["drivers"],
+    "noms_ecuries": ["constructors"],
+    "saisons_ecuries": ["constructor_standings", "constructors", "races"],
+    "saisons_lignees": ["constructor_standings", "constructors", "races"],
+    "lignees": ["constructors"],
+    "positions_saisons": ["results", "races"],
+    "resultats_sessions": ["results", "sprint_results"],
+    "sketches_pit_stops": ["pit_stops", "races", "results"],
+}
+
 
 def get_pd_df(dfs: list, keys: list, columns: dict = None) -> pd.DataFrame:
     """
@@ -16,10 +32,15 @@ def get_pd_df(dfs: list, keys: list, columns: dict = None) -> pd.DataFrame:
     ----------
         dfs (list): Liste des noms de fichiers CSV (sans extension) à charger
                     et fusionner.
-        keys (list): Liste des colonnes clés utilisées pour effectuer les jointures.
+        keys (list): Liste des colonnes clés utilisées pour effectuer les jointures
+                     (une clé peut être une liste de colonnes pour une jointure
+                     composite).
         columns (dict, optional): Dictionnaire {nom_fichier: [colonnes]} pour restreindre
             les colonnes chargées de chaque fichier.
 
+    Un nom de `dfs` peut aussi désigner une vue de VUES (par exemple
+    "resultats_sessions"), utilisée comme une table.
+
     Returns
     -------
         pd.DataFrame: DataFrame fusionné.
@@ -31,13 +52,15 @@ def get_pd_df(dfs: list, keys: list, columns: dict = None) -> pd.DataFrame:
     if len(keys) != len(dfs) - 1:
         raise ValueError("Nombre de clés incorrectes")
 
+    # Les tables sont lues une seule fois par processus ; la jointure produit un
+    # nouveau DataFrame que l'appelant peut modifier librement.
     loaded_dfs = []
     for df_name in dfs:
-        df_path = os.path.join("data", df_name + ".csv")
+        table = VUES[df_name]() if df_name in VUES else load_table(df_name)
         if columns and df_name in columns:
-            loaded_dfs.append(pd.read_csv(df_path, usecols=columns[df_name]))
+            loaded_dfs.append(table[columns[df_name]])
         else:
-            loaded_dfs.append(pd.read_csv(df_path))
+            loaded_dfs.append(table)
 
     df_merged = reduce(
         lambda left, right: pd.merge(left, right[1], on=right[0], how="inner"),
@@ -195,3 +218,273 @@ def get_python_df(dfs: list, keys: str | list) -> dict[str, list]:
 
 # Barème de points FIA (valable pour la plupart des saisons modernes)
 points_bareme = {1: 25, 2: 18, 3: 15, 4: 12, 5: 10, 6: 8, 7: 6, 8: 4, 9: 2, 10: 1}
+
+# Lignées d'écuries (rachats et changements de nom) : nom de la lignée ->
+# (constructorRef, première saison, dernière saison) de chaque époque. Une
+# écurie hors de toute époque forme sa propre lignée.
+LIGNEES = {
+    "Aston Martin": [
+        ("jordan", 1991, 2005),
+        ("mf1", 2006, 2006),
+        ("spyker_mf1", 2006, 2006),
+        ("spyker", 2007, 2007),
+        ("force_india", 2008, 2018),
+        ("racing_point", 2019, 2020),
+        ("aston_martin", 2021, 2100),
+    ],
+    "AlphaTauri": [
+        ("minardi", 1985, 2005),
+        ("toro_rosso", 2006, 2019),
+        ("alphatauri", 2020, 2023),
+        ("rb", 2024, 2100),
+    ],
+    "Alpine": [
+        ("toleman", 1981, 1985),
+        ("benetton", 1986, 2001),
+        ("renault", 2002, 2011),
+        ("lotus_f1", 2012, 2015),
+        ("renault", 2016, 2020),
+        ("alpine", 2021, 2100),
+    ],
+    "Alfa Romeo": [
+        ("sauber", 1993, 2005),
+        ("bmw_sauber", 2006, 2009),
+        ("sauber", 2010, 2018),
+        ("alfa", 2019, 2023),
+        ("sauber", 2024, 2100),
+    ],
+    "Red Bull": [
+        ("stewart", 1997, 1999),
+        ("jaguar", 2000, 2004),
+        ("red_bull", 2005, 2100),
+    ],
+    "Mercedes": [
+        ("tyrrell", 1970, 1998),
+        ("bar", 1999, 2005),
+        ("honda", 2006, 2008),
+        ("brawn", 2009, 2009),
+        ("mercedes", 2010, 2100),
+    ],
+    "McLaren": [("mclaren", 1966, 2100)],
+    "Williams": [("williams", 1977, 2100)],
+    "Ferrari": [("ferrari", 1950, 2100)],
+    "Haas": [("haas", 2016, 2100)],
+}
+
+
+def noms_pilotes() -> list[str]:
+    """
+    Liste triée des noms complets des pilotes (calculée une fois par processus
+    et par version de la table drivers).
+    """
+
+    def compute() -> list[str]:
+        drivers = load_table("drivers")
+        return sorted((drivers["forename"] + " " + drivers["surname"]).unique())
+
+    return get_or_compute(
+        ("index", "noms_pilotes", version_id(INDEX_TABLES["noms_pilotes"])), compute
+    )
+
+
+def noms_ecuries(par_lignee: bool = False) -> list[str]:
+    """
+    Liste triée des noms des écuries, ou des lignées d'écuries (voir lignees),
+    calculée une fois par processus et par version de la table constructors.
+    """
+    if par_lignee:
+        return sorted(set(lignees()["noms"]))
+    return get_or_compute(
+        ("index", "noms_ecuries", version_id(INDEX_TABLES["noms_ecuries"])),
+        lambda: sorted(load_table("constructors")["name"].unique()),
+    )
+
+
+def saisons_ecuries(par_lignee: bool = False) -> dict:
+    """
+    Index des victoires des écuries par saison (calculé une fois par processus
+    et par version des tables) : une ligne par nom d'écurie (ou par lignée
+    d'écuries, voir lignees), une colonne par saison, et les sommes cumulées
+    sur les saisons. Le total d'une écurie sur
+    une plage [début, fin] est alors cumul[:, fin + 1] - cumul[:, début], quelle
+    que soit la taille de l'historique.
+
+    Une victoire est une course conclue en tête du classement constructeurs
+    (constructor_standings.position == 1), comme pour q4 et q9.
+
+    Returns
+    -------
+    dict
+        {"ecuries": pd.Index des noms (triés), "annees": np.ndarray des saisons
+        (consécutives), "victoires": victoires par écurie et saison,
+        "cumul_victoires" et "cumul_saisons": sommes cumulées des victoires et
+        des saisons disputées, avec une première colonne nulle}.
+        Partagé : ne pas le modifier en place.
+    """
+
+    def compute() -> dict:
+        standings = load_table("constructor_standings")[
+            ["raceId", "constructorId", "position"]
+        ]
+        names = load_table("constructors").set_index("constructorId")["name"]
+        years = load_table("races").set_index("raceId")["year"]
+        annee = standings["raceId"].map(years)
+        if par_lignee:
+            ecurie = pd.Series(
+                noms_lignees(standings["constructorId"], annee.fillna(0)),
+                index=standings.index,
+            ).where(annee.notna())
+        else:
+            ecurie = standings["constructorId"].map(names)
+        valides = ecurie.notna() & annee.notna()
+        ecurie, annee = ecurie[valides], annee[valides].astype("int64")
+        victoire = (standings.loc[valides, "position"] == 1).to_numpy()
+
+        ecuries = pd.Index(sorted(ecurie.unique()))
+        annees = np.arange(annee.min(), annee.max() + 1)
+        lignes = ecuries.get_indexer(ecurie)
+        colonnes = annee.to_numpy() - annees[0]
+
+        victoires = np.zeros((len(ecuries), len(annees)), dtype=np.int64)
+        np.add.at(victoires, (lignes[victoire], colonnes[victoire]), 1)
+        presence = np.zeros((len(ecuries), len(annees)), dtype=np.int64)
+        presence[lignes, colonnes] = 1
+
+        def cumul(matrice: np.ndarray) -> np.ndarray:
+            return np.pad(matrice.cumsum(axis=1), ((0, 0), (1, 0)))
+
+        return {
+            "ecuries": ecuries,
+            "annees": annees,
+            "victoires": victoires,
+            "cumul_victoires": cumul(victoires),
+            "cumul_saisons": cumul(presence),
+        }
+
+    nom = "saisons_lignees" if par_lignee else "saisons_ecuries"
+    return get_or_compute(("index", nom, version_id(INDEX_TABLES[nom])), compute)
+
+
+def resultats_sessions() -> pd.DataFrame:
+    """
+    Vue des résultats de toutes les sessions classées : courses (results) et
+    courses sprint (sprint_results), avec une colonne `session` ("course" ou
+    "sprint"). Construite une fois par processus et par version des deux
+    tables, puis partagée par toutes les requêtes (pas de concaténation à
+    chaque appel).
+
+    Les colonnes propres à results (rank, fastestLapSpeed) valent "\\N" pour
+    les sprints, comme les autres valeurs manquantes des CSV.
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes de results et session. Partagé : ne pas le modifier en place.
+    """
+
+    def compute() -> pd.DataFrame:
+        results = load_table("results")
+        sprints = load_table("sprint_results")
+        manquantes = results.columns.difference(sprints.columns)
+        sprints = sprints.assign(**{colonne: "\\N" for colonne in manquantes})
+        return pd.concat(
+            [
+                results.assign(session="course"),
+                sprints[results.columns].assign(session="sprint"),
+            ],
+            ignore_index=True,
+        )
+
+    return get_or_compute(
+        (
+            "index",
+            "resultats_sessions",
+            version_id(INDEX_TABLES["resultats_sessions"]),
+        ),
+        compute,
+    )
+
+
+# Vues utilisables comme des tables par get_pd_df
+VUES = {"resultats_sessions": resultats_sessions}
+
+
+def lignees() -> dict:
+    """
+    Dimension des lignées d'écuries (calculée une fois par processus et par
+    version de la table constructors) : tableau lignée[constructorId, saison]
+    construit à partir de LIGNEES, appliqué à des colonnes entières par simple
+    indexation (voir noms_lignees).
+
+    Une écurie hors de toute époque de LIGNEES forme sa propre lignée, nommée
+    comme elle ; si ce nom est déjà celui d'une lignée (Alfa Romeo des années
+    1950, par exemple), il est complété par "(avant <début de l'époque>)" quand
+    la référence de l'écurie figure dans une autre époque de cette lignée.
+
+    Returns
+    -------
+    dict
+        {"annees": np.ndarray des saisons couvertes, "table": np.ndarray de
+        forme (constructorId max + 1, nb_saisons), identifiant de lignée ou -1,
+        "noms": np.ndarray du nom de chaque lignée}.
+        Partagé : ne pas le modifier en place.
+    """
+
+    def compute() -> dict:
+        constructors = load_table("constructors")
+        ids = constructors.set_index("constructorRef")["constructorId"]
+        annees = np.arange(1950, 2101)
+        table = np.full((constructors["constructorId"].max() + 1, len(annees)), -1)
+
+        noms = list(LIGNEES)
+        debuts = {}
+        for lignee, epoques in enumerate(LIGNEES.values()):
+            for ref, debut, fin in epoques:
+                if ref in ids.index:
+                    colonnes = slice(debut - annees[0], fin - annees[0] + 1)
+                    table[ids[ref], colonnes] = lignee
+                    debuts[ref] = min(debut, debuts.get(ref, debut))
+
+        for ref, nom, constructor_id in constructors[
+            ["constructorRef", "name", "constructorId"]
+        ].itertuples(index=False):
+            hors_epoques = table[constructor_id] < 0
+            if hors_epoques.any():
+                if nom in LIGNEES and debuts.get(ref) is not None:
+                    nom = f"{nom} (avant {debuts[ref]})"
+                table[constructor_id, hors_epoques] = len(noms)
+                noms.append(nom)
+
+        return {"annees": annees, "table": table, "noms": np.array(noms, dtype=object)}
+
+    return get_or_compute(
+        ("index", "lignees", version_id(INDEX_TABLES["lignees"])), compute
+    )
+
+
+def noms_lignees(constructor_ids, annees) -> np.ndarray:
+    """
+    Nom de la lignée de chaque couple (constructorId, saison), par indexation
+    de la dimension des lignées (voir lignees).
+
+    Parameters
+    ----------
+    constructor_ids : array-like
+        Identifiants des écuries.
+    annees : array-like
+        Saisons correspondantes.
+
+    Returns
+    -------
+    np.ndarray
+        Noms des lignées (None pour une écurie inconnue).
+    """
+    dimension = lignees()
+    table, premiere = dimension["table"], dimension["annees"][0]
+    ids = np.asarray(constructor_ids, dtype=np.intp)
+    colonnes = np.clip(np.asarray(annees, dtype=np.intp) - premiere, 0, None)
+    colonnes = np.minimum(colonnes, table.shape[1] - 1)
+    connus = (ids >= 0) & (ids < len(table))
+    lignee = np.full(len(ids), -1)
+    lignee[connus] = table[ids[connus], colonnes[connus]]
+    return np.where(lignee >= 0, dimension["noms"][lignee], None)
@@ -0,0 +1,120 @@
+"""
+Préchauffage des caches au démarrage : chargement des tables, construction des
+index (listes de pilotes et d'écuries) et calcul des questions avec leurs
+paramètres par défaut, dans un thread d'arrière-plan qui ne bloque pas
+l'interface.
+"""
+
+import threading
+import time
+
+from src.Analysis.cache import load_table
+from src.Analysis.router import run_question
+from src.Analysis.utils import noms_ecuries, noms_pilotes
+
+# Paramètres par défaut des questions, tels qu'affichés dans l'application
+DEFAULT_PARAMS: dict[str, dict] = {
+    "q1": {"method": "pandas", "nb_victoires": 30},
+    "q2": {"saison": 2023},
+    "q3": {"duree_min": 15},
+    "q4": {
+        "ecuries": ["Red Bull", "BMW", "Mercedes", "McLaren"],
+        "saisons": (1985, 2020),
+    },
+    "q5": {"saison": 2023},
+    "q6": {"method": "pandas"},
+    "q7": {"nom_pilote": "Lewis Hamilton"},
+    "q8": {"saison": 2023},
+    "q9": {"method": "pandas", "ecurie": "Red Bull"},
+    "q10": {"saison": 2023},
+}
+
+# Tables lues par les requêtes
+TABLES = [
+    "drivers",
+    "results",
+    "races",
+    "constructors",
+    "driver_standings",
+    "constructor_standings",
+    "pit_stops",
+    "status",
+    "qualifying",
+    "sprint_results",
+]
+
+_status = {
+    "etapes": len(TABLES) + 2 + len(DEFAULT_PARAMS),
+    "faites": 0,
+    "en_cours": None,
+    "erreurs": [],
+    "termine": False,
+    "duree": None,
+}
+_status_lock = threading.Lock()
+_thread: threading.Thread | None = None
+
+
+def _update(**changes) -> None:
+    with _status_lock:
+        _status.update(changes)
+
+
+def warm_up() -> None:
+    """
+    Charge les tables puis calcule chaque question avec ses paramètres par
+    défaut. Les erreurs sont enregistrées dans le statut sans interrompre le
+    préchauffage.
+    """
+    debut = time.perf_counter()
+    etapes = [(f"table {name}", load_table, (name,), {}) for name in TABLES]
+    etapes += [
+        ("index noms_pilotes", noms_pilotes, (), {}),
+        ("index noms_ecuries", noms_ecuries, (), {}),
+    ]
+    etapes += [
+        (question_id, run_question, (question_id,), params)
+        for question_id, params in DEFAULT_PARAMS.items()
+    ]
+
+    for i, (nom, func, args, kwargs) in enumerate(etapes):
+        _update(en_cours=nom)
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            with _status_lock:
+                _status["erreurs"].append(f"{nom} : {e}")
+        _update(faites=i + 1)
+
+    _update(en_cours=None, termine=True, duree=time.perf_counter() - debut)
+
+
+def start_warm_up() -> threading.Thread:
+    """
+    Lance le préchauffage dans un thread d'arrière-plan (une seule fois par
+    processus ; les appels suivants renvoient le thread existant).
+
+    Returns
+    -------
+    threading.Thread
+        Le thread de préchauffage.
+    """
+    global _thread
+    with _status_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+            _thread.start()
+        return _thread
+
+
+def warm_up_status() -> dict:
+    """
+    Renvoie une copie de l'état d'avancement du préchauffage.
+
+    Returns
+    -------
+    dict
+        Clés : etapes, faites, en_cours, erreurs, termine, duree.
+    """
+    with _status_lock:
+        return {**_status, "erreurs": list(_status["erreurs"])}
@@ -0,0 +1,158 @@
+"""
+Pool de processus de calcul : les requêtes et les modèles coûteux sont exécutés
+hors du thread du script Streamlit, dans des processus dédiés, pour ne pas
+bloquer (GIL) les autres sessions servies par le même processus.
+
+Le nombre de processus est lu dans la variable d'environnement F1_WORKERS ;
+avec 0 (valeur par défaut), les calculs sont exécutés dans le processus courant.
+Sauf si F1_SHARED_TABLES=Non, les tables sont partagées avec les processus de
+calcul via la mémoire partagée (voir shared_tables).
+"""
+
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable
+
+_pool: ProcessPoolExecutor | None = None
+_shared = False  # le pool utilise des tables publiées en mémoire partagée
+_lock = threading.Lock()
+
+
+def worker_count() -> int:
+    """
+    Nombre de processus de calcul configuré (variable F1_WORKERS).
+
+    Returns
+    -------
+    int
+        Nombre de processus (0 : exécution dans le processus courant).
+    """
+    try:
+        return max(0, int(os.getenv("F1_WORKERS", "0")))
+    except ValueError:
+        return 0
+
+
+def func_path(func: Callable) -> str:
+    """
+    Renvoie la référence "module:fonction" d'une fonction de module.
+    """
+    return f"{func.__module__}:{func.__qualname__}"
+
+
+def resolve(path: str) -> Callable:
+    """
+    Importe et renvoie la fonction désignée par "module:fonction".
+
+    Parameters
+    ----------
+    path : str
+        Référence de la fonction, ex. "src.Models.Classification.classification:
+        clustering_pilotes".
+
+    Returns
+    -------
+    Callable
+        La fonction correspondante.
+    """
+    module_name, _, func_name = path.partition(":")
+    if not func_name:
+        raise ValueError(f"Référence de fonction invalide : {path}")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _call(path: str, args: tuple, kwargs: dict) -> Any:
+    """Point d'entrée exécuté dans un processus de calcul."""
+    return resolve(path)(*args, **kwargs)
+
+
+def get_pool() -> ProcessPoolExecutor | None:
+    """
+    Renvoie le pool de processus (créé au premier appel), ou None si les
+    calculs doivent être exécutés dans le processus courant.
+    """
+    global _pool, _shared
+    with _lock:
+        if _pool is None and worker_count() > 0:
+            initializer, initargs = None, ()
+            if os.getenv("F1_SHARED_TABLES", "Oui") == "Oui":
+                # Les tables sont publiées une fois en mémoire partagée : les
+                # processus de calcul s'y attachent au lieu de relire les CSV.
+                from src.Analysis.shared_tables import attach_tables, share_tables
+
+                initializer, initargs = attach_tables, (share_tables(),)
+                _shared = True
+
+            # "spawn" : un fork du serveur Streamlit (multi-threadé) n'est pas sûr
+            _pool = ProcessPoolExecutor(
+                max_workers=worker_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer,
+                initargs=initargs,
+            )
+        return _pool
+
+
+def submit(path: str, *args, **kwargs) -> Future:
+    """
+    Soumet un calcul à un processus de calcul.
+
+    La fonction est désignée par sa référence "module:fonction" : le module
+    (et ses dépendances lourdes, ex. sklearn ou torch) n'est importé que dans
+    le processus qui exécute le calcul. Le résultat est renvoyé sérialisé
+    (pickle).
+
+    Parameters
+    ----------
+    path : str
+        Référence "module:fonction".
+    *args, **kwargs
+        Paramètres de la fonction.
+
+    Returns
+    -------
+    Future
+        Le calcul en cours (déjà terminé si aucun pool n'est configuré).
+    """
+    pool = get_pool()
+    if pool is not None:
+        return pool.submit(_call, path, args, kwargs)
+
+    future = Future()
+    try:
+        future.set_result(_call(path, args, kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def run(path: str, *args, **kwargs) -> Any:
+    """
+    Exécute un calcul via `submit` et attend son résultat.
+    """
+    return submit(path, *args, **kwargs).result()
+
+
+def uses_shared_tables() -> bool:
+    """Indique si le pool en cours utilise des tables en mémoire partagée."""
+    return _pool is not None and _shared
+
+
+def shutdown() -> None:
+    """
+    Arrête le pool de processus et libère les tables qu'il partageait (pool et
+    tables sont recréés au prochain calcul, à partir des tables à jour).
+    """
+    global _pool, _shared
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+        if _shared:
+            from src.Analysis.shared_tables import release_tables
+
+            release_tables()
+            _shared = False
@@ -5,20 +5,52 @@ import streamlit as st
 import pandas as pd
 import io
 import time
-import keyboard
-import psutil
 import numpy as np
-import matplotlib
 
-from src.Analysis.router import get_question, get_graph
-from src.Models.LogisticRegression.logistic_regression import compare_logistic
-from src.Models.LogisticRegression.graph import plot_confusion_matrix
-from src.Models.Classification.classification import clustering_pilotes
-from src.Models.Classification.graph import graph_classification
+from src.Analysis.utils import noms_ecuries, noms_pilotes
+from src.Analysis import disk_cache, workers
+from src.Analysis.hot_reload import start_watcher, watcher_status
+from src.Analysis.manifest import version_id
+from src.Analysis.prefetch import prefetch_neighbors
+from src.Analysis.router import (
+    ALT_METHODS,
+    get_graph,
+    question_methods,
+    run_question,
+)
+from src.Analysis.warmup import DEFAULT_PARAMS, start_warm_up, warm_up_status
+
+# Les modules lourds (sklearn, matplotlib, plotly.express, torch, psutil,
+# keyboard) sont importés au moment où la fonctionnalité est utilisée : le
+# premier affichage de l'onglet Requêtes n'a besoin que de streamlit et pandas.
+# Les calculs coûteux passent par le pool de processus de calcul (F1_WORKERS).
 
 
 bonus_mode = os.getenv("BONUS_MODE", "Non") == "Oui"
 
+# Préchauffage des caches en arrière-plan (une seule fois par processus)
+warmup_mode = os.getenv("F1_WARMUP", "Oui") == "Oui"
+if warmup_mode:
+    start_warm_up()
+
+# Rechargement à chaud des CSV modifiés (une seule fois par processus)
+if os.getenv("F1_HOT_RELOAD", "Oui") == "Oui":
+    start_watcher()
+
+
+@st.fragment(run_every=None if warm_up_status()["termine"] else 1)
+def afficher_prechauffage():
+    """Affiche l'avancement du préchauffage sans bloquer le reste de la page."""
+    status = warm_up_status()
+    if status["termine"]:
+        st.caption(f"✅ Caches préchauffés en {status['duree']:.1f} s")
+    else:
+        st.progress(
+            status["faites"] / status["etapes"],
+            text=f"🔥 Préchauffage des caches : {status['en_cours'] or '...'}",
+        )
+
+
 st.set_page_config(page_title="Analyse de données F1", layout="wide")
 st.markdown(
     """
@@ -60,6 +92,11 @@ else:
 # ONGLET 1 : REQUÊTES
 with tabs[0]:
     st.header("🔍 Analyse par thématique")
+    if warmup_mode:
+        afficher_prechauffage()
+    if watcher_status()["dernier"]:
+        tables_maj = ", ".join(watcher_status()["dernier"]["tables"])
+        st.caption(f"🔄 Données rechargées à chaud : {tables_maj}")
 
     THEMES = {
         "Pilotes": {
@@ -67,6 +104,7 @@ with tabs[0]:
             "q2": "Classement des pilotes pour une saison",
             "q3": "Temps de carrière des pilotes",
             "q7": "Statistiques de carrière d'un pilote",
+            "q10": "Duels entre coéquipiers",
         },
         "Écuries": {
             "q4": "Nombre de victoires par écurie et par saison",
@@ -91,6 +129,7 @@ with tabs[0]:
         "q7": "🧑‍💼",
         "q8": "🏆",
         "q9": "📊",
+        "q10": "🤜",
     }
 
     descriptions = {
@@ -103,16 +142,21 @@ with tabs[0]:
         "q7": "Fournit un résumé statistique de la carrière d'un pilote.",
         "q8": "Affiche le classement final des écuries pour une saison donnée.",
         "q9": "Renvoie un dashboard avec 3 statistiques générales d'écuries.",
+        "q10": "Compare les coéquipiers d'une saison : qualifications, courses, "
+        "points et abandons.",
     }
 
     for theme, questions in THEMES.items():
         emoji = emojis.get(theme)
+        # Libellés propres au thème (un lambda capturerait la dernière valeur de
+        # `questions` de la boucle)
+        labels = {k: f"{question_emojis.get(k, '')} {v}" for k, v in questions.items()}
         with st.expander(f"{emoji} {theme}", expanded=False):
             st.markdown("""---""")
             question_label = st.selectbox(
                 "🧩 Questions",
                 options=list(questions.keys()),
-                format_func=lambda k: f"{question_emojis.get(k, '')} {questions[k]}",
+                format_func=labels.get,
                 key=f"{theme}-question",
                 index=None,
                 placeholder="Choisissez une question ...",
@@ -122,46 +166,61 @@ with tabs[0]:
             st.markdown("""---""")
             if question_label is not None:
                 st.markdown("""### 🔨 Variables""")
-                query_func = get_question(question_label)
                 plot_func = get_graph(question_label)
 
-                method = None
-                if question_label in ["q1", "q6", "q9"]:
-                    method = st.selectbox(
-                        "⚙️ Méthode",
-                        options=["pandas", "homemade"],
-                        key=f"{question_label}-method",
-                    )
+                methodes = question_methods(question_label)
+                method = st.selectbox(
+                    "⚙️ Méthode",
+                    options=methodes,
+                    key=f"{question_label}-method",
+                )
+                if method == "pandas" and "homemade" not in methodes:
+                    method = None  # la version pandas n'a pas de paramètre method
 
                 params = {}
 
+                # Les versions SQL et cube ne connaissent pas les lignées
+                par_lignee = False
+                if question_label in ("q4", "q8", "q9") and method not in ALT_METHODS:
+                    par_lignee = st.checkbox(
+                        "🧬 Regrouper les écuries par lignée",
+                        value=False,
+                        key=f"lignees-{question_label}",
+                        help="Ex. Minardi, Toro Rosso, AlphaTauri et RB forment "
+                        "une seule lignée.",
+                    )
+                    if par_lignee:
+                        params["par_lignee"] = True
+
                 if question_label == "q1":
                     params["nb_victoires"] = st.number_input(
-                        "🏁 Seuil minimum de victoires", min_value=0, value=30
+                        "🏁 Seuil minimum de victoires",
+                        min_value=0,
+                        value=DEFAULT_PARAMS["q1"]["nb_victoires"],
                     )
                 elif question_label == "q2":
                     params["saison"] = st.slider(
                         "📅 Saison",
                         min_value=1950,
                         max_value=2023,
-                        value=2023,
+                        value=DEFAULT_PARAMS["q2"]["saison"],
                         key="slider-q2",
                     )
                 elif question_label == "q3":
                     params["duree_min"] = st.number_input(
                         "⏱️ Durée de carrière minimum (en années)",
                         min_value=0,
-                        value=15,
+                        value=DEFAULT_PARAMS["q3"]["duree_min"],
                         max_value=24,
                     )
                 elif question_label == "q4":
-                    ecurie = pd.read_csv("data/constructors.csv")
-                    ecurie_dispo = ecurie["name"].unique().tolist()
+                    ecurie_dispo = noms_ecuries(par_lignee)
+                    defaut = DEFAULT_PARAMS["q4"]["ecuries"]
                     params["ecuries"] = st.multiselect(
                         "🏎️ Sélectionnez les écuries",
-                        options=sorted(ecurie_dispo),
-                        default=["Red Bull", "BMW", "Mercedes", "McLaren"],
-                        key="select-ecuries",
+                        options=ecurie_dispo,
+                        default=[e for e in defaut if e in ecurie_dispo],
+                        key=f"select-ecuries-{par_lignee}",
                     )
                     if len(params["ecuries"]) == 0:
                         st.warning("Veuillez sélectionner au moins une écurie.")
@@ -171,7 +230,7 @@ with tabs[0]:
                         "📅 Saison",
                         min_value=1950,
                         max_value=2023,
-                        value=(1985, 2020),
+                        value=DEFAULT_PARAMS["q4"]["saisons"],
                         key="slider-q4",
                     )
                 elif question_label == "q5":
@@ -179,48 +238,55 @@ with tabs[0]:
                         "📅 Saison",
                         min_value=1950,
                         max_value=2023,
-                        value=2023,
+                        value=DEFAULT_PARAMS["q5"]["saison"],
                         key="slider-q5",
                     )
                 elif question_label == "q7":
-                    drivers = pd.read_csv("data/drivers.csv")
-                    pilote_dispo = (
-                        drivers.apply(
-                            lambda row: row["forename"] + " " + row["surname"], axis=1
-                        )
-                        .unique()
-                        .tolist()
-                    )
+                    pilote_dispo = noms_pilotes()
 
                     params["nom_pilote"] = st.selectbox(
                         "👤 Choisissez un pilote",
-                        options=sorted(pilote_dispo),
+                        options=pilote_dispo,
                         key="select-pilote",
-                        index=521,
+                        index=pilote_dispo.index(DEFAULT_PARAMS["q7"]["nom_pilote"]),
                     )
                 elif question_label == "q8":
                     params["saison"] = st.slider(
                         "📅 Saison",
                         min_value=1950,
                         max_value=2023,
-                        value=2023,
+                        value=DEFAULT_PARAMS["q8"]["saison"],
                         key="slider-q8",
                     )
                 elif question_label == "q9":
-                    ecurie = pd.read_csv("data/constructors.csv")
-                    ecurie_dispo = ecurie["name"].unique().tolist()
+                    ecurie_dispo = noms_ecuries(par_lignee)
 
                     params["ecurie"] = st.selectbox(
                         "🏎️ Choisissez une écurie",
-                        options=sorted(ecurie_dispo),
-                        key="select-ecurie",
-                        index=167,
+                        options=ecurie_dispo,
+                        key=f"select-ecurie-{par_lignee}",
+                        index=ecurie_dispo.index(DEFAULT_PARAMS["q9"]["ecurie"]),
+                    )
+                elif question_label == "q10":
+                    params["saison"] = st.slider(
+                        "📅 Saison",
+                        min_value=1950,
+                        max_value=2023,
+                        value=DEFAULT_PARAMS["q10"]["saison"],
+                        key="slider-q10",
+                    )
+                # Les versions SQL et cube ne comptent que les courses
+                if question_label in ("q1", "q8") and method not in ALT_METHODS:
+                    params["inclure_sprints"] = st.checkbox(
+                        "⏩ Inclure les courses sprint",
+                        value=False,
+                        key=f"sprints-{question_label}",
                     )
                 if question_label == "q9":
                     st.subheader("📊 Dashboard - Statistiques de l'écurie")
 
-                    total_victoires, nb_participations, moyenne_victoires = query_func(
-                        method, **params
+                    total_victoires, nb_participations, moyenne_victoires = (
+                        run_question(question_label, method=method, **params)
                     )
 
                     col1, col2, col3 = st.columns(3)
@@ -253,9 +319,11 @@ with tabs[0]:
                         )
                 else:
                     if method:
-                        df = query_func(method=method, **params)
+                        df = run_question(question_label, method=method, **params)
                     else:
-                        df = query_func(**params)
+                        df = run_question(question_label, **params)
+                        # Précalcul des saisons voisines pendant l'affichage
+                        prefetch_neighbors(question_label, params)
                     st.session_state[f"df_{question_label}"] = df
 
                     df = st.session_state.get(f"df_{question_label}")
@@ -301,6 +369,8 @@ with tabs[0]:
                                         st.plotly_chart(fig2, use_container_width=True)
 
                                 elif methode_graph == "matplotlib":
+                                    from matplotlib.figure import Figure
+
                                     fig = figs
                                     st.pyplot(fig)
 
@@ -312,7 +382,7 @@ with tabs[0]:
                                     )
 
                                     buffer = io.BytesIO()
-                                    if isinstance(fig, matplotlib.figure.Figure):
+                                    if isinstance(fig, Figure):
                                         fig.savefig(
                                             buffer, format="png", bbox_inches="tight"
                                         )
@@ -335,6 +405,8 @@ with tabs[0]:
                                     st.plotly_chart(fig, use_container_width=True)
 
                                 elif methode_graph == "matplotlib":
+                                    from matplotlib.figure import Figure
+
                                     st.pyplot(fig)
 
                                     st.markdown("##### 🖼️ Exporter le graphe")
@@ -345,7 +417,7 @@ with tabs[0]:
                                     )
 
                                     buffer = io.BytesIO()
-                                    if isinstance(fig, matplotlib.figure.Figure):
+                                    if isinstance(fig, Figure):
                                         fig.savefig(
                                             buffer, format="png", bbox_inches="tight"
                                         )
@@ -390,10 +462,15 @@ with tabs[1]:
     if "results" not in st.session_state:
         if st.button("📈 Lancer et comparer les deux modèles"):
             with st.spinner("En cours de traitement..."):
-                results = compare_logistic()
+                results = disk_cache.cached_run(
+                    "src.Models.LogisticRegression.logistic_regression:"
+                    "compare_logistic"
+                )
                 st.session_state["results"] = results
 
     if "results" in st.session_state:
+        from src.Models.LogisticRegression.graph import plot_confusion_matrix
+
         results = st.session_state["results"]
 
         col1, col2 = st.columns(2)
@@ -461,8 +538,13 @@ with tabs[2]:
     )
 
     if st.button("Lancer le clustering"):
+        from src.Models.Classification.graph import graph_classification
+
         with st.spinner("Clustering en cours..."):
-            df_clustered, used_vars = clustering_pilotes(n_clusters=n_clusters)
+            df_clustered, used_vars = disk_cache.cached_run(
+                "src.Models.Classification.classification:clustering_pilotes",
+                n_clusters=n_clusters,
+            )
 
         st.success(f"{len(df_clustered)} pilotes analysés.")
 
@@ -473,7 +555,16 @@ with tabs[2]:
 
 # ONGLET 4 : RÉSEAU DE NEURONES
 if bonus_mode:
-    from src.Models.NeuralNetwork.train import train_model
+
+    @st.cache_data(show_spinner="Préparation des données du réseau de neurones...")
+    def charger_donnees_nn(version: str) -> pd.DataFrame:
+        """
+        Construit une seule fois (toutes sessions) par version des données
+        les données du réseau.
+        """
+        from src.Models.NeuralNetwork.dataset import construire_donnees_nn
+
+        return construire_donnees_nn()
 
     with tabs[3]:
         st.header("🤖 Prédictions par réseau de neurones")
@@ -493,276 +584,212 @@ if bonus_mode:
 
         st.markdown("Sélectionnez les paramètres de votre modèle :")
 
-        results = pd.read_csv("data/results.csv")
-        drivers = pd.read_csv("data/drivers.csv")
-        races = pd.read_csv("data/races.csv")
-        constructors = pd.read_csv("data/constructors.csv")
-        driver_standings = pd.read_csv("data/driver_standings.csv")
-        constructor_standings = pd.read_csv("data/constructor_standings.csv")
-
-        races_filtered = races[races["year"] >= 2010]
-        results_filtered = results[results["raceId"].isin(races_filtered["raceId"])]
-
-        top_drivers = results_filtered["driverId"].value_counts().nlargest(100).index
-        results_filtered = results_filtered[
-            results_filtered["driverId"].isin(top_drivers)
-        ]
-
-        df = (
-            results_filtered.merge(drivers, on="driverId", how="left")
-            .merge(
-                races_filtered[["raceId", "year", "circuitId"]], on="raceId", how="left"
-            )
-            .merge(constructors, on="constructorId", how="left")
-            .merge(
-                driver_standings,
-                on=["driverId", "raceId"],
-                how="left",
-                suffixes=("", "_ds"),
-            )
-            .merge(
-                constructor_standings,
-                on=["constructorId", "raceId"],
-                how="left",
-                suffixes=("", "_cs"),
-            )
-        )
-
-        df = df.dropna(axis=1, thresh=len(df) * 0.9)
-        df = df.select_dtypes(include=["number", "object"]).copy()
-
-        selected_columns = [
-            "grid",
-            "positionOrder",
-            "points",
-            "laps",
-            "milliseconds",
-            "fastestLap",
-            "rank",
-            "fastestLapSpeed",
-            "year",
-            "points_ds",
-            "position_ds",
-            "wins",
-            "points_cs",
-            "position_cs",
-            "wins_cs",
-            "circuitId",
-            "constructorRef",
-            "driverRef",
-        ]
-
-        df = df[selected_columns].rename(
-            columns={
-                "grid": "Position de départ",
-                "positionOrder": "Position finale",
-                "points": "Points",
-                "laps": "Tours",
-                "milliseconds": "Temps",
-                "fastestLap": "Tour le plus rapide",
-                "rank": "Rang",
-                "fastestLapSpeed": "Vitesse du tour le plus rapide",
-                "year": "Année",
-                "points_ds": "Points pilote saison",
-                "position_ds": "Position pilote saison",
-                "wins": "Victoires du pilote",
-                "points_cs": "Points écurie saison",
-                "position_cs": "Position écurie saison",
-                "wins_cs": "Victoires de l'écurie",
-                "circuitId": "Circuit",
-                "constructorRef": "Écurie",
-                "driverRef": "Pilote",
-            }
-        )
-
-        colonnes = df.columns.tolist()
+        if "nn_donnees" not in st.session_state:
+            if st.button("📂 Charger les données du réseau de neurones"):
+                st.session_state["nn_donnees"] = True
 
-        with st.expander("### 🧮 Paramètres du modèle"):
+        if "nn_donnees" in st.session_state:
+            df = charger_donnees_nn(version_id())
+            colonnes = df.columns.tolist()
 
-            target = st.selectbox(
-                "🎯 Variable à prédire",
-                placeholder="Choisissez une variable à prédire ...",
-                options=colonnes,
-                index=None,
-            )
-
-            features = st.pills(
-                "🎯 Variables explicatives",
-                options=[col for col in colonnes if col != target],
-                selection_mode="multi",
-            )
+            with st.expander("### 🧮 Paramètres du modèle"):
 
-            n_epochs = st.slider(
-                "🔁 Nombre d'epochs",
-                min_value=10,
-                max_value=500,
-                value=100,
-                step=10,
-                help="Nombre d'itérations pour entraîner le modèle.",
-            )
-
-            dropout_rate = st.slider(
-                "💧 Dropout",
-                min_value=0.0,
-                max_value=0.9,
-                step=0.05,
-                value=0.2,
-                help="Taux de neurones à ignorer pour éviter le surapprentissage.",
-            )
+                target = st.selectbox(
+                    "🎯 Variable à prédire",
+                    placeholder="Choisissez une variable à prédire ...",
+                    options=colonnes,
+                    index=None,
+                )
 
-            lr = st.number_input(
-                "⚙️ Learning rate",
-                value=0.001,
-                format="%.5f",
-                help="Taux d'apprentissage pour le modèle.",
-                step=0.0005,
-            )
+                features = st.pills(
+                    "🎯 Variables explicatives",
+                    options=[col for col in colonnes if col != target],
+                    selection_mode="multi",
+                )
 
-            st.markdown("🧱 Architecture des couches cachées")
-            if "hidden_layers" not in st.session_state:
-                st.session_state.hidden_layers = [64]
+                n_epochs = st.slider(
+                    "🔁 Nombre d'epochs",
+                    min_value=10,
+                    max_value=500,
+                    value=100,
+                    step=10,
+                    help="Nombre d'itérations pour entraîner le modèle.",
+                )
 
-            add = st.button(
-                "➕ Ajouter une couche",
-                disabled=len(st.session_state.hidden_layers) >= 4,
-            )
-            remove = st.button(
-                "➖ Supprimer la dernière couche",
-                disabled=len(st.session_state.hidden_layers) <= 1,
-            )
+                dropout_rate = st.slider(
+                    "💧 Dropout",
+                    min_value=0.0,
+                    max_value=0.9,
+                    step=0.05,
+                    value=0.2,
+                    help="Taux de neurones à ignorer pour éviter le surapprentissage.",
+                )
 
-            if add:
-                st.session_state.hidden_layers.append(64)
-            if remove:
-                st.session_state.hidden_layers.pop()
-
-            hidden_sizes = []
-            for i, size in enumerate(st.session_state.hidden_layers):
-                neurons = st.number_input(
-                    f"🧠 Couche cachée {i + 1}",
-                    min_value=1,
-                    max_value=512,
-                    value=size,
-                    step=1,
-                    key=f"layer_{i}",
+                lr = st.number_input(
+                    "⚙️ Learning rate",
+                    value=0.001,
+                    format="%.5f",
+                    help="Taux d'apprentissage pour le modèle.",
+                    step=0.0005,
                 )
-                hidden_sizes.append(neurons)
-
-        st.markdown("#### 🔧 Paramètres de configuration du réseau de neurones")
-        architecture = [{", ".join(str(n) for n in hidden_sizes)}]
-        st.code(
-            f"""
-                📌 Cible : {target}
-                🎯 Variables explicatives : {', '.join(features)}
-                🧱 Architecture : {len(hidden_sizes)} couches — {architecture}
-                💧 Dropout : {dropout_rate}
-                ⚙️ Learning Rate : {lr}
-                🔁 Epochs : {n_epochs}
-                """,
-            language="yaml",
-        )
 
-        if st.button("🚀 Entraîner le réseau de neurones"):
-            with st.spinner("🔁 Entraînement du modèle..."):
-                try:
-                    from src.Models.NeuralNetwork.graphs import (
-                        plot_loss_curves,
-                        plot_accuracy_curves,
-                    )
+                st.markdown("🧱 Architecture des couches cachées")
+                if "hidden_layers" not in st.session_state:
+                    st.session_state.hidden_layers = [64]
 
-                    df_clean = df.dropna(subset=features + [target])
+                add = st.button(
+                    "➕ Ajouter une couche",
+                    disabled=len(st.session_state.hidden_layers) >= 4,
+                )
+                remove = st.button(
+                    "➖ Supprimer la dernière couche",
+                    disabled=len(st.session_state.hidden_layers) <= 1,
+                )
 
-                    model, train_losses, train_accuracies, test_metrics = train_model(
-                        df=df_clean,
-                        features=features,
-                        target=target,
-                        hidden_sizes=hidden_sizes,
-                        dropout=dropout_rate,
-                        lr=lr,
-                        epochs=n_epochs,
+                if add:
+                    st.session_state.hidden_layers.append(64)
+                if remove:
+                    st.session_state.hidden_layers.pop()
+
+                hidden_sizes = []
+                for i, size in enumerate(st.session_state.hidden_layers):
+                    neurons = st.number_input(
+                        f"🧠 Couche cachée {i + 1}",
+                        min_value=1,
+                        max_value=512,
+                        value=size,
+                        step=1,
+                        key=f"layer_{i}",
                     )
+                    hidden_sizes.append(neurons)
+
+            st.markdown("#### 🔧 Paramètres de configuration du réseau de neurones")
+            architecture = [{", ".join(str(n) for n in hidden_sizes)}]
+            st.code(
+                f"""
+                    📌 Cible : {target}
+                    🎯 Variables explicatives : {', '.join(features)}
+                    🧱 Architecture : {len(hidden_sizes)} couches — {architecture}
+                    💧 Dropout : {dropout_rate}
+                    ⚙️ Learning Rate : {lr}
+                    🔁 Epochs : {n_epochs}
+                    """,
+                language="yaml",
+            )
 
-                    st.success("🎉 Entraînement terminé avec succès !")
-
-                    st.subheader("📋 Récapitulatif des dernières métriques")
-                    if len(train_losses) > 0:
-                        st.metric(
-                            "📉 Dernière perte (train)", f"{train_losses[-1]:.4f}"
+            if st.button("🚀 Entraîner le réseau de neurones"):
+                with st.spinner("🔁 Entraînement du modèle..."):
+                    try:
+                        from src.Models.NeuralNetwork.graphs import (
+                            plot_loss_curves,
+                            plot_accuracy_curves,
                         )
 
-                    has_accuracy = not all(np.isnan(train_accuracies))
-
-                    if has_accuracy:
-                        st.metric(
-                            "✅ Dernière accuracy (train)",
-                            f"{train_accuracies[-1]*100:.2f}%",
+                        df_clean = df.dropna(subset=features + [target])
+
+                        model, train_losses, train_accuracies, test_metrics = (
+                            workers.run(
+                                "src.Models.NeuralNetwork.train:train_model",
+                                df=df_clean,
+                                features=features,
+                                target=target,
+                                hidden_sizes=hidden_sizes,
+                                dropout=dropout_rate,
+                                lr=lr,
+                                epochs=n_epochs,
+                            )
                         )
 
-                    if test_metrics:
-                        last_epoch = max(test_metrics.keys())
-                        st.metric(
-                            "🧪 Perte test (dernier point)",
-                            f"{test_metrics[last_epoch]['loss']:.4f}",
-                        )
-                        if has_accuracy and "accuracy" in test_metrics[last_epoch]:
-                            acc = test_metrics[last_epoch]["accuracy"]
-                            if not np.isnan(acc):
-                                st.metric(
-                                    "🧪 Accuracy test (dernier point)",
-                                    f"{acc*100:.2f}%",
-                                )
+                        st.success("🎉 Entraînement terminé avec succès !")
 
-                    st.subheader("📊 Évolution des métriques (tous les 10 epochs)")
-                    table_data = []
-                    for epoch in range(0, len(train_losses), 10):
-                        ep = epoch + 1
-                        t_loss = train_losses[epoch]
-                        t_acc = (
-                            train_accuracies[epoch]
-                            if epoch < len(train_accuracies)
-                            else np.nan
-                        )
-                        test = test_metrics.get(ep, {})
-                        row = {
-                            "Époch": ep,
-                            "Loss (train)": round(t_loss, 4),
-                            "Loss (test)": round(test.get("loss", np.nan), 4),
-                        }
+                        st.subheader("📋 Récapitulatif des dernières métriques")
+                        if len(train_losses) > 0:
+                            st.metric(
+                                "📉 Dernière perte (train)", f"{train_losses[-1]:.4f}"
+                            )
+
+                        has_accuracy = not all(np.isnan(train_accuracies))
 
                         if has_accuracy:
-                            row["Accuracy (train)"] = (
-                                round(t_acc * 100, 2) if not np.isnan(t_acc) else "—"
+                            st.metric(
+                                "✅ Dernière accuracy (train)",
+                                f"{train_accuracies[-1]*100:.2f}%",
                             )
-                            row["Accuracy (test)"] = (
-                                round(test["accuracy"] * 100, 2)
-                                if "accuracy" in test and not np.isnan(test["accuracy"])
-                                else "—"
+
+                        if test_metrics:
+                            last_epoch = max(test_metrics.keys())
+                            st.metric(
+                                "🧪 Perte test (dernier point)",
+                                f"{test_metrics[last_epoch]['loss']:.4f}",
                             )
+                            if has_accuracy and "accuracy" in test_metrics[last_epoch]:
+                                acc = test_metrics[last_epoch]["accuracy"]
+                                if not np.isnan(acc):
+                                    st.metric(
+                                        "🧪 Accuracy test (dernier point)",
+                                        f"{acc*100:.2f}%",
+                                    )
 
-                        table_data.append(row)
+                        st.subheader("📊 Évolution des métriques (tous les 10 epochs)")
+                        table_data = []
+                        for epoch in range(0, len(train_losses), 10):
+                            ep = epoch + 1
+                            t_loss = train_losses[epoch]
+                            t_acc = (
+                                train_accuracies[epoch]
+                                if epoch < len(train_accuracies)
+                                else np.nan
+                            )
+                            test = test_metrics.get(ep, {})
+                            row = {
+                                "Époch": ep,
+                                "Loss (train)": round(t_loss, 4),
+                                "Loss (test)": round(test.get("loss", np.nan), 4),
+                            }
+
+                            if has_accuracy:
+                                row["Accuracy (train)"] = (
+                                    round(t_acc * 100, 2)
+                                    if not np.isnan(t_acc)
+                                    else "—"
+                                )
+                                row["Accuracy (test)"] = (
+                                    round(test["accuracy"] * 100, 2)
+                                    if "accuracy" in test
+                                    and not np.isnan(test["accuracy"])
+                                    else "—"
+                                )
 
-                    st.dataframe(table_data, use_container_width=True)
+                            table_data.append(row)
 
-                    st.subheader("📈 Courbes de perte (Train & Test)")
-                    fig_loss = plot_loss_curves(train_losses, test_metrics)
-                    st.plotly_chart(fig_loss)
+                        st.dataframe(table_data, use_container_width=True)
 
-                    if has_accuracy:
-                        st.subheader("📈 Courbes d'accuracy (Train & Test)")
-                        fig_acc = plot_accuracy_curves(train_accuracies, test_metrics)
-                        st.plotly_chart(fig_acc)
-                    else:
-                        st.info(
-                            "ℹ️ Pas de courbe d'accuracy — tâche de régression détectée."
-                        )
-                except Exception as e:
-                    st.write("Type de figure :", type(fig_loss))
-                    st.write("Type de figure :", type(fig_acc))
-                    st.error(f"❌ Une erreur est survenue : {e}")
+                        st.subheader("📈 Courbes de perte (Train & Test)")
+                        fig_loss = plot_loss_curves(train_losses, test_metrics)
+                        st.plotly_chart(fig_loss)
+
+                        if has_accuracy:
+                            st.subheader("📈 Courbes d'accuracy (Train & Test)")
+                            fig_acc = plot_accuracy_curves(
+                                train_accuracies, test_metrics
+                            )
+                            st.plotly_chart(fig_acc)
+                        else:
+                            st.info(
+                                "ℹ️ Pas de courbe d'accuracy — "
+                                "tâche de régression détectée."
+                            )
+                    except Exception as e:
+                        st.write("Type de figure :", type(fig_loss))
+                        st.write("Type de figure :", type(fig_acc))
+                        st.error(f"❌ Une erreur est survenue : {e}")
 
 
 exit_app = st.button("Quitter l'app")
 if exit_app:
+    import keyboard
+    import psutil
+
     time.sleep(0.5)
     keyboard.press_and_release("ctrl+w")
     pid = os.getpid()
@@ -0,0 +1,86 @@
+"""
+Fichier contenant la construction du jeu de données du réseau de neurones
+"""
+
+import pandas as pd
+
+# Colonnes conservées et leur libellé affiché dans l'application
+COLONNES_NN: dict[str, str] = {
+    "grid": "Position de départ",
+    "positionOrder": "Position finale",
+    "points": "Points",
+    "laps": "Tours",
+    "milliseconds": "Temps",
+    "fastestLap": "Tour le plus rapide",
+    "rank": "Rang",
+    "fastestLapSpeed": "Vitesse du tour le plus rapide",
+    "year": "Année",
+    "points_ds": "Points pilote saison",
+    "position_ds": "Position pilote saison",
+    "wins": "Victoires du pilote",
+    "points_cs": "Points écurie saison",
+    "position_cs": "Position écurie saison",
+    "wins_cs": "Victoires de l'écurie",
+    "circuitId": "Circuit",
+    "constructorRef": "Écurie",
+    "driverRef": "Pilote",
+}
+
+
+def construire_donnees_nn(annee_min: int = 2010, nb_pilotes: int = 100) -> pd.DataFrame:
+    """
+    Construit le DataFrame de variables utilisé par le réseau de neurones.
+
+    Les résultats de course sont restreints aux saisons récentes et aux pilotes
+    ayant le plus de participations, puis enrichis avec les informations pilotes,
+    courses, écuries et classements.
+
+    Parameters
+    ----------
+    annee_min : int
+        Première saison conservée.
+    nb_pilotes : int
+        Nombre de pilotes (les plus présents) conservés.
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes de COLONNES_NN, renommées avec leur libellé.
+    """
+    results = pd.read_csv("data/results.csv")
+    drivers = pd.read_csv("data/drivers.csv")
+    races = pd.read_csv("data/races.csv")
+    constructors = pd.read_csv("data/constructors.csv")
+    driver_standings = pd.read_csv("data/driver_standings.csv")
+    constructor_standings = pd.read_csv("data/constructor_standings.csv")
+
+    races_filtered = races[races["year"] >= annee_min]
+    results_filtered = results[results["raceId"].isin(races_filtered["raceId"])]
+
+    top_drivers = results_filtered["driverId"].value_counts().nlargest(nb_pilotes)
+    results_filtered = results_filtered[
+        results_filtered["driverId"].isin(top_drivers.index)
+    ]
+
+    df = (
+        results_filtered.merge(drivers, on="driverId", how="left")
+        .merge(races_filtered[["raceId", "year", "circuitId"]], on="raceId", how="left")
+        .merge(constructors, on="constructorId", how="left")
+        .merge(
+            driver_standings,
+            on=["driverId", "raceId"],
+            how="left",
+            suffixes=("", "_ds"),
+        )
+        .merge(
+            constructor_standings,
+            on=["constructorId", "raceId"],
+            how="left",
+            suffixes=("", "_cs"),
+        )
+    )
+
+    df = df.dropna(axis=1, thresh=len(df) * 0.9)
+    df = df.select_dtypes(include=["number", "object"]).copy()
+
+    return df[list(COLONNES_NN)].rename(columns=COLONNES_NN)
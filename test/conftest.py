@@ -0,0 +1,13 @@
+"""
+Configuration commune des tests : le cache disque et les instantanés du
+manifeste sont écrits dans un dossier temporaire, jamais dans le dossier
+courant (sinon des résultats périmés seraient relus d'une exécution à l'autre).
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def dossiers_cache_temporaires(monkeypatch, tmp_path):
+    monkeypatch.setenv("F1_DISK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("F1_MANIFEST_DIR", str(tmp_path / "cache" / "manifests"))
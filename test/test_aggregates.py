@@ -0,0 +1,77 @@
+"""
+Tests unitaires pour les agrégats matérialisés et l'intégration d'un week-end.
+"""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from src.Analysis import aggregates, manifest
+from src.Analysis.Queries.queries_ecuries import ecuries_points
+from src.Analysis.Queries.queries_pit_stops import min_pit_stop
+
+TABLES_WEEK_END = [
+    "races",
+    "results",
+    "pit_stops",
+    "driver_standings",
+    "constructor_standings",
+]
+
+
+def test_agregats_coherents_avec_requetes():
+    """
+    Les questions servies par les agrégats donnent les mêmes résultats que le
+    calcul sur les tables (q6 "homemade", q8 avec le barème historique quand il
+    coïncide avec le barème actuel).
+    """
+    pd.testing.assert_frame_equal(min_pit_stop("pandas"), min_pit_stop("homemade"))
+    pd.testing.assert_frame_equal(
+        ecuries_points(2016), ecuries_points(2016, "historique")
+    )
+
+
+def test_integration_week_end(tmp_path, monkeypatch):
+    """
+    Intégrer la dernière course de l'historique donne les mêmes agrégats qu'un
+    recalcul complet, sans relire les CSV complétés, et une course ne peut pas
+    être intégrée deux fois.
+    """
+    shutil.copytree("data", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("F1_DISK_CACHE_DIR", str(tmp_path / "cache"))
+
+    races = pd.read_csv("data/races.csv")
+    derniere = races.sort_values(["year", "round"])["raceId"].iloc[-1]
+    week_end = {}
+    for name in TABLES_WEEK_END:
+        df = pd.read_csv(os.path.join("data", name + ".csv"))
+        week_end[name] = df[df["raceId"] == derniere]
+        df[df["raceId"] != derniere].to_csv(
+            os.path.join("data", name + ".csv"), index=False
+        )
+    assert derniere not in aggregates.aggregates()["annees"].index
+
+    avant = manifest.current_manifest()
+
+    def relecture(path):
+        raise AssertionError(f"{path} relu après l'ajout")
+
+    with monkeypatch.context() as m:
+        m.setattr(manifest, "describe_file", relecture)
+        resume = aggregates.ingest_race_weekend(**week_end)
+        apres = manifest.current_manifest()
+    assert resume["courses"] == [derniere]
+    assert resume["lignes"]["results"] == len(week_end["results"])
+    assert manifest.changed_tables(avant, apres) == sorted(TABLES_WEEK_END)
+    assert apres["files"]["results"]["rows"] == len(pd.read_csv("data/results.csv"))
+
+    incremental = aggregates.aggregates()
+    complet = aggregates.build_aggregates()
+    for name, valeur in complet.items():
+        assert incremental[name].sort_index().equals(valeur.sort_index()), name
+
+    with pytest.raises(ValueError):
+        aggregates.ingest_race_weekend(week_end["races"])
@@ -0,0 +1,225 @@
+"""
+Tests unitaires pour le cache des requêtes et le préchauffage.
+"""
+
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import psutil
+
+from src.Analysis import disk_cache, hot_reload, manifest, prefetch
+from src.Analysis.cache import clear, contains, get_or_compute, put, stats
+from src.Analysis.prefetch import prefetch_neighbors
+from src.Analysis.router import question_key, run_question
+from src.Analysis.warmup import DEFAULT_PARAMS, warm_up, warm_up_status
+
+
+def test_cle_normalisee():
+    """
+    Un même appel donne la même clé, qu'il soit positionnel ou nommé.
+    """
+    assert question_key("q9", "pandas", "Red Bull") == question_key(
+        "q9", method="pandas", ecurie="Red Bull"
+    )
+    assert question_key("q2") == question_key("q2", saison=2023)
+
+
+def test_cle_selon_parametres(monkeypatch):
+    """
+    Une mise à jour de sprint_results ne change la clé de q1 et q8 qu'avec
+    inclure_sprints=True.
+    """
+    avant = {
+        sprints: question_key("q8", saison=2023, inclure_sprints=sprints)
+        for sprints in (False, True)
+    }
+    modifie = copy.deepcopy(manifest.current_manifest())
+    modifie["files"]["sprint_results"]["sha256"] = "nouveau-sprint"
+    monkeypatch.setattr(manifest, "current_manifest", lambda: modifie)
+    assert question_key("q8", saison=2023) == avant[False]
+    assert question_key("q8", saison=2023, inclure_sprints=True) != avant[True]
+    assert question_key("q8", saison=2023, method="sqlite")[2] == (
+        manifest.version_id(["results", "races", "constructors"])
+    )
+
+
+def test_resultat_copie():
+    """
+    Le résultat en cache n'est pas altéré par une modification de l'appelant.
+    """
+    df = run_question("q8", saison=2016)
+    df["points"] = 0
+    assert run_question("q8", saison=2016)["points"].max() >= 700
+
+
+def test_prechauffage():
+    """
+    Le préchauffage calcule toutes les questions par défaut sans erreur.
+    """
+    warm_up()
+    status = warm_up_status()
+    assert status["termine"] and status["erreurs"] == []
+    for question_id, params in DEFAULT_PARAMS.items():
+        assert contains(question_key(question_id, **params))
+
+
+def test_prechargement_saisons_voisines():
+    """
+    Les saisons voisines de la saison affichée sont calculées et mises en cache.
+    """
+    futures = prefetch_neighbors("q2", {"saison": 1990}, seuil_cpu=None)
+    assert len(futures) == 4
+    assert all(future.result(timeout=60) for future in futures)
+    for saison in (1988, 1989, 1991, 1992):
+        assert contains(question_key("q2", saison=saison))
+
+
+def test_premiere_mesure_cpu(monkeypatch):
+    """
+    Dès le premier appel, une machine saturée est vue comme occupée (sans
+    mesure précédente, psutil renvoie 0 avec interval=None).
+    """
+    monkeypatch.setattr(prefetch, "_cpu_mesure", False)
+    monkeypatch.setattr(
+        psutil, "cpu_percent", lambda interval=None: 0.0 if interval is None else 100
+    )
+    assert prefetch.cpu_busy()
+
+
+def test_calcul_unique_pour_appels_concurrents():
+    """
+    Dix sessions demandant la même clé absente déclenchent un seul calcul.
+    """
+    appels = []
+
+    def compute():
+        appels.append(1)
+        time.sleep(0.2)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        valeurs = list(
+            pool.map(lambda _: get_or_compute(("test", "sf"), compute), range(10))
+        )
+    assert valeurs == [42] * 10
+    assert len(appels) == 1
+
+
+def test_eviction_budget_memoire(monkeypatch):
+    """
+    Au-delà du budget, les entrées les moins récemment utilisées sont évincées.
+    """
+    monkeypatch.setenv("F1_CACHE_BUDGET_MB", "1000")
+    clear()
+    put(("test", "epingle"), np.zeros(1), pin=True)
+    put(("test", "ancien"), np.zeros(1000))
+    put(("test", "recent"), np.zeros(1000))
+    get_or_compute(("test", "ancien"), lambda: None)  # accès récent
+
+    budget = (stats()["size"] - 1) / 1024**2
+    monkeypatch.setenv("F1_CACHE_BUDGET_MB", str(budget))
+    put(("test", "nouveau"), np.zeros(1))
+    assert contains(("test", "ancien")) and contains(("test", "epingle"))
+    assert not contains(("test", "recent"))
+
+
+def test_cache_disque_apres_redemarrage(monkeypatch, tmp_path):
+    """
+    Après un redémarrage (cache mémoire vide), le résultat est relu sur disque
+    sans recalcul ; une autre version des données invalide l'entrée.
+    """
+    monkeypatch.setenv("F1_DISK_CACHE_DIR", str(tmp_path))
+    appels = []
+
+    def compute():
+        appels.append(1)
+        return {"valeur": 42}
+
+    assert disk_cache.get_or_compute(("test", "disque"), compute) == {"valeur": 42}
+    clear()
+    assert disk_cache.get_or_compute(("test", "disque"), compute) == {"valeur": 42}
+    assert len(appels) == 1
+
+    monkeypatch.setattr(manifest, "version_id", lambda tables=None: "autre")
+    disk_cache.get_or_compute(("test", "disque"), compute)
+    assert len(appels) == 2
+
+
+def test_cache_disque_suit_le_code(monkeypatch):
+    """
+    Une modification du code d'une requête (ou d'un module dont elle dépend)
+    change la clé disque : l'ancien résultat n'est plus servi.
+    """
+    path = "src.Analysis.Queries.queries_pit_stops:pit_stop"
+    avant = disk_cache.code_version(path)
+    assert avant == disk_cache.code_version(path)
+
+    source = disk_cache._source
+    with monkeypatch.context() as m:
+        m.setattr(
+            disk_cache,
+            "_source",
+            lambda name: source(name) + (b"#\n" if name.endswith("utils") else b""),
+        )
+        disk_cache.code_version.cache_clear()
+        assert disk_cache.code_version(path) != avant
+    disk_cache.code_version.cache_clear()
+
+
+def test_cache_disque_borne(monkeypatch, tmp_path):
+    """
+    Au-delà de la taille maximale, les entrées les plus anciennes sont évincées.
+    """
+    monkeypatch.setenv("F1_DISK_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("F1_DISK_CACHE_MB", str(1.5 * 8000 / 1024**2))
+    disk_cache.store(("test", "ancien"), np.zeros(1000))
+    time.sleep(0.01)
+    disk_cache.store(("test", "recent"), np.zeros(1000))
+    assert not disk_cache.load(("test", "ancien"))[0]
+    assert disk_cache.load(("test", "recent"))[0]
+
+
+def test_rechargement_incremental(monkeypatch):
+    """
+    Une mise à jour de pit_stops.csv invalide q5 et q6 mais pas q1.
+    """
+    hot_reload.refresh()  # état de référence
+    run_question("q1", **DEFAULT_PARAMS["q1"])
+    run_question("q5", **DEFAULT_PARAMS["q5"])
+    cle_q1 = question_key("q1", **DEFAULT_PARAMS["q1"])
+    cle_q5 = question_key("q5", **DEFAULT_PARAMS["q5"])
+
+    modifie = copy.deepcopy(manifest.current_manifest())
+    modifie["files"]["pit_stops"]["sha256"] = "nouveau-week-end"
+    monkeypatch.setattr(manifest, "current_manifest", lambda: modifie)
+
+    resume = hot_reload.refresh()
+    assert resume["tables"] == ["pit_stops"]
+    assert resume["questions"] == ["q5", "q6"]
+    assert contains(cle_q1) and question_key("q1", **DEFAULT_PARAMS["q1"]) == cle_q1
+    assert not contains(cle_q5)
+    assert contains(question_key("q5", **DEFAULT_PARAMS["q5"]))
+
+
+def test_surveillance_unique(monkeypatch):
+    """
+    Des sessions qui démarrent en même temps ne lancent qu'une surveillance.
+    """
+    lecture = manifest.current_manifest
+
+    def lecture_lente():
+        time.sleep(0.05)
+        return lecture()
+
+    monkeypatch.setattr(manifest, "current_manifest", lecture_lente)
+    monkeypatch.setenv("F1_RELOAD_INTERVAL", "60")
+    try:
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            list(pool.map(lambda _: hot_reload.start_watcher(), range(10)))
+        noms = [t.name for t in threading.enumerate()]
+        assert noms.count("f1-hot-reload") == 1
+    finally:
+        hot_reload.stop_watcher()
@@ -0,0 +1,28 @@
+"""
+Tests unitaires pour le cube de résultats et les questions qui s'en déduisent.
+"""
+
+import pytest
+
+from src.Analysis.cache import load_table
+from src.Analysis.cube import rollup
+from src.Analysis.router import question_methods, run_question
+
+
+def test_rollup():
+    """
+    Les cumuls du cube correspondent aux tables brutes, avec ou sans filtres.
+    """
+    results = load_table("results")
+    total = rollup(["participations", "points"])
+    assert total.loc[0, "participations"] == len(results)
+    assert total.loc[0, "points"] == pytest.approx(results["points"].sum(), rel=1e-6)
+
+    par_saison = rollup(["victoires"], par=["year"], year=(2010, 2012))
+    assert par_saison["year"].tolist() == [2010, 2011, 2012]
+    assert par_saison["victoires"].tolist() == [19, 19, 20]
+
+    with pytest.raises(ValueError):
+        rollup(["victoires", "victoires_ecurie"])
+    assert "cube" in question_methods("q8") and "cube" not in question_methods("q5")
+    assert run_question("q9", method="cube", ecurie="Ferrari")[0] > 200
@@ -2,7 +2,15 @@
 Tests unitaires pour les requêtes sur les écuries.
 """
 
-from src.Analysis.Queries.queries_ecuries import ecuries_points
+from src.Analysis.Queries.queries_ecuries import (
+    ecuries_points,
+    victoires_ecurie_relatif,
+    victoires_ecuries_saison,
+)
+import pandas as pd
+
+from src.Analysis import utils
+from src.Analysis.utils import get_pd_df, noms_lignees, saisons_ecuries
 
 
 def test_red_bull_points_2023():
@@ -23,3 +31,88 @@ def test_mercedes_points_2016():
     top = df.sort_values("points", ascending=False).iloc[0]
     assert "mercedes" in top["constructorRef"].lower()
     assert top["points"] >= 700
+
+
+def test_points_avec_sprints():
+    """
+    Les points des sprints s'ajoutent sur demande : 860 points officiels pour
+    Red Bull en 2023, et aucun changement avant les premiers sprints (2021).
+    """
+    df = ecuries_points(2023, "historique", inclure_sprints=True)
+    assert df.iloc[0]["constructorRef"] == "red_bull"
+    assert df.iloc[0]["points"] == 860
+    assert ecuries_points(2023, inclure_sprints=True).iloc[0]["points"] > 779
+    assert ecuries_points(2016, inclure_sprints=True).equals(ecuries_points(2016))
+
+
+def test_index_saisons_ecuries():
+    """
+    L'index par saison donne les mêmes victoires que la jointure complète, pour
+    une plage de saisons comme pour le total d'une écurie.
+    """
+    df = get_pd_df(
+        ["constructor_standings", "constructors", "races"], ["constructorId", "raceId"]
+    )
+    df = df[(df["position"] == 1) & (df["name_x"] == "McLaren")]
+    attendu = df[df["year"].between(1984, 1991)].groupby("year").size()
+
+    obtenu = victoires_ecuries_saison(["McLaren", "Inconnue"], (1984, 1991))
+    assert obtenu["saison"].tolist() == attendu.index.tolist()
+    assert obtenu["victoires"].tolist() == attendu.tolist()
+    assert victoires_ecurie_relatif("pandas", "McLaren")[0] == len(df)
+
+    index = saisons_ecuries()
+    ligne = index["ecuries"].get_loc("McLaren")
+    debut, fin = 1984 - index["annees"][0], 1991 - index["annees"][0] + 1
+    cumul = index["cumul_victoires"][ligne]
+    assert cumul[fin] - cumul[debut] == attendu.sum()
+
+
+def test_lignees():
+    """
+    Les lignées suivent les époques de chaque écurie, et regrouper par lignée
+    ne change pas les totaux.
+    """
+    # Alfa Romeo (51) : écurie d'usine en 1950, puis Sauber de 2019 à 2023
+    lignees = noms_lignees(
+        [51, 51, 15, 18, 213, 215], [1950, 2020, 1995, 2000, 2021, 2024]
+    )
+    assert lignees.tolist() == [
+        "Alfa Romeo (avant 2019)",
+        "Alfa Romeo",
+        "Alfa Romeo",
+        "AlphaTauri",
+        "AlphaTauri",
+        "AlphaTauri",
+    ]
+
+    par_ecurie = ecuries_points(2015)
+    par_lignee = ecuries_points(2015, par_lignee=True)
+    assert par_lignee["points"].sum() == par_ecurie["points"].sum()
+    assert "Alpine" in par_lignee["constructorRef"].tolist()  # Lotus F1 en 2015
+
+    for method in ("pandas", "homemade"):
+        victoires, saisons, _ = victoires_ecurie_relatif(method, "Mercedes", True)
+        assert victoires > victoires_ecurie_relatif(method, "Mercedes")[0]
+    assert victoires_ecurie_relatif("homemade", "Mercedes", True) == (
+        victoires_ecurie_relatif("pandas", "Mercedes", True)
+    )
+
+
+def test_lignee_nouvelle_ecurie(monkeypatch):
+    """
+    Une écurie ajoutée sous le nom d'une lignée, avec une référence absente de
+    ses époques, forme sa propre lignée sans erreur.
+    """
+    constructors = utils.load_table("constructors")
+    nouvelle = constructors["constructorId"].max() + 1
+    ajout = pd.DataFrame(
+        [{"constructorId": nouvelle, "constructorRef": "rb_2030", "name": "Red Bull"}]
+    )
+    monkeypatch.setattr(
+        utils,
+        "load_table",
+        lambda name: pd.concat([constructors, ajout], ignore_index=True),
+    )
+    monkeypatch.setattr(utils, "version_id", lambda tables: "nouvelle-ecurie")
+    assert noms_lignees([nouvelle], [2030]).tolist() == ["Red Bull"]
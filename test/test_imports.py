@@ -0,0 +1,60 @@
+"""
+Tests du temps de démarrage : les modules lourds ne doivent être importés
+qu'au moment où la fonctionnalité correspondante est utilisée.
+"""
+
+import json
+import subprocess
+import sys
+
+# Budget (en secondes) pour importer le routeur une fois pandas chargé
+BUDGET_IMPORT_ROUTEUR = 0.5
+
+MODULES_LOURDS = [
+    "sklearn",
+    "matplotlib",
+    "plotly.express",
+    "torch",
+    "psutil",
+    "keyboard",
+]
+
+
+def _executer(code: str) -> dict:
+    """Exécute `code` dans un interpréteur neuf et renvoie son JSON de sortie."""
+    sortie = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(sortie.stdout.strip().splitlines()[-1])
+
+
+def test_budget_import_routeur():
+    """
+    Le routeur (requêtes + graphes) s'importe rapidement et sans module lourd.
+    """
+    resultat = _executer(
+        "import json, sys, time\n"
+        "import pandas\n"
+        "t0 = time.perf_counter()\n"
+        "import src.Analysis.router\n"
+        "duree = time.perf_counter() - t0\n"
+        f"lourds = [m for m in {MODULES_LOURDS!r} if m in sys.modules]\n"
+        "print(json.dumps({'duree': duree, 'lourds': lourds}))\n"
+    )
+    assert resultat["lourds"] == []
+    assert resultat["duree"] <= BUDGET_IMPORT_ROUTEUR
+
+
+def test_premier_affichage_sans_module_lourd():
+    """
+    Le premier affichage de l'application ne charge aucun module lourd.
+    """
+    resultat = _executer(
+        "import json, sys\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "at = AppTest.from_file('src/App/app.py', default_timeout=60).run()\n"
+        f"lourds = [m for m in {MODULES_LOURDS!r} if m in sys.modules]\n"
+        "print(json.dumps({'erreur': len(at.exception), 'lourds': lourds}))\n"
+    )
+    assert resultat["erreur"] == 0
+    assert resultat["lourds"] == []
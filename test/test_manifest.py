@@ -0,0 +1,51 @@
+"""
+Tests unitaires pour le manifeste du dossier de données.
+"""
+
+import os
+
+from src.Analysis import manifest
+
+
+def _write(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_manifeste_schema_et_lignes():
+    """
+    Le manifeste décrit chaque CSV (lignes, colonnes) et fixe une version.
+    """
+    courant = manifest.current_manifest()
+    pit_stops = courant["files"]["pit_stops"]
+    assert pit_stops["rows"] > 0
+    assert pit_stops["columns"]["raceId"] == "int64"
+    assert manifest.version_id() == courant["version"]
+
+
+def test_version_suit_le_contenu(tmp_path, monkeypatch):
+    """
+    La version ne change qu'avec le contenu ; un fichier dont la date et la
+    taille sont inchangées n'est pas relu.
+    """
+    _write(tmp_path / "a.csv", "x,y\n1,2\n")
+    _write(tmp_path / "b.csv", "z\n3\n")
+    avant = manifest.build_manifest(str(tmp_path))
+    assert avant["files"]["a"]["rows"] == 1
+
+    def relecture(path):
+        raise AssertionError(f"{path} relu sans modification")
+
+    monkeypatch.setattr(manifest, "describe_file", relecture)
+    assert manifest.build_manifest(str(tmp_path), avant) == avant
+
+    os.utime(tmp_path / "b.csv", ns=(0, 0))  # date seule modifiée
+    assert manifest.build_manifest(str(tmp_path), avant)["version"] == (
+        avant["version"]
+    )
+
+    monkeypatch.undo()
+    _write(tmp_path / "a.csv", "x,y\n1,2\n4,5\n")
+    apres = manifest.build_manifest(str(tmp_path), avant)
+    assert apres["version"] != avant["version"]
+    assert manifest.changed_tables(avant, apres) == ["a"]
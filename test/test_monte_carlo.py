@@ -0,0 +1,39 @@
+"""
+Tests unitaires pour la simulation de Monte-Carlo des saisons.
+"""
+
+import numpy as np
+
+from src.Analysis import workers
+from src.Analysis.monte_carlo import simulation_saison
+
+
+def test_simulation_probabilites():
+    """
+    Les probabilités de titre forment une distribution, et le champion 2023
+    domine les simulations.
+    """
+    pilotes, ecuries = simulation_saison(2023, nb_simulations=2000)
+    assert np.isclose(pilotes["proba_titre"].sum(), 1)
+    assert np.isclose(ecuries["proba_titre"].sum(), 1)
+    assert pilotes.iloc[0]["nom_pilote"] == "Max Verstappen"
+    assert pilotes.iloc[0]["proba_titre"] > 0.9
+    assert ecuries.iloc[0]["ecurie"] == "Red Bull"
+
+
+def test_simulation_deterministe(monkeypatch):
+    """
+    Une même graine donne les mêmes résultats, en série comme répartis sur des
+    processus de calcul.
+    """
+    params = {"saison": 2021, "nb_simulations": 1500, "graine": 7, "taille_bloc": 500}
+    attendu = simulation_saison(**params)
+
+    monkeypatch.setenv("F1_WORKERS", "2")
+    try:
+        obtenu = simulation_saison(**params, parallele=True)
+    finally:
+        workers.shutdown()
+    for a, b in zip(attendu, obtenu):
+        assert a.equals(b)
+    assert not simulation_saison(**{**params, "graine": 8})[0].equals(attendu[0])
@@ -6,6 +6,7 @@ from src.Analysis.Queries.queries_pilotes import (
     nombre_victoires_pilotes,
     classement_saison,
     temps_de_carriere_pilotes,
+    duels_coequipiers,
 )
 
 
@@ -28,6 +29,20 @@ def test_verstappen_victoires():
     assert row["wins"].values[0] >= 54
 
 
+def test_victoires_avec_sprints():
+    """
+    Les victoires en sprint ne comptent que sur demande, dans les deux méthodes.
+    """
+    for method in ("pandas", "homemade"):
+        sans = nombre_victoires_pilotes(method, nb_victoires=30)
+        avec = nombre_victoires_pilotes(method, nb_victoires=30, inclure_sprints=True)
+        ecart = (
+            avec.set_index("nom_pilote")["wins"] - sans.set_index("nom_pilote")["wins"]
+        )
+        assert ecart["Max Verstappen"] == 10
+        assert ecart["Michael Schumacher"] == 0
+
+
 def test_classement_verstappen_2023():
     """
     Max Verstappen est le champion du monde 2023.
@@ -43,3 +58,16 @@ def test_carriere_schumacher():
     df = temps_de_carriere_pilotes(0)
     row = df[df["nom_pilote"] == "Michael Schumacher"]
     assert abs(row["duree"].values[0] - 21) <= 2
+
+
+def test_duels_coequipiers_2023():
+    """
+    En 2023, Max Verstappen devance Sergio Pérez dans la plupart des duels, et
+    chaque duel a au plus un vainqueur.
+    """
+    df = duels_coequipiers(saison=2023)
+    row = df[(df["pilote_1"] == "Sergio Pérez") & (df["pilote_2"] == "Max Verstappen")]
+    assert row["arrivees_2"].values[0] >= 18 and row["courses"].values[0] == 22
+    assert (df["qualifs_1"] + df["qualifs_2"] <= df["courses"]).all()
+    assert (df["arrivees_1"] + df["arrivees_2"] <= df["courses"]).all()
+    assert df["part_points_1"].dropna().between(0, 1).all()
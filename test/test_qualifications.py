@@ -0,0 +1,40 @@
+"""
+Tests unitaires pour les requêtes reliant qualifications et courses.
+"""
+
+import pandas as pd
+import pytest
+
+from src.Analysis.Queries.queries_qualifications import (
+    distribution_gains,
+    ecarts_qualification_course,
+    temps_en_secondes,
+)
+
+
+def test_temps_en_secondes():
+    """
+    Les temps "m:ss.sss" et "ss.sss" sont convertis, les valeurs absentes
+    donnent NaN.
+    """
+    temps = temps_en_secondes(pd.Series(["1:26.572", "59.100", "\\N", None]))
+    assert temps[:2].tolist() == pytest.approx([86.572, 59.1])
+    assert temps[2:].isna().all()
+
+
+def test_ecarts_qualification_course():
+    """
+    Le poleman a un écart nul en Q1 ou Q3, et le gain est la différence entre
+    position de qualification et position d'arrivée.
+    """
+    df = ecarts_qualification_course((2023, 2023))
+    assert (df["gain"] == df["position_qualif"] - df["position_arrivee"]).all()
+    assert (df["ecart_q1"].dropna() >= 0).all()
+    poles = df[df["position_qualif"] == 1]
+    assert (poles["ecart_q3"].fillna(0) == 0).mean() > 0.8
+
+    par_ecurie = distribution_gains("ecurie", (2023, 2023))
+    assert par_ecurie["departs"].sum() == len(df)
+    assert par_ecurie["gain_moyen"].is_monotonic_decreasing
+    with pytest.raises(ValueError):
+        distribution_gains("pilote")
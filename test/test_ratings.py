@@ -0,0 +1,55 @@
+"""
+Tests unitaires pour les notes Elo des pilotes et des écuries.
+"""
+
+import numpy as np
+
+from src.Analysis.cache import load_table
+from src.Analysis.ratings import (
+    apply_races,
+    classement_elo,
+    etat_initial,
+    extend,
+    maj_elo,
+)
+
+
+def test_maj_elo():
+    """
+    Le vainqueur gagne des points, le dernier en perd, et la somme des notes
+    est conservée.
+    """
+    notes = np.array([1500.0, 1600.0, 1400.0])
+    apres = maj_elo(notes, np.array([1, 2, 3]))
+    assert apres[0] > notes[0] and apres[2] < notes[2]
+    assert np.isclose(apres.sum(), notes.sum())
+
+
+def test_notes_incrementales():
+    """
+    Compléter des notes avec les nouvelles courses, ou avec une course insérée
+    dans une saison passée, donne les mêmes notes qu'un calcul complet.
+    """
+    complet = extend(etat_initial())
+
+    races = load_table("races")[["raceId", "year", "round"]]
+    results = load_table("results").merge(races, on="raceId")
+    partiel = apply_races(etat_initial(), results[results["year"] < 2023])
+    incremental = extend(partiel)
+    np.testing.assert_array_equal(incremental["pilotes"], complet["pilotes"])
+    np.testing.assert_array_equal(incremental["ecuries"], complet["ecuries"])
+    assert incremental["derniere"] == complet["derniere"]
+
+    course = races.loc[(races["year"] == 2010) & (races["round"] == 5), "raceId"]
+    insere = dict(complet, courses=np.setdiff1d(complet["courses"], course))
+    repris = extend(insere)
+    np.testing.assert_array_equal(repris["pilotes"], complet["pilotes"])
+    assert set(repris["reprises"]) == set(complet["reprises"])
+
+
+def test_classement_elo():
+    """
+    Les meilleurs pilotes et écuries des saisons dominées sont en tête.
+    """
+    assert "Michael Schumacher" in classement_elo("pilotes", 2004, 3)["nom"].tolist()
+    assert classement_elo("ecuries", 2023, 1).loc[0, "nom"] == "Red Bull"
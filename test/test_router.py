@@ -0,0 +1,53 @@
+"""
+Tests unitaires pour le routeur : implémentations alternatives des questions.
+"""
+
+import pandas as pd
+import pytest
+
+from src.Analysis.router import ALT_METHODS, get_question
+from src.Analysis.warmup import DEFAULT_PARAMS
+
+# Paramètres testés en plus de ceux par défaut, dont les cas limites de l'app
+AUTRES_PARAMS: dict[str, list[dict]] = {
+    "q1": [{"nb_victoires": 0}],
+    "q2": [{"saison": 1990}],
+    "q3": [{"duree_min": 0}],
+    "q4": [{"ecuries": ["Ferrari", "Williams"], "saisons": (1950, 1990)}],
+    "q5": [{"saison": 2012}],
+    "q7": [{"nom_pilote": "Michael Schumacher"}],
+    "q8": [{"saison": 1985}, {"saison": 2010}],
+    "q9": [{"ecurie": "Ferrari"}],
+    "q10": [{"saison": 2005}],
+}
+
+CAS_ALTERNATIFS = [
+    (method, question_id, params)
+    for method in ALT_METHODS
+    for question_id in sorted(DEFAULT_PARAMS)
+    if get_question(question_id, method) is not None
+    for params in [DEFAULT_PARAMS[question_id]]
+    + [{**DEFAULT_PARAMS[question_id], **p} for p in AUTRES_PARAMS.get(question_id, [])]
+]
+
+
+@pytest.mark.parametrize("method, question_id, params", CAS_ALTERNATIFS)
+def test_methode_equivalente_pandas(method, question_id, params):
+    """
+    Chaque question servie en SQL ou par le cube donne le même résultat
+    qu'avec pandas, avec les paramètres par défaut et d'autres valeurs.
+    """
+    attendu = get_question(question_id)(**params)
+    obtenu = get_question(question_id, method)(
+        **{k: v for k, v in params.items() if k != "method"}
+    )
+
+    if isinstance(attendu, tuple):
+        assert obtenu == attendu
+        return
+    cles = list(attendu.columns[:1]) + list(attendu.columns[-1:])
+    pd.testing.assert_frame_equal(
+        obtenu.sort_values(cles).reset_index(drop=True),
+        attendu.sort_values(cles).reset_index(drop=True),
+        check_dtype=False,
+    )
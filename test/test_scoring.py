@@ -0,0 +1,52 @@
+"""
+Tests unitaires pour les barèmes de points.
+"""
+
+import numpy as np
+import pytest
+
+from src.Analysis.cache import load_table
+from src.Analysis.scoring import points_course, points_resultats
+from src.Analysis.utils import points_bareme, resultats_sessions
+
+
+def test_bareme_moderne_par_defaut():
+    """
+    Sans précision, le barème actuel s'applique, quelle que soit la saison.
+    """
+    positions = np.array([1, 2, 10, 11, 0, 99])
+    attendu = [points_bareme.get(p, 0) for p in positions]
+    assert points_course(positions).tolist() == attendu
+    assert points_course(positions, np.full(6, 1960)).tolist() == attendu
+    assert points_course(["1", "NA", "3"]).tolist() == [25, 0, 15]
+    with pytest.raises(ValueError):
+        points_course(positions, systeme="historique")
+
+
+def test_bareme_historique_points_officiels():
+    """
+    Le barème historique redonne les points officiels de chaque course depuis
+    2010 (demi-points, points doubles et meilleur tour compris).
+    """
+    races = load_table("races")[["raceId", "year", "round"]]
+    results = load_table("results").merge(races, on="raceId")
+    results = results[results["year"].between(2010, 2023)]
+    points = points_resultats(results, "historique")
+    np.testing.assert_allclose(points, results["points"].astype(float))
+
+    assert points_course([1, 1], [1955, 1985], "historique").tolist() == [8, 9]
+
+
+def test_bareme_sprints_points_officiels():
+    """
+    La vue des sessions réunit courses et sprints, et les sprints y sont notés
+    avec leur propre barème (points officiels de 2021 à 2023).
+    """
+    vue = resultats_sessions()
+    assert len(vue) == len(load_table("results")) + len(load_table("sprint_results"))
+    races = load_table("races")[["raceId", "year", "round"]]
+    vue = vue.merge(races, on="raceId")
+    vue = vue[vue["year"].between(2021, 2023)]
+    points = points_resultats(vue, "historique")
+    np.testing.assert_allclose(points, vue["points"].astype(float))
+    assert (vue["session"] == "sprint").any()
@@ -0,0 +1,51 @@
+"""
+Tests unitaires pour les simulations de championnats.
+"""
+
+import pytest
+
+from src.Analysis.Queries.queries_simulations import simulation_championnats
+from src.Analysis.utils import points_bareme
+
+
+def test_simulation_bareme_identique():
+    """
+    Avec le barème en vigueur depuis 2010 (et le point du meilleur tour depuis
+    2019), aucun champion ne change sur ces périodes ; les seuls écarts viennent
+    des décisions reprises dans les classements officiels (Force India repartie
+    de zéro en 2018, par exemple).
+    """
+    for saisons, meilleur_tour in (((2010, 2018), 0), ((2019, 2023), 1)):
+        champions, ecarts = simulation_championnats(
+            points_bareme, saisons, meilleur_tour
+        )
+        assert champions.empty
+    _, ecarts = simulation_championnats(points_bareme, (2018, 2018))
+    force_india = ecarts[ecarts["nom"] == "Force India"].iloc[0]
+    assert (force_india["rang_reel"], force_india["rang_simule"]) == (7, 5)
+
+
+def test_simulation_champions_officiels():
+    """
+    Les champions réels sont ceux des classements officiels (résultats
+    décomptés et règle de la meilleure voiture compris).
+    """
+    champions, _ = simulation_championnats([1], (1958, 1958))
+    reels = champions.set_index("championnat")["champion_reel"]
+    assert reels["pilotes"] == "Mike Hawthorn"
+
+
+def test_simulation_autre_bareme():
+    """
+    Un barème réservé au vainqueur change des champions, et les écarts de rang
+    sont cohérents.
+    """
+    champions, ecarts = simulation_championnats([1], (1950, 2023))
+    assert not champions.empty
+    assert set(champions["championnat"]) <= {"pilotes", "ecuries"}
+    assert (champions["champion_reel"] != champions["champion_simule"]).all()
+    assert (ecarts["ecart"] == ecarts["rang_reel"] - ecarts["rang_simule"]).all()
+    assert (ecarts["ecart"] != 0).all()
+
+    with pytest.raises(ValueError):
+        simulation_championnats({0: 10})
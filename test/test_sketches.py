@@ -0,0 +1,79 @@
+"""
+Tests unitaires pour les sketches de quantiles des pit-stops.
+"""
+
+import numpy as np
+
+from src.Analysis.Queries.queries_pit_stops import distribution_pit_stops
+from src.Analysis.sketches import (
+    PRECISION,
+    NB_INTERVALLES,
+    construire_sketches,
+    fusionner,
+    indices_intervalles,
+    quantiles,
+)
+from src.Analysis.utils import get_pd_df
+
+
+def _sketch(valeurs: np.ndarray) -> np.ndarray:
+    """Sketch d'un tableau de valeurs."""
+    comptes = np.zeros((1, NB_INTERVALLES), dtype=np.int64)
+    np.add.at(comptes[0], indices_intervalles(valeurs), 1)
+    return comptes
+
+
+def test_quantiles_precision_et_fusion():
+    """
+    Les quantiles sont exacts à PRECISION près, et la fusion de deux sketches
+    est le sketch de l'ensemble des valeurs.
+    """
+    rng = np.random.default_rng(0)
+    a = rng.lognormal(10, 0.3, 5000)
+    b = rng.lognormal(10.5, 1, 3000)
+    probabilites = [0.1, 0.5, 0.9]
+
+    fusion = fusionner(np.vstack([_sketch(a), _sketch(b)]), [0, 0])
+    assert (fusion == _sketch(np.r_[a, b])).all()
+    attendu = np.quantile(np.r_[a, b], probabilites, method="lower")
+    np.testing.assert_allclose(
+        quantiles(fusion, probabilites)[0], attendu, rtol=PRECISION
+    )
+    assert np.isnan(quantiles(np.zeros((1, NB_INTERVALLES)), [0.5])).all()
+
+
+def test_distribution_pit_stops():
+    """
+    Les sketches ne dépendent pas de la taille des blocs lus, et les quantiles
+    par saison correspondent à ceux des arrêts bruts, sans filtre des valeurs
+    aberrantes.
+    """
+    sketches = construire_sketches()
+    par_blocs = construire_sketches(taille_bloc=1000)
+    assert sketches["cles"].equals(par_blocs["cles"])
+    assert (sketches["comptes"] == par_blocs["comptes"]).all()
+
+    df = get_pd_df(
+        ["pit_stops", "races", "results", "constructors"],
+        ["raceId", ["raceId", "driverId"], "constructorId"],
+    )
+    df = df[
+        df["year"].between(2015, 2020) & ~df["constructorRef"].isin(["hrt", "manor"])
+    ]
+    attendu = (
+        df.groupby("year")["milliseconds_x"]
+        .quantile([0.1, 0.5, 0.9], interpolation="lower")
+        .unstack()
+        / 1000
+    )
+
+    obtenu = distribution_pit_stops(["saison"], (2015, 2020)).set_index("saison")
+    assert (obtenu["arrets"] == df.groupby("year").size()).all()
+    np.testing.assert_allclose(
+        obtenu[["p10", "p50", "p90"]], attendu, rtol=PRECISION + 1e-4
+    )
+
+    # Fusion des écuries d'une saison = distribution de la saison
+    detail = distribution_pit_stops(["ecurie", "saison"], (2015, 2020))
+    assert (detail.groupby("saison")["arrets"].sum() == obtenu["arrets"]).all()
+    assert (obtenu["part_aberrants"] < 0.2).all()
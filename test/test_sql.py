@@ -0,0 +1,52 @@
+"""
+Tests unitaires pour la base SQLite et les implémentations SQL des questions.
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from src.Analysis import disk_cache, hot_reload
+from src.Analysis.router import run_question
+from src.Analysis.sqlite_store import build_database, connect, ensure_database
+
+
+def test_methode_sqlite_routeur():
+    """
+    La méthode "sqlite" est accessible par le routeur, avec sa propre clé.
+    """
+    df = run_question("q2", method="sqlite", saison=2021)
+    assert df.iloc[0]["nom_pilote"] == "Max Verstappen"
+    assert run_question("q9", method="sqlite", ecurie="Ferrari")[0] > 200
+
+
+def test_index_utilises():
+    """
+    Les requêtes sur un pilote ou une saison passent par les index.
+    """
+    plan = " ".join(
+        str(ligne)
+        for ligne in connect().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM results WHERE driverId = 1"
+        )
+    )
+    assert "idx_results_driverId" in plan
+    with pytest.raises(sqlite3.OperationalError):
+        connect().execute("DELETE FROM results")  # base en lecture seule
+
+
+def test_base_supprimee_reconstruite():
+    """
+    Une base supprimée (cache disque vidé) est reconstruite à la demande
+    suivante, et la construction conserve les bases des autres versions.
+    """
+    path = ensure_database()
+    disk_cache.clear()
+    assert ensure_database() == path and os.path.exists(path)
+
+    autre = os.path.join(disk_cache.cache_dir(), "f1_autre_version.sqlite")
+    sqlite3.connect(autre).close()
+    build_database(path)
+    assert os.path.exists(autre)
+    assert hot_reload.is_stale(("sqlite", "base", "ancienne"), ["results"])
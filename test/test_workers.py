@@ -0,0 +1,71 @@
+"""
+Tests unitaires pour le pool de processus de calcul.
+"""
+
+import copy
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from src.Analysis import hot_reload, manifest, shared_tables, workers
+from src.Analysis.cache import load_table
+from src.Analysis.shared_tables import attach_table, publish_tables
+from src.Analysis.Queries.queries_ecuries import ecuries_points
+
+
+def test_calcul_dans_un_processus(monkeypatch):
+    """
+    Un calcul confié à un processus de calcul donne le même résultat que
+    l'exécution directe.
+    """
+    monkeypatch.setenv("F1_WORKERS", "1")
+    try:
+        df = workers.run(workers.func_path(ecuries_points), saison=2016)
+    finally:
+        workers.shutdown()
+    assert df.equals(ecuries_points(saison=2016))
+
+
+def test_reference_invalide():
+    """
+    Une référence sans nom de fonction est refusée.
+    """
+    future = workers.submit("src.Analysis.Queries.queries_ecuries")
+    assert isinstance(future.exception(), ValueError)
+
+
+def test_table_en_memoire_partagee():
+    """
+    Une table publiée en mémoire partagée est restituée à l'identique, avec des
+    colonnes numériques en lecture seule (vues sur le segment partagé) et des
+    colonnes texte décodées localement.
+    """
+    catalog = publish_tables(["pit_stops"])
+    df = attach_table(catalog["pit_stops"])
+    assert df.equals(load_table("pit_stops"))
+    assert not df["milliseconds"].to_numpy().flags.writeable
+    assert df["duration"].dtype == object
+
+
+def test_rechargement_recree_le_pool(monkeypatch):
+    """
+    Après un rechargement, le pool et les tables partagées de l'ancienne
+    version sont libérés, puis recréés pour le calcul suivant.
+    """
+    monkeypatch.setenv("F1_WORKERS", "1")
+    try:
+        hot_reload.refresh()  # état de référence
+        ancien = workers.get_pool()
+        segments = [shm.name for shm in shared_tables._published]
+        assert workers.uses_shared_tables() and segments
+
+        modifie = copy.deepcopy(manifest.current_manifest())
+        modifie["files"]["pit_stops"]["sha256"] = "nouveau-week-end"
+        monkeypatch.setattr(manifest, "current_manifest", lambda: modifie)
+        hot_reload.refresh()
+
+        assert workers.get_pool() is not ancien
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=segments[0])
+    finally:
+        workers.shutdown()